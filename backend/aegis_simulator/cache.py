@@ -0,0 +1,107 @@
+# backend/aegis_simulator/cache.py
+
+import threading
+from collections import OrderedDict
+
+
+class PathTreeCache:
+    """A bounded LRU cache of shortest-path trees keyed by source node.
+
+    Every entry is tagged with the topology version it was computed at. A
+    lookup made at a newer version flushes the whole cache, so a stale tree
+    is never returned. Lookups at an older version, from readers still
+    working on an earlier NetworkView, miss without flushing.
+
+    Building a whole tree costs more than an early-exit search for one
+    path, so it only pays for sources that are queried again before the
+    topology changes. The cache therefore also remembers which sources
+    missed at the current version; see `repeated`.
+
+    Attributes:
+        maxsize (int): The maximum number of trees kept.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that required a computation.
+    """
+
+    def __init__(self, maxsize=128):
+        """Initializes a new, empty PathTreeCache instance."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict()
+        self._missed = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._trees)
+
+    def get(self, source, version):
+        """Returns the cached tree for `source`, or None on a miss.
+
+        Args:
+            source (int): The compact graph index of the source node.
+            version (int): The network's current topology version.
+        """
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._trees.clear()
+                self._missed.clear()
+                self._version = version
+            elif version < self._version:
+                self.misses += 1
+                return None
+            tree = self._trees.get(source)
+            if tree is None:
+                self.misses += 1
+                return None
+            self._trees.move_to_end(source)
+            self.hits += 1
+            return tree
+
+    def repeated(self, source, version):
+        """Records a miss for `source` and says whether it missed before.
+
+        Args:
+            source (int): The compact graph index of the source node.
+            version (int): The topology version of the miss.
+
+        Returns:
+            bool: True if `source` already missed at `version`, so building
+                  and caching its whole tree is worthwhile.
+        """
+        with self._lock:
+            if version != self._version:
+                return False
+            if source in self._missed:
+                del self._missed[source]
+                return True
+            self._missed[source] = None
+            while len(self._missed) > self.maxsize:
+                self._missed.popitem(last=False)
+            return False
+
+    def put(self, source, version, tree):
+        """Stores a tree computed at `version`, evicting the oldest if full."""
+        with self._lock:
+            if version != self._version:
+                return
+            self._trees[source] = tree
+            self._trees.move_to_end(source)
+            while len(self._trees) > self.maxsize:
+                self._trees.popitem(last=False)
+
+    def clear(self):
+        """Drops every cached tree without touching the counters."""
+        with self._lock:
+            self._trees.clear()
+            self._missed.clear()
+
+    def info(self):
+        """Returns the cache counters as a dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._trees),
+            "maxsize": self.maxsize,
+        }
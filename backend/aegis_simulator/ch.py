@@ -0,0 +1,384 @@
+# backend/aegis_simulator/ch.py
+
+import heapq
+import logging
+import sys
+import time
+from array import array
+
+from .graph import INF
+
+
+class ContractionHierarchy:
+    """A customizable contraction hierarchy (CCH) over a CompactGraph.
+
+    Preprocessing is split the customizable way:
+
+    1. Ordering and contraction depend only on the link structure. Nodes
+       are ranked by nested dissection (see `_nested_dissection_order`)
+       and eliminated in rank order; the neighbors of each eliminated node
+       are joined into a clique, so every node ends up with "upward" arcs
+       to higher-ranked nodes only. This is the expensive step and is only
+       redone when links are added.
+    2. Customization assigns latencies to the upward arcs. Original links
+       get their latency, shortcuts get the cheapest detour through a
+       lower-ranked node, and every arc touching an offline node gets an
+       infinite weight. It is a single linear pass over the precomputed
+       lower triangles, so status and latency changes are absorbed by
+       re-customizing rather than re-contracting.
+
+    Queries search upward from both endpoints and meet at the
+    highest-ranked node of the shortest path; because the hierarchy is
+    chordal, the upward search is a walk up the elimination tree rather
+    than a Dijkstra search. Shortcuts are unpacked recursively through the
+    detour node recorded during customization.
+
+    Attributes:
+        graph (CompactGraph): The graph the hierarchy was built on.
+        rank (array): The contraction rank of each node.
+        etree_parent (array): Each node's parent in the elimination tree,
+                              or -1 for roots.
+        up_offsets (array): CSR offsets into the upward arcs of each node.
+        up_tails (array): The lower-ranked tail of each upward arc.
+        up_targets (array): The higher-ranked head of each upward arc.
+        weights (list): The customized latency of each upward arc.
+        middle (array): The detour node of each shortcut arc, or -1 for
+                        arcs that are original links.
+        stats (dict): Preprocessing sizes, timings and memory use.
+    """
+
+    def __init__(self, graph):
+        """Orders, contracts and customizes the hierarchy for `graph`.
+
+        Args:
+            graph (CompactGraph): The graph to preprocess.
+        """
+        self.graph = graph
+        started = time.perf_counter()
+        order = self._nested_dissection_order()
+        ordered = time.perf_counter()
+        self._contract(order)
+        contracted = time.perf_counter()
+        self.customize()
+        customized = time.perf_counter()
+
+        self.stats = {
+            "nodes": len(graph),
+            "links": len(graph.targets) // 2,
+            "upward_arcs": len(self.up_targets),
+            "shortcuts": len(self.up_targets) - len(graph.targets) // 2,
+            "triangles": len(self._triangles) // 3,
+            "ordering_seconds": ordered - started,
+            "contraction_seconds": contracted - ordered,
+            "customization_seconds": customized - contracted,
+            "memory_bytes": self.memory_bytes(),
+        }
+        logging.info(
+            f"Contraction hierarchy built: {self.stats['shortcuts']} shortcuts, "
+            f"{self.stats['memory_bytes']} bytes in {customized - started:.2f}s"
+        )
+
+    def _nested_dissection_order(self, leaf_size=32):
+        """Ranks nodes by recursive nested dissection.
+
+        Each part is split by the middle level of a breadth-first search
+        started from a pseudo-peripheral node; the separator level is ranked
+        above both halves, which are dissected in turn. Small parts are
+        ranked in BFS order. Separators keep the fill-in of the elimination,
+        and with it the number of shortcuts, close to that of the original
+        topology on mesh-like networks.
+
+        Args:
+            leaf_size (int, optional): Parts at most this large are not split
+                further. Defaults to 32.
+
+        Returns:
+            list: Node indices in elimination order.
+        """
+        graph = self.graph
+        n = len(graph)
+        part_of = array("q", [0]) * n
+        order = []
+        # Stack entries are (finished, nodes). Nodes are emitted from the
+        # highest rank down, so each separator is pushed after its parts and
+        # popped, and ranked, before them.
+        stack = []
+        for component in self._components(list(range(n)), part_of, 0):
+            stack.append((False, component))
+        next_part = 1
+        while stack:
+            finished, nodes = stack.pop()
+            if finished or len(nodes) <= leaf_size:
+                order.extend(reversed(nodes))
+                continue
+            part = part_of[nodes[0]]
+            peripheral = self._bfs_levels(nodes[0], part, part_of)[-1][0]
+            levels = self._bfs_levels(peripheral, part, part_of)
+            if len(levels) < 3:
+                order.extend(reversed(nodes))
+                continue
+            half, seen, middle = len(nodes) // 2, 0, 1
+            for depth, level in enumerate(levels):
+                seen += len(level)
+                if seen >= half:
+                    middle = min(max(depth, 1), len(levels) - 2)
+                    break
+            separator = levels[middle]
+            for v in separator:
+                part_of[v] = -1
+            rest = [v for level in levels for v in level if part_of[v] == part]
+            for component in self._components(rest, part_of, next_part):
+                next_part = part_of[component[0]] + 1
+                stack.append((False, component))
+            stack.append((True, separator))
+        order.reverse()
+        return order
+
+    def _bfs_levels(self, start, part, part_of):
+        """Returns the BFS levels from `start` within nodes labelled `part`."""
+        offsets, targets = self.graph.offsets, self.graph.targets
+        seen = {start}
+        levels = [[start]]
+        while True:
+            level = []
+            for u in levels[-1]:
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if part_of[v] == part and v not in seen:
+                        seen.add(v)
+                        level.append(v)
+            if not level:
+                return levels
+            levels.append(level)
+
+    def _components(self, nodes, part_of, first_part):
+        """Splits `nodes` into connected components, labelling each in `part_of`.
+
+        Returns:
+            list: One node list per component.
+        """
+        offsets, targets = self.graph.offsets, self.graph.targets
+        label = first_part
+        for v in nodes:
+            part_of[v] = -2
+        components = []
+        for v in nodes:
+            if part_of[v] != -2:
+                continue
+            part_of[v] = label
+            component = [v]
+            for u in component:
+                for k in range(offsets[u], offsets[u + 1]):
+                    w = targets[k]
+                    if part_of[w] == -2:
+                        part_of[w] = label
+                        component.append(w)
+            components.append(component)
+            label += 1
+        return components
+
+    def _contract(self, order):
+        """Builds the upward arcs and the lower-triangle list for `order`."""
+        graph = self.graph
+        n = len(graph)
+        offsets, targets = graph.offsets, graph.targets
+        rank = array("q", [0]) * n
+        for position, v in enumerate(order):
+            rank[v] = position
+
+        upward = [
+            {u for u in targets[offsets[v] : offsets[v + 1]] if rank[u] > rank[v]}
+            for v in range(n)
+        ]
+        for x in order:
+            higher = upward[x]
+            for u in higher:
+                upward[u].update(w for w in higher if rank[w] > rank[u])
+
+        up_offsets = array("q", [0])
+        up_tails = array("q")
+        up_targets = array("q")
+        arc_of = {}
+        for v in range(n):
+            for u in sorted(upward[v], key=rank.__getitem__):
+                arc_of[v * n + u] = len(up_targets)
+                up_tails.append(v)
+                up_targets.append(u)
+            up_offsets.append(len(up_targets))
+
+        # Lower triangles (x, u, w) grouped by their lowest node x, in rank
+        # order: arcs x->u and x->w can shorten the shortcut u->w.
+        triangles = array("q")
+        triangle_offsets = array("q", [0])
+        for x in order:
+            lo, hi = up_offsets[x], up_offsets[x + 1]
+            for a in range(lo, hi):
+                u = up_targets[a]
+                for b in range(a + 1, hi):
+                    triangles.extend((a, b, arc_of[u * n + up_targets[b]]))
+            triangle_offsets.append(len(triangles))
+
+        self.rank = rank
+        self.etree_parent = array(
+            "q",
+            (
+                up_targets[up_offsets[v]] if up_offsets[v] < up_offsets[v + 1] else -1
+                for v in range(n)
+            ),
+        )
+        self.up_offsets = up_offsets
+        self.up_tails = up_tails
+        self.up_targets = up_targets
+        self._order = order
+        self._arc_of = arc_of
+        self._triangles = triangles
+        self._triangle_offsets = triangle_offsets
+
+    def customize(self):
+        """Recomputes every arc weight from the graph's current metric.
+
+        Arcs touching an offline node are given an infinite weight, so the
+        hierarchy never routes through one. Runs in time linear in the
+        number of lower triangles.
+        """
+        graph = self.graph
+        n = len(graph)
+        offsets, targets, latencies = graph.offsets, graph.targets, graph.latencies
+        active = graph.active
+        weights = [INF] * len(self.up_targets)
+        middle = array("q", [-1]) * len(self.up_targets)
+        arc_of = self._arc_of
+        for v in range(n):
+            if not active[v]:
+                continue
+            for k in range(offsets[v], offsets[v + 1]):
+                u = targets[k]
+                if active[u] and self.rank[u] > self.rank[v]:
+                    weights[arc_of[v * n + u]] = latencies[k]
+
+        triangles, triangle_offsets = self._triangles, self._triangle_offsets
+        for position, x in enumerate(self._order):
+            start, end = triangle_offsets[position], triangle_offsets[position + 1]
+            for t in range(start, end, 3):
+                a, b, c = triangles[t], triangles[t + 1], triangles[t + 2]
+                detour = weights[a] + weights[b]
+                if detour < weights[c]:
+                    weights[c] = detour
+                    middle[c] = x
+        self.weights = weights
+        self.middle = middle
+        self.metric_version = graph.metric_version
+
+    def is_current(self, graph):
+        """Returns True if the hierarchy can answer queries on `graph` as is."""
+        return graph is self.graph and graph.metric_version == self.metric_version
+
+    def memory_bytes(self):
+        """Estimates the memory held by the hierarchy's arrays and tables."""
+        sizes = [
+            self.rank.itemsize * len(self.rank),
+            self.etree_parent.itemsize * len(self.etree_parent),
+            self.up_offsets.itemsize * len(self.up_offsets),
+            self.up_tails.itemsize * len(self.up_tails),
+            self.up_targets.itemsize * len(self.up_targets),
+            self._triangles.itemsize * len(self._triangles),
+            self._triangle_offsets.itemsize * len(self._triangle_offsets),
+            sys.getsizeof(self._arc_of),
+        ]
+        if hasattr(self, "weights"):
+            sizes.append(sys.getsizeof(self.weights))
+            sizes.append(self.middle.itemsize * len(self.middle))
+        return sum(sizes)
+
+    def _upward_search(self, start):
+        """Relaxes upward arcs along the elimination-tree path above `start`.
+
+        In a CCH every node reachable upward from `start` is an ancestor of
+        it in the elimination tree (whose parent links point to each node's
+        lowest-ranked upward neighbor), so visiting the ancestors in rank
+        order settles them without a priority queue.
+
+        Returns:
+            tuple: Distances and parent arcs keyed by node index, plus the
+                   ancestors in the order they were visited.
+        """
+        up_offsets, up_targets = self.up_offsets, self.up_targets
+        weights, etree_parent = self.weights, self.etree_parent
+        dist = {start: 0}
+        parent = {start: -1}
+        ancestors = []
+        v = start
+        while v >= 0:
+            ancestors.append(v)
+            d = dist.get(v, INF)
+            if d < INF:
+                for a in range(up_offsets[v], up_offsets[v + 1]):
+                    nd = d + weights[a]
+                    u = up_targets[a]
+                    if nd < dist.get(u, INF):
+                        dist[u] = nd
+                        parent[u] = a
+            v = etree_parent[v]
+        return dist, parent, ancestors
+
+    def _expand(self, start, parent, node):
+        """Expands the upward-search tree path from `start` to `node`.
+
+        Returns:
+            list: Original node indices from `start` to `node`.
+        """
+        arcs = []
+        while node != start:
+            arc = parent[node]
+            arcs.append(arc)
+            node = self.up_tails[arc]
+        path = [start]
+        for arc in reversed(arcs):
+            self._append_arc(arc, path)
+        return path
+
+    def _append_arc(self, arc, path):
+        """Appends the original nodes of `arc`, walked from path[-1], to `path`."""
+        n = len(self.graph)
+        stack = [(arc, path[-1])]
+        while stack:
+            arc, start = stack.pop()
+            tail, head = self.up_tails[arc], self.up_targets[arc]
+            end = head if start == tail else tail
+            mid = self.middle[arc]
+            if mid < 0:
+                path.append(end)
+                continue
+            first = self._arc_of[mid * n + start]
+            second = self._arc_of[mid * n + end]
+            stack.append((second, mid))
+            stack.append((first, start))
+
+    def shortest_path(self, source, target):
+        """Answers a point-to-point query with a bidirectional upward search.
+
+        Args:
+            source (int): The index of the starting node.
+            target (int): The index of the destination node.
+
+        Returns:
+            tuple: A list of node indices from source to target and the total
+                   latency, or (None, float('inf')) if no path exists.
+        """
+        active = self.graph.active
+        if not (active[source] and active[target]):
+            return None, INF
+        forward, forward_parent, _ = self._upward_search(source)
+        backward, backward_parent, ancestors = self._upward_search(target)
+        self.graph._scratch.settled = len(forward) + len(backward)
+        best, meeting = INF, -1
+        for v in ancestors:
+            total = forward.get(v, INF) + backward.get(v, INF)
+            if total < best:
+                best, meeting = total, v
+        if meeting < 0:
+            return None, INF
+        path = self._expand(source, forward_parent, meeting)
+        back = self._expand(target, backward_parent, meeting)
+        path.extend(reversed(back[:-1]))
+        return path, best
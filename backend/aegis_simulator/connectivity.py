@@ -0,0 +1,231 @@
+# backend/aegis_simulator/connectivity.py
+
+import time
+from array import array
+from collections import deque
+
+
+class ConnectivityIndex:
+    """The connected components of the online nodes of a CompactGraph.
+
+    Every online node carries the label of its component, so whether two
+    nodes can reach each other is a single comparison. The index follows
+    status changes incrementally (see `node_status_changed`):
+
+    - A node coming online joins the components of its neighbors; when two
+      components merge, the smaller one is relabeled, so a node is relabeled
+      O(log n) times over any sequence of merges.
+    - A node going offline may split its component. One search per
+      neighbor runs in lockstep, merging when they meet, until only one is
+      still going; the pieces found by the finished searches get new labels
+      and the rest keeps the old one. The cost is proportional to the
+      smaller pieces, not to the whole component.
+
+    Changes relabel nodes in place, so a change costs time proportional to
+    the nodes it relabels, not to the whole graph. Changes must not run
+    concurrently; Network makes them under its lock. Readers on other
+    threads do not lock: a read that overlapped a change is retried, so it
+    never sees a component that is only partly relabeled.
+
+    Attributes:
+        graph (CompactGraph): The graph the index follows.
+    """
+
+    def __init__(self, graph):
+        """Labels the components of `graph` from scratch.
+
+        Args:
+            graph (CompactGraph): The graph to index.
+        """
+        self.graph = graph
+        n = len(graph)
+        labels = array("q", [-1]) * n
+        sizes = {}
+        for start in range(n):
+            if graph.active[start] and labels[start] < 0:
+                sizes[start] = self._relabel(labels, start, -1, start)
+        self._next_label = n
+        self._labels, self._sizes = labels, sizes
+        # Odd while a change is being made; see `_read`.
+        self._changes = 0
+
+    @property
+    def count(self):
+        """int: The number of components."""
+        return len(self._sizes)
+
+    def label(self, i):
+        """Returns the component label of node `i`, or -1 if it is offline."""
+        return self._labels[i]
+
+    def size(self, label):
+        """Returns the number of nodes in the component with `label`."""
+        return self._sizes.get(label, 0)
+
+    def connected(self, i, j):
+        """Returns whether online nodes `i` and `j` are in one component."""
+        labels = self._labels
+        return self._read(lambda: labels[i] >= 0 and labels[i] == labels[j])
+
+    def components(self):
+        """Lists the components, largest first.
+
+        Returns:
+            list: (label, node indices) tuples.
+        """
+
+        def read():
+            members = {}
+            for i, label in enumerate(self._labels):
+                if label >= 0:
+                    members.setdefault(label, []).append(i)
+            return members
+
+        members = self._read(read)
+        return sorted(members.items(), key=lambda item: -len(item[1]))
+
+    def _read(self, read):
+        """Returns `read()`, retrying it until no change overlapped it."""
+        while True:
+            before = self._changes
+            if not before & 1:
+                result = read()
+                if self._changes == before:
+                    return result
+            # Let the thread making the change finish it.
+            time.sleep(0)
+
+    def _relabel(self, labels, start, old, new):
+        """Gives `new` to every node reachable from `start` through `old` nodes.
+
+        Returns:
+            int: The number of nodes relabeled.
+        """
+        graph = self.graph
+        offsets, targets, active = graph.offsets, graph.targets, graph.active
+        labels[start] = new
+        stack, count = [start], 1
+        while stack:
+            u = stack.pop()
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if labels[v] == old and active[v]:
+                    labels[v] = new
+                    stack.append(v)
+                    count += 1
+        return count
+
+    def node_status_changed(self, i):
+        """Updates the index after node `i` went online or offline.
+
+        The graph's status bitmap must already hold the new status.
+
+        Args:
+            i (int): The index of the node.
+        """
+        labels, sizes = self._labels, self._sizes
+        self._changes += 1
+        try:
+            if self.graph.active[i]:
+                if labels[i] < 0:
+                    self._join(labels, sizes, i)
+            elif labels[i] >= 0:
+                self._leave(labels, sizes, i)
+        finally:
+            self._changes += 1
+
+    def _join(self, labels, sizes, i):
+        graph = self.graph
+        label = labels[i] = self._next_label
+        self._next_label += 1
+        sizes[label] = 1
+        for k in range(graph.offsets[i], graph.offsets[i + 1]):
+            j = graph.targets[k]
+            if labels[j] < 0 or labels[j] == labels[i]:
+                continue
+            small, large = labels[i], labels[j]
+            start = i
+            if sizes[small] > sizes[large]:
+                small, large, start = large, small, j
+            self._relabel(labels, start, small, large)
+            sizes[large] += sizes.pop(small)
+
+    def _leave(self, labels, sizes, i):
+        label = labels[i]
+        labels[i] = -1
+        sizes[label] -= 1
+        if not sizes[label]:
+            del sizes[label]
+            return
+        for piece in self._split(labels, i, label):
+            new = self._next_label
+            self._next_label += 1
+            for v in piece:
+                labels[v] = new
+            sizes[new] = len(piece)
+            sizes[label] -= len(piece)
+
+    def _split(self, labels, removed, label):
+        """Finds the pieces that lost their link to the rest of `label`.
+
+        Returns:
+            list: Lists of node indices, one per piece that needs a new
+                  label; the largest piece found is left out when every
+                  search finished.
+        """
+        graph = self.graph
+        offsets, targets = graph.offsets, graph.targets
+        starts = []
+        for k in range(offsets[removed], offsets[removed + 1]):
+            v = targets[k]
+            if labels[v] == label and v not in starts:
+                starts.append(v)
+        if len(starts) < 2:
+            return []
+
+        owner = {v: g for g, v in enumerate(starts)}
+        parent = list(range(len(starts)))
+        queues = [deque([v]) for v in starts]
+        members = [[v] for v in starts]
+        live, finished = set(parent), []
+
+        def find(g):
+            while parent[g] != g:
+                parent[g] = parent[parent[g]]
+                g = parent[g]
+            return g
+
+        while len(live) > 1:
+            for g in sorted(live):
+                if g not in live:
+                    continue
+                if not queues[g]:
+                    live.discard(g)
+                    finished.append(g)
+                    continue
+                u = queues[g].popleft()
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if labels[v] != label:
+                        continue
+                    other = owner.get(v)
+                    if other is None:
+                        owner[v] = g
+                        queues[g].append(v)
+                        members[g].append(v)
+                        continue
+                    other = find(other)
+                    if other == g:
+                        continue
+                    # The searches met, so they are exploring the same piece.
+                    if len(members[other]) > len(members[g]):
+                        g, other = other, g
+                    parent[other] = g
+                    queues[g].extend(queues[other])
+                    members[g].extend(members[other])
+                    live.discard(other)
+                    queues[other], members[other] = None, None
+        pieces = [members[g] for g in finished]
+        if not live:
+            pieces.remove(max(pieces, key=len))
+        return pieces
@@ -0,0 +1,358 @@
+# backend/aegis_simulator/contingency.py
+
+import heapq
+import multiprocessing
+import os
+import random
+import time
+from array import array
+
+from .graph import INF
+
+# Below this many scenarios, starting worker processes costs more than it
+# saves.
+PARALLEL_MIN_SCENARIOS = 64
+
+
+class _Evaluator:
+    """Measures terminal-to-terminal latencies under failure scenarios.
+
+    Each terminal keeps its baseline shortest-path tree. A scenario that
+    fails none of the nodes on the tree paths to the later terminals
+    reuses the baseline latencies outright. Otherwise only the subtrees
+    below the failed nodes lost their paths: their nodes are reattached
+    through their neighbors outside the subtrees, whose baseline distances
+    still hold, and a Dijkstra search confined to the subtrees finishes
+    the repair.
+    """
+
+    def __init__(self, graph, terminals):
+        self.graph = graph
+        self.terminals = terminals
+        self.trees = []
+        self.baseline = []
+        self.used = []
+        n = len(graph)
+        for position, source in enumerate(terminals):
+            tree = graph.shortest_path_tree(source)
+            later = terminals[position + 1 :]
+            self.baseline.append([tree.dist[t] for t in later])
+            used = {source}
+            for t in later:
+                if tree.dist[t] == INF:
+                    continue
+                node = t
+                while node not in used:
+                    used.add(node)
+                    node = tree.prev[node]
+            self.used.append(used)
+            # The tree's child lists in CSR form, for walking subtrees.
+            counts = array("q", [0]) * (n + 1)
+            for parent in tree.prev:
+                if parent >= 0:
+                    counts[parent + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            children = array("q", [0]) * counts[n]
+            fill = array("q", counts)
+            for child, parent in enumerate(tree.prev):
+                if parent >= 0:
+                    children[fill[parent]] = child
+                    fill[parent] += 1
+            self.trees.append((tree.dist, counts, children))
+
+    def _subtree(self, position, failed):
+        """Returns the nodes whose tree paths pass through a failed node."""
+        dist, offsets, children = self.trees[position]
+        subtree = set()
+        stack = [f for f in failed if dist[f] != INF]
+        subtree.update(stack)
+        while stack:
+            u = stack.pop()
+            for k in range(offsets[u], offsets[u + 1]):
+                subtree.add(children[k])
+                stack.append(children[k])
+        return subtree
+
+    def _repair(self, position, failed, subtree, targets):
+        """Computes the new latencies to `targets`, which lie in `subtree`."""
+        graph = self.graph
+        offsets, neighbors, latencies = graph.offsets, graph.targets, graph.latencies
+        active = graph.active
+        dist = self.trees[position][0]
+        new = {}
+        heap = []
+        for v in subtree:
+            if v in failed:
+                continue
+            best = INF
+            for k in range(offsets[v], offsets[v + 1]):
+                u = neighbors[k]
+                if u not in subtree and active[u] and dist[u] + latencies[k] < best:
+                    best = dist[u] + latencies[k]
+            if best != INF:
+                new[v] = best
+                heap.append((best, v))
+        heapq.heapify(heap)
+        remaining = set(targets)
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while heap and remaining:
+            d, u = heappop(heap)
+            if d > new[u]:
+                continue
+            remaining.discard(u)
+            for k in range(offsets[u], offsets[u + 1]):
+                v = neighbors[k]
+                if v not in subtree or v in failed or not active[v]:
+                    continue
+                nd = d + latencies[k]
+                if nd < new.get(v, INF):
+                    new[v] = nd
+                    heappush(heap, (nd, v))
+        return {t: INF if t in remaining else new[t] for t in targets}
+
+    def evaluate(self, failed):
+        """Returns the latencies between terminals with `failed` offline.
+
+        Args:
+            failed (tuple): Indices of the failed nodes.
+
+        Returns:
+            tuple: One list per terminal of the latencies to the later
+                   terminals, and the number of trees that were repaired.
+        """
+        rows, repairs = [], 0
+        for position, source in enumerate(self.terminals):
+            later = self.terminals[position + 1 :]
+            if source in failed:
+                rows.append([INF] * len(later))
+                continue
+            if self.used[position].isdisjoint(failed):
+                rows.append(self.baseline[position])
+                continue
+            repairs += 1
+            subtree = self._subtree(position, failed)
+            repaired = self._repair(
+                position, failed, subtree, [t for t in later if t in subtree]
+            )
+            rows.append(
+                [
+                    repaired.get(t, latency)
+                    for t, latency in zip(later, self.baseline[position])
+                ]
+            )
+        return rows, repairs
+
+
+_worker_evaluator = None
+
+
+def _start_worker(graph, terminals):
+    global _worker_evaluator
+    _worker_evaluator = _Evaluator(graph, terminals)
+
+
+def _evaluate_chunk(scenarios):
+    return [_worker_evaluator.evaluate(failed) for failed in scenarios]
+
+
+class ContingencyAnalysis:
+    """Ranks node failures by how badly they hurt a set of terminal nodes.
+
+    Every single-node failure (N-1) and a random sample of double failures
+    (N-2) are evaluated against a frozen copy of the topology (a NetworkView
+    taken when the analysis starts), never against the live Network, so
+    the dashboard and other clients are not disturbed. A scenario hurts a
+    pair of terminals when it disconnects them or pushes their latency past
+    `latency_threshold`.
+
+    A failure can only lengthen a shortest path if it removes a node on
+    it, so only the nodes on the baseline paths between terminals can have
+    any effect; the others are reported as harmless without evaluation.
+    The remaining scenarios reuse or repair each terminal's baseline
+    shortest-path tree rather than searching from scratch, and are spread
+    over a pool of worker processes, each holding its own copy of the
+    graph.
+
+    Attributes:
+        network (Network): The analyzed network.
+        terminals (list): The terminal Node objects, e.g. command nodes.
+        latency_threshold (float): The latency above which a pair counts as
+                                   degraded, or None.
+    """
+
+    def __init__(
+        self,
+        network,
+        terminal_ids,
+        latency_threshold=None,
+        double_failures=0,
+        seed=0,
+        workers=None,
+    ):
+        """Prepares an analysis of the network's current topology.
+
+        Args:
+            network (Network): The network to analyze.
+            terminal_ids (iterable): IDs of the nodes whose connectivity
+                matters; every pair of them is monitored.
+            latency_threshold (float, optional): The latency a pair must
+                stay within. Defaults to None, monitoring only connectivity.
+            double_failures (int, optional): How many N-2 scenarios to
+                sample. Defaults to 0.
+            seed (int, optional): The seed for sampling N-2 scenarios.
+                Defaults to 0.
+            workers (int, optional): The number of worker processes.
+                Defaults to the number of CPUs; 1 runs everything in this
+                process.
+
+        Raises:
+            ValueError: If a terminal ID is unknown.
+        """
+        self.network = network
+        self.graph = network.view().graph
+        indices = []
+        for node_id in terminal_ids:
+            if node_id not in self.graph.index:
+                raise ValueError(f"Unknown node ID '{node_id}'")
+            if self.graph.index[node_id] not in indices:
+                indices.append(self.graph.index[node_id])
+        self._indices = indices
+        self.terminals = [self.graph.nodes[i] for i in indices]
+        self.latency_threshold = latency_threshold
+        self.double_failures = double_failures
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+
+    def _scenarios(self, critical):
+        """Lists the N-1 scenarios worth evaluating and the sampled N-2 ones."""
+        active = self.graph.active
+        singles = [(i,) for i in sorted(critical)]
+        online = [i for i in range(len(self.graph)) if active[i]]
+        doubles = set()
+        if critical and len(online) > 1:
+            rng = random.Random(self.seed)
+            candidates = sorted(critical)
+            # Give up on duplicates eventually, e.g. on tiny networks.
+            attempts = 10 * (self.double_failures + 1)
+            while len(doubles) < self.double_failures and attempts:
+                attempts -= 1
+                first, second = rng.choice(candidates), rng.choice(online)
+                if first != second:
+                    doubles.add(tuple(sorted((first, second))))
+        return singles, sorted(doubles)
+
+    def _evaluate(self, evaluator, scenarios):
+        if self.workers < 2 or len(scenarios) < PARALLEL_MIN_SCENARIOS:
+            return [evaluator.evaluate(failed) for failed in scenarios]
+        size = max(1, -(-len(scenarios) // (self.workers * 4)))
+        chunks = [scenarios[i : i + size] for i in range(0, len(scenarios), size)]
+        context = multiprocessing.get_context()
+        initargs = (self.graph, self._indices)
+        with context.Pool(self.workers, _start_worker, initargs) as pool:
+            results = []
+            for chunk in pool.imap(_evaluate_chunk, chunks):
+                results.extend(chunk)
+            return results
+
+    def _impact(self, failed, rows, baseline):
+        """Scores one scenario against the baseline latencies."""
+        threshold = self.latency_threshold
+        lost = [i for i in failed if i in self._indices]
+        disconnected = degraded = 0
+        total_increase, worst_increase, worst_pair = 0, 0, None
+        for position, (row, base_row) in enumerate(zip(rows, baseline)):
+            source = self._indices[position]
+            for offset, (latency, base) in enumerate(zip(row, base_row)):
+                target = self._indices[position + 1 + offset]
+                if source in failed or target in failed or base == INF:
+                    continue
+                if latency == INF:
+                    disconnected += 1
+                    continue
+                if threshold is not None and base <= threshold < latency:
+                    degraded += 1
+                increase = latency - base
+                total_increase += increase
+                if increase > worst_increase:
+                    worst_increase, worst_pair = increase, (source, target)
+        nodes = self.graph.nodes
+        return {
+            "failed": [nodes[i].name for i in failed],
+            "lost_terminals": [nodes[i].name for i in lost],
+            "disconnected_pairs": disconnected,
+            "degraded_pairs": degraded,
+            "worst_increase": worst_increase,
+            "worst_pair": [nodes[i].name for i in worst_pair] if worst_pair else None,
+            "total_increase": total_increase,
+        }
+
+    def run(self, limit=50):
+        """Evaluates every scenario and ranks them by criticality.
+
+        Scenarios are ranked by the number of terminals lost, then of
+        terminal pairs disconnected, then of pairs pushed past the latency
+        threshold, then by the total latency increase. Scenarios with no
+        effect at all are left out of the ranking.
+
+        Args:
+            limit (int, optional): The number of ranked scenarios to return.
+                Defaults to 50.
+
+        Returns:
+            dict: The 'terminals', the 'latency_threshold', the 'baseline'
+                  pair counts, per-kind scenario counts in 'scenarios', the
+                  number of baseline trees 'repaired' and 'reused' as they
+                  were, the 'elapsed' seconds, and the
+                  'ranking' list of scenario impacts.
+        """
+        started = time.perf_counter()
+        evaluator = _Evaluator(self.graph, self._indices)
+        active = self.graph.active
+        critical = {i for used in evaluator.used for i in used if active[i]}
+        singles, doubles = self._scenarios(critical)
+        scenarios = singles + doubles
+        results = self._evaluate(evaluator, scenarios)
+
+        baseline = evaluator.baseline
+        threshold = self.latency_threshold
+        pairs = [latency for row in baseline for latency in row]
+        impacts, repairs = [], 0
+        for failed, (rows, count) in zip(scenarios, results):
+            repairs += count
+            impact = self._impact(failed, rows, baseline)
+            if (
+                impact["lost_terminals"]
+                or impact["disconnected_pairs"]
+                or impact["total_increase"]
+            ):
+                impacts.append(impact)
+        impacts.sort(
+            key=lambda impact: (
+                -len(impact["lost_terminals"]),
+                -impact["disconnected_pairs"],
+                -impact["degraded_pairs"],
+                -impact["total_increase"],
+            )
+        )
+        online = sum(self.graph.active)
+        return {
+            "terminals": [node.name for node in self.terminals],
+            "latency_threshold": threshold,
+            "baseline": {
+                "pairs": len(pairs),
+                "disconnected_pairs": sum(1 for p in pairs if p == INF),
+                "degraded_pairs": sum(
+                    1 for p in pairs if threshold is not None and INF > p > threshold
+                ),
+            },
+            "scenarios": {
+                "n-1": online,
+                "n-1_evaluated": len(singles),
+                "n-2_sampled": len(doubles),
+            },
+            "repaired": repairs,
+            "reused": len(scenarios) * len(self._indices) - repairs,
+            "elapsed": time.perf_counter() - started,
+            "ranking": impacts[:limit],
+        }
@@ -0,0 +1,211 @@
+# backend/aegis_simulator/distances.py
+
+import multiprocessing
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+# A distance stream: a header, the NUL-separated UTF-8 names of the source
+# nodes and then of the column nodes, padding to an 8-byte boundary, and
+# one row of little-endian float64 latencies per source (inf if
+# unreachable).
+DISTANCE_MAGIC = b"AEGISDST"
+# magic, row count, column count, byte length of the name table
+_HEADER = struct.Struct("<8sqqq")
+
+# Floyd-Warshall is only considered up to this many nodes (a 2048 x 2048
+# matrix of float64 takes 32 MiB).
+FLOYD_WARSHALL_MAX_NODES = 2048
+# Below this many link scans, starting worker processes costs more than
+# it saves.
+PARALLEL_MIN_WORK = 2_000_000
+
+DistanceTable = namedtuple("DistanceTable", "sources nodes values")
+DistanceTable.__doc__ = """Latencies from some source nodes to every node.
+
+Attributes:
+    sources (list): The source nodes, one per row.
+    nodes (list): The nodes, one per column, in compact graph order.
+    values (numpy.ndarray): float64 latencies, inf where unreachable; one
+        row per source, or a single row for `Network.distances_from`.
+"""
+
+
+def distances_from(graph, source):
+    """Returns the latency from `source` to every node of `graph`.
+
+    Args:
+        graph (CompactGraph): The graph to search.
+        source (int): The index of the source node.
+
+    Returns:
+        numpy.ndarray: float64 latencies by node index, inf where
+                       unreachable (everywhere if the source is offline).
+    """
+    return np.array(graph.shortest_path_tree(source).dist, dtype=np.float64)
+
+
+def _use_floyd_warshall(graph, source_count):
+    """Estimates whether Floyd-Warshall beats one Dijkstra run per source.
+
+    NumPy relaxes about a hundred matrix cells in the time a Dijkstra run
+    in Python scans one link, so Floyd-Warshall's n^3 cells win on small or
+    dense graphs when most sources are asked for.
+    """
+    n = len(graph)
+    links = max(len(graph.targets), n)
+    return 0 < n <= FLOYD_WARSHALL_MAX_NODES and n**3 < 100 * source_count * links
+
+
+def floyd_warshall(graph):
+    """Computes all-pairs latencies with a vectorized Floyd-Warshall.
+
+    Args:
+        graph (CompactGraph): The graph to measure.
+
+    Returns:
+        numpy.ndarray: An n x n float64 matrix, inf where unreachable. Rows
+                       and columns of offline nodes are all inf.
+    """
+    n = len(graph)
+    offsets = np.asarray(graph.offsets, dtype=np.int64)
+    targets = np.asarray(graph.targets, dtype=np.int64)
+    latencies = np.asarray(graph.latencies, dtype=np.float64)
+    matrix = np.full((n, n), np.inf)
+    matrix[np.repeat(np.arange(n), np.diff(offsets)), targets] = latencies
+    np.fill_diagonal(matrix, 0.0)
+    offline = np.frombuffer(bytes(graph.active), dtype=np.uint8) == 0
+    matrix[offline, :] = np.inf
+    matrix[:, offline] = np.inf
+    for k in range(n):
+        np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+    return matrix
+
+
+_worker_graph = None
+
+
+def _start_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _dijkstra_rows(graph, sources):
+    rows = np.empty((len(sources), len(graph)))
+    for row, source in enumerate(sources):
+        rows[row] = graph.shortest_path_tree(source).dist
+    return rows
+
+
+def _worker_rows(sources):
+    return _dijkstra_rows(_worker_graph, sources)
+
+
+def distance_rows(graph, sources, workers=None):
+    """Computes the latencies from each source, yielding blocks of rows.
+
+    Small or dense problems are solved with `floyd_warshall`; otherwise one
+    Dijkstra run per source, spread over a pool of worker processes when
+    there is enough work. Blocks are yielded in source order as they are
+    finished, so callers can stream them without holding the whole matrix.
+
+    Args:
+        graph (CompactGraph): The graph to measure. It is pickled for the
+            workers, so it must not change while rows are computed; pass a
+            NetworkView's graph.
+        sources (list): Indices of the source nodes.
+        workers (int, optional): The number of worker processes. Defaults to
+            the number of CPUs; 1 computes everything in this process.
+
+    Yields:
+        numpy.ndarray: float64 blocks of rows, one row per source.
+    """
+    sources = list(sources)
+    if not sources:
+        return
+    if _use_floyd_warshall(graph, len(sources)):
+        yield floyd_warshall(graph)[sources]
+        return
+    workers = workers or os.cpu_count() or 1
+    work = len(sources) * max(len(graph.targets), len(graph))
+    if workers < 2 or len(sources) < 2 or work < PARALLEL_MIN_WORK:
+        yield _dijkstra_rows(graph, sources)
+        return
+    size = max(1, -(-len(sources) // (workers * 4)))
+    chunks = [sources[i : i + size] for i in range(0, len(sources), size)]
+    context = multiprocessing.get_context()
+    with context.Pool(workers, _start_worker, (graph,)) as pool:
+        yield from pool.imap(_worker_rows, chunks)
+
+
+def distance_matrix(graph, sources=None, workers=None):
+    """Computes the latencies from each source to every node.
+
+    Args:
+        graph (CompactGraph): The graph to measure; see `distance_rows`.
+        sources (list, optional): Indices of the source nodes. Defaults to
+            every node.
+        workers (int, optional): See `distance_rows`.
+
+    Returns:
+        numpy.ndarray: A float64 matrix with one row per source and one
+                       column per node, inf where unreachable.
+    """
+    if sources is None:
+        sources = range(len(graph))
+    sources = list(sources)
+    blocks = list(distance_rows(graph, sources, workers))
+    if not blocks:
+        return np.empty((0, len(graph)))
+    return np.vstack(blocks)
+
+
+def stream_header(source_names, node_names):
+    """Encodes the header and name table of a distance stream.
+
+    Args:
+        source_names (list): The names of the source nodes, one per row.
+        node_names (list): The names of the nodes, one per column.
+
+    Returns:
+        bytes: Everything that precedes the rows.
+    """
+    source_names, node_names = list(source_names), list(node_names)
+    names = "\0".join(source_names + node_names).encode("utf-8")
+    names += b"\0" * (-len(names) % 8)
+    source_count, node_count = len(source_names), len(node_names)
+    return _HEADER.pack(DISTANCE_MAGIC, source_count, node_count, len(names)) + names
+
+
+def encode_rows(block):
+    """Encodes a block of rows for a distance stream."""
+    return np.ascontiguousarray(block, dtype="<f8").tobytes()
+
+
+def read_stream(data):
+    """Decodes a distance stream written by `stream_header` and `encode_rows`.
+
+    Args:
+        data (bytes): The whole stream.
+
+    Returns:
+        DistanceTable: The source and column node names and the matrix.
+
+    Raises:
+        ValueError: If `data` is not a complete distance stream.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated distance stream")
+    magic, rows, columns, length = _HEADER.unpack_from(data)
+    if magic != DISTANCE_MAGIC:
+        raise ValueError("Not a distance stream")
+    start = _HEADER.size + length
+    if len(data) != start + rows * columns * 8:
+        raise ValueError("Truncated distance stream")
+    names = data[_HEADER.size : start].rstrip(b"\0").decode("utf-8").split("\0")
+    if rows + columns == 0:
+        names = []
+    values = np.frombuffer(data, dtype="<f8", offset=start).reshape(rows, columns)
+    return DistanceTable(names[:rows], names[rows:], values)
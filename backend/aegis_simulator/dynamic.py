@@ -0,0 +1,155 @@
+# backend/aegis_simulator/dynamic.py
+
+import heapq
+
+from .graph import INF
+
+
+class DynamicShortestPathTree:
+    """A shortest-path tree that is repaired in place as the topology changes.
+
+    Follows the Ramalingam-Reps approach to dynamic single-source shortest
+    paths. Changes that can only shorten paths (a node coming online, a
+    latency decrease) seed a Dijkstra search from the improved nodes and
+    stop as soon as nothing else improves. Changes that can only lengthen
+    paths (a node going offline, a latency increase on a tree link) reset
+    just the subtree hanging below the change and re-settle it from its
+    unaffected boundary. Nodes outside the affected region are never
+    touched.
+
+    The tree must be told about every change to its CompactGraph, after the
+    graph itself has been patched.
+
+    Attributes:
+        graph (CompactGraph): The graph the tree was computed on.
+        source (int): The index of the root node.
+        tree (ShortestPathTree): The current distances and predecessors.
+    """
+
+    def __init__(self, graph, source):
+        """Computes the initial tree with a full Dijkstra run.
+
+        Args:
+            graph (CompactGraph): The graph to compute the tree on.
+            source (int): The index of the root node.
+        """
+        self.graph = graph
+        self.source = source
+        self.tree = graph.shortest_path_tree(source)
+
+    def path_to(self, target):
+        """Returns the current path and latency to `target`.
+
+        See ShortestPathTree.path_to.
+        """
+        return self.tree.path_to(target)
+
+    def _subtree(self, root):
+        """Returns `root` and every node whose tree path passes through it."""
+        graph, prev = self.graph, self.tree.prev
+        offsets, targets = graph.offsets, graph.targets
+        nodes = [root]
+        for u in nodes:
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if prev[v] == u:
+                    nodes.append(v)
+        return nodes
+
+    def _propagate(self, heap):
+        """Runs Dijkstra from the seeded heap, relaxing only strict improvements."""
+        graph = self.graph
+        offsets, targets, latencies = graph.offsets, graph.targets, graph.latencies
+        active = graph.active
+        dist, prev = self.tree.dist, self.tree.prev
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if not active[v]:
+                    continue
+                nd = d + latencies[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heappush(heap, (nd, v))
+
+    def _best_parent(self, v):
+        """Returns the cheapest (distance, parent) reachable via v's neighbors."""
+        graph = self.graph
+        offsets, targets, latencies = graph.offsets, graph.targets, graph.latencies
+        active, dist = graph.active, self.tree.dist
+        best, parent = INF, -1
+        for k in range(offsets[v], offsets[v + 1]):
+            u = targets[k]
+            if active[u] and dist[u] + latencies[k] < best:
+                best, parent = dist[u] + latencies[k], u
+        return best, parent
+
+    def _resettle(self, affected):
+        """Resets `affected` nodes and re-settles them from the unaffected rest."""
+        dist, prev = self.tree.dist, self.tree.prev
+        active = self.graph.active
+        for v in affected:
+            dist[v] = INF
+            prev[v] = -1
+        heap = []
+        for v in affected:
+            if not active[v]:
+                continue
+            if v == self.source:
+                dist[v] = 0
+                heap.append((0, v))
+                continue
+            best, parent = self._best_parent(v)
+            if parent >= 0:
+                dist[v], prev[v] = best, parent
+                heap.append((best, v))
+        heapq.heapify(heap)
+        self._propagate(heap)
+
+    def node_status_changed(self, node):
+        """Repairs the tree after the node at index `node` changed status.
+
+        Args:
+            node (int): The index of the node that went offline or online.
+        """
+        if not self.graph.active[node]:
+            self._resettle(self._subtree(node))
+            return
+        dist, prev = self.tree.dist, self.tree.prev
+        if node == self.source:
+            best, parent = 0, -1
+        else:
+            best, parent = self._best_parent(node)
+        if best < dist[node]:
+            dist[node], prev[node] = best, parent
+            self._propagate([(best, node)])
+
+    def link_latency_changed(self, i, j, old_latency, new_latency):
+        """Repairs the tree after the link between `i` and `j` changed latency.
+
+        Args:
+            i (int): The index of one end of the link.
+            j (int): The index of the other end of the link.
+            old_latency (int): The latency before the change.
+            new_latency (int): The latency after the change.
+        """
+        dist, prev = self.tree.dist, self.tree.prev
+        if new_latency < old_latency:
+            active = self.graph.active
+            heap = []
+            for a, b in ((i, j), (j, i)):
+                if active[a] and active[b] and dist[a] + new_latency < dist[b]:
+                    dist[b], prev[b] = dist[a] + new_latency, a
+                    heap.append((dist[b], b))
+            heapq.heapify(heap)
+            self._propagate(heap)
+        elif new_latency > old_latency:
+            if prev[j] == i:
+                self._resettle(self._subtree(j))
+            elif prev[i] == j:
+                self._resettle(self._subtree(i))
@@ -0,0 +1,235 @@
+# backend/aegis_simulator/eventlog.py
+
+import math
+import os
+import sqlite3
+import threading
+
+from .events import EventRecord, render
+from .sink import BatchWriter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    source TEXT,
+    destination TEXT,
+    status INTEGER NOT NULL,
+    latency REAL,
+    sim_time REAL,
+    path TEXT,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+CREATE INDEX IF NOT EXISTS events_type ON events (event_type);
+CREATE INDEX IF NOT EXISTS events_source ON events (source);
+CREATE INDEX IF NOT EXISTS events_destination ON events (destination);
+"""
+
+_INSERT = (
+    "INSERT INTO events (timestamp, event_type, source, destination, status,"
+    " latency, sim_time, path, reason) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Paths are stored as node names joined by this separator.
+_PATH_SEPARATOR = "\x1f"
+
+# The event types whose status means delivered (SUCCESS) or not (FAILED).
+# For STATUS_CHANGE events it means online or offline instead.
+ROUTING_EVENT_TYPES = ("MESSAGE_ROUTE", "MESSAGE_TRANSIT")
+
+
+def _nullable(value):
+    """Stores NaN, the EventRecord marker for a missing number, as NULL."""
+    return None if math.isnan(value) else value
+
+
+class EventLog(BatchWriter):
+    """A persistent, indexed event log in a local SQLite database.
+
+    Register it with `Reporter.add_sink`. Events are inserted from a
+    background thread, one transaction per batch, into a database in WAL
+    mode so that `search` can read while the writer appends. The table is
+    indexed on timestamp, event type, and source and destination node, and
+    searches return one page of results at a time instead of loading the
+    whole log.
+
+    Row IDs follow insertion order, so results are ordered by ID. Time
+    windows filter on the timestamp column itself: writers in other threads
+    or processes may insert events slightly out of timestamp order.
+
+    Attributes:
+        path (str): The database file.
+    """
+
+    def __init__(self, path, flush_interval=1.0, batch_size=1000):
+        """Opens or creates the database and starts the writer thread.
+
+        Args:
+            path (str): The database file; its directory is created if needed.
+            flush_interval (float, optional): The longest time in seconds an
+                event waits in memory. Defaults to 1.0.
+            batch_size (int, optional): Wake the writer early once this many
+                events are waiting. Defaults to 1000.
+        """
+        super().__init__(flush_interval, batch_size)
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+        self._readers = threading.local()
+        self._writer = None
+        self._start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _write(self, records):
+        if self._writer is None:
+            self._writer = self._connect()
+        with self._writer:
+            self._writer.executemany(
+                _INSERT,
+                [
+                    (
+                        record.timestamp,
+                        record.event_type,
+                        record.source,
+                        record.destination,
+                        record.status,
+                        _nullable(record.latency),
+                        _nullable(record.sim_time),
+                        _PATH_SEPARATOR.join(record.path) if record.path else None,
+                        record.reason,
+                    )
+                    for record in records
+                ],
+            )
+
+    def _finish(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _reader(self):
+        """Returns this thread's read connection to the database."""
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = self._readers.connection = self._connect()
+        return connection
+
+    def search(
+        self,
+        node=None,
+        source=None,
+        destination=None,
+        event_type=None,
+        status=None,
+        start=None,
+        end=None,
+        before_id=None,
+        limit=100,
+    ):
+        """Finds logged events, newest first.
+
+        Every filter is optional and they are combined with AND.
+
+        Args:
+            node (str, optional): A node name that is either the source or
+                the destination.
+            source (str, optional): The source node name.
+            destination (str, optional): The destination node name.
+            event_type (str, optional): The event type, e.g. "MESSAGE_ROUTE".
+            status (str, optional): "SUCCESS" or "FAILED"; only matches
+                routing events (see ROUTING_EVENT_TYPES).
+            start (float, optional): Only events at or after this time, in
+                seconds since the epoch.
+            end (float, optional): Only events before this time.
+            before_id (int, optional): Only events with a smaller ID, for
+                fetching the next page.
+            limit (int, optional): The maximum number of events. Defaults to
+                100.
+
+        Returns:
+            list: Log entry dictionaries, each with its database 'id'.
+        """
+        reader = self._reader()
+        clauses, parameters = [], []
+        for column, value in (
+            ("source", source),
+            ("destination", destination),
+            ("event_type", event_type),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                parameters.append(value)
+        if status is not None:
+            placeholders = ", ".join("?" * len(ROUTING_EVENT_TYPES))
+            clauses.append(f"status = ? AND event_type IN ({placeholders})")
+            parameters.append(1 if status == "SUCCESS" else 0)
+            parameters.extend(ROUTING_EVENT_TYPES)
+        for bound, operator in ((start, ">="), (end, "<")):
+            if bound is not None:
+                clauses.append(f"timestamp {operator} ?")
+                parameters.append(bound)
+        if before_id is not None:
+            clauses.append("id < ?")
+            parameters.append(before_id)
+
+        if node is None:
+            rows = self._select(reader, clauses, parameters, limit)
+        else:
+            # Two index walks merged here are much cheaper than letting
+            # SQLite collect and sort every match of an OR.
+            rows = {}
+            for column in ("source", "destination"):
+                for row in self._select(
+                    reader, clauses + [f"{column} = ?"], parameters + [node], limit
+                ):
+                    rows[row[0]] = row
+            rows = sorted(rows.values(), reverse=True)[:limit]
+
+        results = []
+        for row in rows:
+            entry = render(self._record(row[1:]))
+            entry["id"] = row[0]
+            results.append(entry)
+        return results
+
+    @staticmethod
+    def _select(reader, clauses, parameters, limit):
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return reader.execute(
+            "SELECT id, timestamp, event_type, source, destination, status,"
+            f" latency, sim_time, path, reason FROM events{where}"
+            " ORDER BY id DESC LIMIT ?",
+            parameters + [limit],
+        ).fetchall()
+
+    @staticmethod
+    def _record(row):
+        timestamp, kind, source, dest, status, latency, sim_time, path, reason = row
+        return EventRecord(
+            timestamp,
+            kind,
+            source,
+            dest,
+            status,
+            float("nan") if latency is None else latency,
+            float("nan") if sim_time is None else sim_time,
+            tuple(path.split(_PATH_SEPARATOR)) if path else None,
+            reason,
+        )
+
+    def count(self):
+        """Returns the number of events in the database."""
+        return self._reader().execute("SELECT COUNT(*) FROM events").fetchone()[0]
@@ -0,0 +1,374 @@
+# backend/aegis_simulator/events.py
+
+import bisect
+import math
+import time
+from array import array
+from collections import namedtuple
+
+NAN = float("nan")
+
+# One event with its interned fields resolved. Missing numbers are NaN and
+# missing names None; `status` is 1 for success or online and 0 otherwise.
+EventRecord = namedtuple(
+    "EventRecord",
+    "timestamp event_type source destination status latency sim_time path reason",
+)
+
+
+def format_timestamp(seconds):
+    """Formats seconds since the epoch like Reporter.get_timestamp."""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+def _number(value):
+    return int(value) if value.is_integer() else value
+
+
+def render(record, timestamp=None):
+    """Builds the log entry dictionary for an EventRecord.
+
+    Args:
+        record (EventRecord): The event.
+        timestamp (str, optional): The already formatted timestamp.
+
+    Returns:
+        dict: The entry, with the keys its event type has always had.
+    """
+    kind, source, dest = record.event_type, record.source, record.destination
+    success = record.status == 1
+    latency = record.latency
+    entry = {
+        "timestamp": timestamp or format_timestamp(record.timestamp),
+        "event_type": kind,
+    }
+    if kind == "MESSAGE_ROUTE":
+        path = record.path
+        entry["details"] = (
+            f"Route from '{source}' to '{dest}' {'SUCCEEDED' if success else 'FAILED'}."
+        )
+        entry["status"] = "SUCCESS" if success else "FAILED"
+        entry["path_taken"] = " -> ".join(path) if path else "No path found"
+        entry["total_latency_ms"] = _number(latency) if success else "N/A"
+    elif kind == "MESSAGE_TRANSIT":
+        sim_time = _number(record.sim_time)
+        if success:
+            outcome = f"DELIVERED at t={sim_time}ms."
+        else:
+            outcome = f"LOST ({record.reason}) at t={sim_time}ms."
+        entry["details"] = f"Transit from '{source}' to '{dest}' {outcome}"
+        entry["status"] = "SUCCESS" if success else "FAILED"
+        entry["sim_time_ms"] = sim_time
+        entry["total_latency_ms"] = _number(latency) if success else "N/A"
+    elif kind == "STATUS_CHANGE":
+        entry["details"] = (
+            f"Node '{dest}' {'brought ONLINE' if success else 'taken OFFLINE'}."
+        )
+    else:
+        entry["details"] = kind
+        if not math.isnan(latency):
+            entry["total_latency_ms"] = _number(latency)
+    return entry
+
+
+class EventStore:
+    """A bounded, column-oriented ring buffer of simulation events.
+
+    Every event occupies one slot across a set of parallel typed arrays:
+    a wall-clock timestamp, an interned event type, interned source and
+    destination node names, a status flag, a latency, a simulated time, an
+    interned drop reason and, for routing events, the path as a tuple of
+    interned node numbers. Appending an event is a handful of array stores
+    and the memory used is fixed by `capacity`; the dictionaries and
+    strings callers see are only built when events are read.
+
+    Events are numbered with a sequence number that keeps increasing as
+    old events are overwritten, so a reader can ask for everything after
+    the last event it saw.
+
+    The store does no locking of its own; Reporter serializes the threads
+    that write to it.
+
+    Attributes:
+        capacity (int): The maximum number of events retained.
+        max_age (float): Events older than this many seconds are discarded,
+                         or None to keep events until they are overwritten.
+    """
+
+    def __init__(self, capacity=100000, max_age=None):
+        """Initializes an empty store.
+
+        Args:
+            capacity (int, optional): The maximum number of events retained.
+                Defaults to 100000.
+            max_age (float, optional): The retention period in seconds.
+                Defaults to None (limited by capacity only).
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.max_age = max_age
+        self._times = array("d", [0.0]) * capacity
+        self._kinds = array("h", [0]) * capacity
+        self._sources = array("i", [-1]) * capacity
+        self._destinations = array("i", [-1]) * capacity
+        self._statuses = array("b", [0]) * capacity
+        self._latencies = array("d", [NAN]) * capacity
+        self._sim_times = array("d", [NAN]) * capacity
+        self._reasons = array("h", [-1]) * capacity
+        self._paths = [None] * capacity
+        # Interned strings, with a reverse index for interning.
+        self._kind_names, self._kind_index = [], {}
+        self._node_names, self._node_index = [], {}
+        self._reason_names, self._reason_index = [], {}
+        # Sequence numbers of the oldest retained and the next event.
+        self._first = 0
+        self._next = 0
+        self._rendered_second = None
+        self._rendered_stamp = ""
+
+    def __len__(self):
+        return self._next - self._first
+
+    @property
+    def first_seq(self):
+        """int: The sequence number of the oldest retained event."""
+        return self._first
+
+    @property
+    def next_seq(self):
+        """int: The sequence number the next appended event will get."""
+        return self._next
+
+    @staticmethod
+    def _intern(names, index, value):
+        number = index.get(value)
+        if number is None:
+            number = index[value] = len(names)
+            names.append(value)
+        return number
+
+    def node_number(self, node):
+        """Returns the interned number of `node`'s name, adding it if new."""
+        return self._intern(self._node_names, self._node_index, node.name)
+
+    def append(
+        self,
+        event_type,
+        timestamp,
+        source=-1,
+        destination=-1,
+        status=0,
+        latency=NAN,
+        sim_time=NAN,
+        path=None,
+        reason=None,
+    ):
+        """Stores one event, overwriting the oldest if the store is full.
+
+        Args:
+            event_type (str): The event type, e.g. "MESSAGE_ROUTE".
+            timestamp (float): The wall-clock time in seconds since the epoch.
+            source (int, optional): The interned number of the source node
+                (see `node_number`), or -1.
+            destination (int, optional): The interned number of the
+                destination or subject node, or -1.
+            status (int, optional): 1 for success or online, 0 otherwise.
+            latency (float, optional): The latency in milliseconds, or NaN.
+            sim_time (float, optional): The simulated time, or NaN.
+            path (tuple, optional): Interned node numbers along the path.
+            reason (str, optional): Why a message was lost.
+
+        Returns:
+            int: The sequence number of the event.
+        """
+        seq = self._next
+        slot = seq % self.capacity
+        self._times[slot] = timestamp
+        self._kinds[slot] = self._intern(
+            self._kind_names, self._kind_index, event_type
+        )
+        self._sources[slot] = source
+        self._destinations[slot] = destination
+        self._statuses[slot] = status
+        self._latencies[slot] = latency
+        self._sim_times[slot] = sim_time
+        self._reasons[slot] = (
+            -1
+            if reason is None
+            else self._intern(self._reason_names, self._reason_index, reason)
+        )
+        self._paths[slot] = path
+        self._next = seq + 1
+        if self._next - self._first > self.capacity:
+            self._first = self._next - self.capacity
+        if self.max_age is not None:
+            self._expire(timestamp)
+        return seq
+
+    def _expire(self, now):
+        """Drops events that have outlived `max_age`, oldest first."""
+        cutoff = now - self.max_age
+        times, capacity = self._times, self.capacity
+        while self._first < self._next and times[self._first % capacity] < cutoff:
+            self._paths[self._first % capacity] = None
+            self._first += 1
+
+    def clear(self):
+        """Discards every event; sequence numbers keep increasing."""
+        self._first = self._next
+        self._paths = [None] * self.capacity
+
+    def record(self, seq):
+        """Returns the raw fields of the event with sequence number `seq`.
+
+        Returns:
+            EventRecord: The event with its interned names resolved, or None
+                         if `seq` is not retained.
+        """
+        if not self._first <= seq < self._next:
+            return None
+        slot = seq % self.capacity
+        names = self._node_names
+        source, dest = self._sources[slot], self._destinations[slot]
+        path, reason = self._paths[slot], self._reasons[slot]
+        return EventRecord(
+            self._times[slot],
+            self._kind_names[self._kinds[slot]],
+            names[source] if source >= 0 else None,
+            names[dest] if dest >= 0 else None,
+            self._statuses[slot],
+            self._latencies[slot],
+            self._sim_times[slot],
+            tuple(names[n] for n in path) if path else None,
+            self._reason_names[reason] if reason >= 0 else None,
+        )
+
+    def get(self, seq):
+        """Renders the event with sequence number `seq` as a dictionary.
+
+        Returns:
+            dict: The log entry, or None if `seq` is not retained.
+        """
+        record = self.record(seq)
+        if record is None:
+            return None
+        second = int(record.timestamp)
+        if second != self._rendered_second:
+            self._rendered_stamp = format_timestamp(second)
+            self._rendered_second = second
+        return render(record, self._rendered_stamp)
+
+    def _retained(self):
+        if self.max_age is not None:
+            self._expire(time.time())
+        return self._first, self._next
+
+    def recent(self, limit=10, event_type=None):
+        """Returns the newest events, newest first.
+
+        Args:
+            limit (int, optional): The maximum number of events. Defaults to 10.
+            event_type (str, optional): Only return events of this type.
+
+        Returns:
+            list: Rendered log entries, each with its sequence number 'seq'.
+        """
+        first, seq = self._retained()
+        kind = self._kind_index.get(event_type) if event_type else None
+        if event_type and kind is None:
+            return []
+        entries = []
+        while seq > first and len(entries) < limit:
+            seq -= 1
+            if kind is None or self._kinds[seq % self.capacity] == kind:
+                entry = self.get(seq)
+                entry["seq"] = seq
+                entries.append(entry)
+        return entries
+
+    def after(self, seq, limit=100):
+        """Returns the events that follow sequence number `seq`, oldest first.
+
+        Args:
+            seq (int): The sequence number of the last event the caller has;
+                -1 to start from the beginning.
+            limit (int, optional): The maximum number of events. Defaults to
+                100.
+
+        Returns:
+            tuple: A list of rendered entries, each with its sequence number
+                   'seq', and the number of events after `seq` that were
+                   already discarded and can no longer be returned.
+        """
+        first, last = self._retained()
+        start = max(seq + 1, first)
+        entries = []
+        for number in range(start, min(last, start + limit)):
+            entry = self.get(number)
+            entry["seq"] = number
+            entries.append(entry)
+        return entries, start - (seq + 1)
+
+    def entries(self, start=None, end=None, event_type=None, limit=None):
+        """Returns the events logged in a wall-clock time range, oldest first.
+
+        The range is located by binary search over the timestamp column,
+        which is in append order.
+
+        Args:
+            start (float, optional): Only events at or after this time, in
+                seconds since the epoch.
+            end (float, optional): Only events before this time.
+            event_type (str, optional): Only return events of this type.
+            limit (int, optional): The maximum number of events.
+
+        Returns:
+            list: Rendered log entries.
+        """
+        first, last = self._retained()
+        view = _TimeColumn(self, first, last)
+        low = 0 if start is None else bisect.bisect_left(view, start)
+        high = len(view) if end is None else bisect.bisect_left(view, end)
+        kind = self._kind_index.get(event_type) if event_type else None
+        if event_type and kind is None:
+            return []
+        entries = []
+        for seq in range(first + low, first + high):
+            if limit is not None and len(entries) >= limit:
+                break
+            if kind is None or self._kinds[seq % self.capacity] == kind:
+                entries.append(self.get(seq))
+        return entries
+
+    def memory_bytes(self):
+        """Returns the approximate size of the fixed columns in bytes."""
+        columns = (
+            self._times,
+            self._kinds,
+            self._sources,
+            self._destinations,
+            self._statuses,
+            self._latencies,
+            self._sim_times,
+            self._reasons,
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+
+class _TimeColumn:
+    """A read-only sequence over the retained timestamps, for `bisect`."""
+
+    __slots__ = ("_times", "_first", "_length", "_capacity")
+
+    def __init__(self, store, first, last):
+        self._times = store._times
+        self._first = first
+        self._length = last - first
+        self._capacity = store.capacity
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        return self._times[(self._first + i) % self._capacity]
@@ -0,0 +1,224 @@
+# backend/aegis_simulator/fork.py
+
+from .graph import INF, CompactGraph
+from .view import _private
+
+
+class NetworkFork:
+    """A what-if copy of a Network that keeps its changes to itself.
+
+    A fork starts from an immutable NetworkView of the network (see
+    `Network.fork`) and records status and latency changes in two small
+    dictionaries instead of copying the topology, so thousands of forks
+    cost little more than the changes they hold. Queries patch the changes
+    into private copies of the status bitmap and, if any latency changed,
+    the latencies, and share everything else with the view. Changes made to
+    the network after the fork was taken are not seen by the fork.
+
+    Attributes:
+        base (NetworkView): The network's topology when the fork was taken.
+    """
+
+    __slots__ = ("base", "_names", "_statuses", "_latencies")
+
+    def __init__(self, base, names, statuses=None, latencies=None):
+        """Initializes a fork of `base` with no changes of its own.
+
+        Args:
+            base (NetworkView): The topology to fork.
+            names (dict): The network's node name to Node mapping.
+            statuses (dict, optional): Status changes to start from, by index.
+            latencies (dict, optional): Latency changes to start from, keyed
+                by sorted index pairs.
+        """
+        self.base = base
+        self._names = names
+        self._statuses = dict(statuses or {})
+        self._latencies = dict(latencies or {})
+
+    def fork(self):
+        """Returns a fork of this fork, starting with the same changes."""
+        return NetworkFork(self.base, self._names, self._statuses, self._latencies)
+
+    def get_node(self, node_id):
+        """Returns the Node with `node_id` if it was in the network when forked."""
+        index = self.base.graph.index.get(node_id)
+        return None if index is None else self.base.graph.nodes[index]
+
+    def get_node_by_name(self, name):
+        """Returns the Node called `name` if it was in the network when forked."""
+        node = self._names.get(name)
+        return node if node is not None and node.id in self.base.graph.index else None
+
+    def is_active(self, node_id):
+        """Returns the node's status in this fork, or None if it is unknown."""
+        index = self.base.graph.index.get(node_id)
+        if index is None:
+            return None
+        return self._statuses.get(index, bool(self.base.graph.active[index]))
+
+    def set_status(self, node_id, is_active):
+        """Takes a node offline or brings it online in this fork only.
+
+        Args:
+            node_id (str): The ID of the node.
+            is_active (bool): Its new status.
+
+        Returns:
+            bool: True if the node is part of the fork, False otherwise.
+        """
+        index = self.base.graph.index.get(node_id)
+        if index is None:
+            return False
+        if bool(self.base.graph.active[index]) == is_active:
+            self._statuses.pop(index, None)
+        else:
+            self._statuses[index] = is_active
+        return True
+
+    def take_offline(self, node_id):
+        """Takes a node offline in this fork; see `set_status`."""
+        return self.set_status(node_id, False)
+
+    def bring_online(self, node_id):
+        """Brings a node online in this fork; see `set_status`."""
+        return self.set_status(node_id, True)
+
+    def set_link_latency(self, node1_name, node2_name, new_latency):
+        """Changes the latency of the link between two nodes in this fork only.
+
+        Args:
+            node1_name (str): The name of the first node.
+            node2_name (str): The name of the second node.
+            new_latency (int): The new latency for the link.
+
+        Returns:
+            bool: True if the nodes are directly linked, False otherwise.
+        """
+        node1 = self.get_node_by_name(node1_name)
+        node2 = self.get_node_by_name(node2_name)
+        if not node1 or not node2:
+            return False
+        graph = self.base.graph
+        i, j = sorted((graph.index[node1.id], graph.index[node2.id]))
+        if graph._edge_position(i, j) < 0:
+            return False
+        self._latencies[(i, j)] = new_latency
+        return True
+
+    def changes(self):
+        """Summarizes how this fork differs from the network it was taken from.
+
+        Returns:
+            dict: 'offline' and 'online' lists of node names, and a
+                  'latencies' list of {'from', 'to', 'latency'} objects.
+        """
+        nodes = self.base.graph.nodes
+        return {
+            "offline": [nodes[i].name for i, up in self._statuses.items() if not up],
+            "online": [nodes[i].name for i, up in self._statuses.items() if up],
+            "latencies": [
+                {"from": nodes[i].name, "to": nodes[j].name, "latency": latency}
+                for (i, j), latency in self._latencies.items()
+            ],
+        }
+
+    def compact_graph(self):
+        """Builds the fork's graph: the base view with this fork's changes.
+
+        Nothing is cached, so callers making many queries should build the
+        graph once and query it directly.
+
+        Returns:
+            CompactGraph: A private graph sharing the view's adjacency.
+        """
+        base = self.base.graph
+        active, latencies = base.active, base.latencies
+        if self._statuses:
+            active = bytearray(active)
+            for i, is_active in self._statuses.items():
+                active[i] = 1 if is_active else 0
+        if self._latencies:
+            latencies = _private(latencies)
+        graph = CompactGraph.from_arrays(
+            base.nodes, base.offsets, base.targets, latencies, active, base.index
+        )
+        for (i, j), latency in self._latencies.items():
+            graph.set_latency(i, j, latency)
+        return graph
+
+    def find_shortest_path(self, start_node_id, end_node_id, strategy="dijkstra"):
+        """Finds the fastest path between two nodes in this fork.
+
+        Args:
+            start_node_id (str): The ID of the starting node.
+            end_node_id (str): The ID of the destination node.
+            strategy (str, optional): "dijkstra" or "bidirectional"; the
+                precomputed strategies of the Network are not available on
+                forks. Defaults to "dijkstra".
+
+        Returns:
+            tuple: A list of Node objects representing the path and the total
+                   latency, or (None, float('inf')) if no path exists.
+
+        Raises:
+            ValueError: If `strategy` is not supported on forks.
+        """
+        if strategy not in ("dijkstra", "bidirectional"):
+            raise ValueError(f"Unknown path strategy for a fork: {strategy!r}")
+        graph = self.compact_graph()
+        source = graph.index.get(start_node_id)
+        target = graph.index.get(end_node_id)
+        if source is None or target is None:
+            return None, INF
+        if strategy == "bidirectional":
+            path, latency = graph.bidirectional_path(source, target)
+        else:
+            path, latency = graph.shortest_path(source, target)
+        if path is None:
+            return None, INF
+        return [graph.nodes[i] for i in path], latency
+
+    def route_message(self, message):
+        """Checks whether a message would be delivered in this fork.
+
+        Nothing is logged to the network's reporter.
+
+        Args:
+            message (Message): The message object to route.
+
+        Returns:
+            bool: True if a path to the destination exists, False otherwise.
+        """
+        path, _ = self.find_shortest_path(message.source_id, message.destination_id)
+        return bool(path) and path[-1].id == message.destination_id
+
+    def route_messages(self, messages):
+        """Routes a batch of messages in this fork, one tree per source.
+
+        Args:
+            messages (iterable): The Message objects to route.
+
+        Returns:
+            list: One (success, path, total_latency) tuple per message, in the
+                  input order, as returned by `Network.route_messages`.
+        """
+        graph = self.compact_graph()
+        index = graph.index
+        trees = {}
+        results = []
+        for message in messages:
+            source = index.get(message.source_id)
+            target = index.get(message.destination_id)
+            if source is None or target is None:
+                results.append((False, None, INF))
+                continue
+            tree = trees.get(source)
+            if tree is None:
+                tree = trees[source] = graph.shortest_path_tree(source)
+            path, latency = tree.path_to(target)
+            if path is None or not graph.active[target]:
+                results.append((False, None, INF))
+            else:
+                results.append((True, [graph.nodes[i] for i in path], latency))
+        return results
@@ -0,0 +1,429 @@
+# backend/aegis_simulator/graph.py
+
+import heapq
+import threading
+from array import array
+
+INF = float("inf")
+
+
+class CompactGraph:
+    """An array-backed, index-addressed view of a network's topology.
+
+    Nodes are numbered 0..n-1 and adjacency is stored in compressed sparse
+    row (CSR) form: the neighbors of node `i` are
+    `targets[offsets[i]:offsets[i + 1]]`, with the matching link latencies
+    at the same positions in `latencies`. Node status lives in a one-byte
+    per node bitmap so that taking a node offline is a single store.
+
+    Attributes:
+        nodes (list): The Node objects, ordered by their integer index.
+        index (dict): A dictionary mapping node IDs to integer indices.
+        offsets (array): CSR row offsets, of length n + 1.
+        targets (array): Neighbor indices for every directed half-link.
+        latencies (array): Link latencies, parallel to `targets`.
+        active (bytearray): 1 for each online node, 0 for each offline node.
+        latency_decreases (int): A counter bumped whenever a link latency is
+                                 lowered, the only change that can invalidate
+                                 precomputed distance lower bounds.
+        metric_version (int): A counter bumped on every status or latency
+                              patch.
+    """
+
+    def __init__(self, nodes):
+        """Builds the compact graph from an iterable of Node objects.
+
+        Links to nodes that are not part of `nodes` are ignored.
+
+        Args:
+            nodes (iterable): The Node objects making up the network.
+        """
+        self.nodes = list(nodes)
+        self.index = {node.id: i for i, node in enumerate(self.nodes)}
+
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = []
+        for node in self.nodes:
+            for neighbor, latency in node.neighbors.items():
+                j = self.index.get(neighbor.id)
+                if j is None:
+                    continue
+                targets.append(j)
+                weights.append(latency)
+            offsets.append(len(targets))
+
+        self.offsets = offsets
+        self.targets = targets
+        self.latencies = array(self._typecode_for(weights), weights)
+        self.active = bytearray(1 if node.is_active else 0 for node in self.nodes)
+        self.latency_decreases = 0
+        self.metric_version = 0
+        self._scratch = threading.local()
+
+    @classmethod
+    def from_arrays(cls, nodes, offsets, targets, latencies, active, index=None):
+        """Wraps existing CSR arrays, e.g. ones read from a snapshot, as a graph.
+
+        The arrays are used as they are, not copied, and must describe the
+        links of `nodes` in the layout documented on the class.
+
+        Args:
+            nodes (list): The Node objects, ordered by their integer index.
+            offsets (array): CSR row offsets, of length n + 1.
+            targets (array): Neighbor indices for every directed half-link.
+            latencies (array): Link latencies, parallel to `targets`.
+            active (bytearray): The status bitmap.
+            index (dict, optional): The node ID to index mapping of `nodes`,
+                if already built, e.g. by another graph over the same nodes.
+
+        Returns:
+            CompactGraph: The graph over the given arrays.
+        """
+        graph = cls.__new__(cls)
+        graph.nodes = nodes
+        if index is None:
+            index = {node.id: i for i, node in enumerate(nodes)}
+        graph.index = index
+        graph.offsets = offsets
+        graph.targets = targets
+        graph.latencies = latencies
+        graph.active = active
+        graph.latency_decreases = 0
+        graph.metric_version = 0
+        graph._scratch = threading.local()
+        return graph
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getstate__(self):
+        """Pickles the arrays only, so a graph can be shipped to a worker process.
+
+        A graph restored from a pickle is detached from the Network: its
+        `nodes` list holds node IDs instead of Node objects, and its arrays
+        are private copies even if the original's were shared.
+        """
+        state = dict(self.__dict__)
+        state["nodes"] = [getattr(node, "id", node) for node in self.nodes]
+        # Arrays memory-mapped from a shared topology are copied out.
+        for name in ("offsets", "targets", "latencies"):
+            if isinstance(state[name], memoryview):
+                state[name] = array(state[name].format, state[name])
+        if isinstance(state["active"], memoryview):
+            state["active"] = bytearray(state["active"])
+        del state["_scratch"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._scratch = threading.local()
+
+    @staticmethod
+    def _typecode_for(values):
+        """Keeps integer latencies as integers so results match the dict model."""
+        return "q" if all(isinstance(v, int) for v in values) else "d"
+
+    def _edge_position(self, i, j):
+        """Returns the position of the half-link i -> j in `targets`, or -1."""
+        targets = self.targets
+        for k in range(self.offsets[i], self.offsets[i + 1]):
+            if targets[k] == j:
+                return k
+        return -1
+
+    def set_active(self, i, is_active):
+        """Patches the status bitmap for the node at index `i`."""
+        self.active[i] = 1 if is_active else 0
+        self.status_patched()
+
+    def status_patched(self):
+        """Notes a status change already written into `active`.
+
+        `set_active` calls this itself; call it directly for changes that
+        another process wrote into a shared bitmap.
+        """
+        self.metric_version += 1
+
+    def set_latency(self, i, j, latency):
+        """Patches the latency of the link between nodes `i` and `j`.
+
+        Args:
+            i (int): The index of the first node.
+            j (int): The index of the second node.
+            latency (int): The new latency of the link.
+
+        Returns:
+            bool: True if the link exists and was updated, False otherwise.
+        """
+        forward, backward = self._edge_position(i, j), self._edge_position(j, i)
+        if forward < 0 or backward < 0:
+            return False
+        if self.latencies.typecode == "q" and not isinstance(latency, int):
+            self.latencies = array("d", self.latencies)
+        old_latency = self.latencies[forward]
+        self.latencies[forward] = latency
+        self.latencies[backward] = latency
+        self.latency_patched(old_latency, latency)
+        return True
+
+    def latency_patched(self, old_latency, new_latency):
+        """Notes a latency change already written into `latencies`.
+
+        `set_latency` calls this itself; call it directly for changes that
+        another process wrote into shared arrays.
+
+        Args:
+            old_latency (int): The latency before the change.
+            new_latency (int): The latency after the change.
+        """
+        if new_latency < old_latency:
+            self.latency_decreases += 1
+        self.metric_version += 1
+
+    def _buffers(self, slot=0):
+        """Returns this thread's reusable distance and predecessor buffers.
+
+        Args:
+            slot (int): 0 for the forward search, 1 for the backward search of
+                        a bidirectional query.
+        """
+        scratch = self._scratch
+        buffers = getattr(scratch, "buffers", None)
+        if buffers is None or len(buffers[0][0]) != len(self):
+            n = len(self)
+            buffers = scratch.buffers = [
+                ([INF] * n, array("q", [-1]) * n) for _ in range(2)
+            ]
+        return buffers[slot]
+
+    def last_settled(self):
+        """Returns how many nodes the calling thread's last query settled."""
+        return getattr(self._scratch, "settled", 0)
+
+    def shortest_path(self, source, target):
+        """Runs Dijkstra's algorithm from `source`, stopping at `target`.
+
+        Inactive nodes are never entered. The distance and predecessor
+        buffers are allocated once per thread and only the entries touched
+        by a query are reset afterwards, so a query costs time proportional
+        to the part of the graph it settles rather than to the whole graph.
+        The search loop itself is interpreted Python, like the Node-based
+        search, so it runs only about 1.5 to 2 times faster than that one;
+        the other strategies gain more by settling fewer nodes.
+
+        Args:
+            source (int): The index of the starting node.
+            target (int): The index of the destination node.
+
+        Returns:
+            tuple: A list of node indices from source to target and the total
+                   latency, or (None, float('inf')) if no path exists.
+        """
+        active = self.active
+        if not (active[source] and active[target]):
+            return None, INF
+
+        offsets, targets, latencies = self.offsets, self.targets, self.latencies
+        dist, prev = self._buffers()
+        touched = [source]
+        dist[source] = 0
+        heap = [(0, source)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        settled = 0
+
+        try:
+            while heap:
+                d, u = heappop(heap)
+                if d > dist[u]:
+                    continue
+                settled += 1
+                if u == target:
+                    break
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if not active[v]:
+                        continue
+                    nd = d + latencies[k]
+                    if nd < dist[v]:
+                        if dist[v] == INF:
+                            touched.append(v)
+                        dist[v] = nd
+                        prev[v] = u
+                        heappush(heap, (nd, v))
+
+            self._scratch.settled = settled
+            if dist[target] == INF:
+                return None, INF
+            return self._walk_back(prev, source, target), dist[target]
+        finally:
+            for v in touched:
+                dist[v] = INF
+                prev[v] = -1
+
+    @staticmethod
+    def _walk_back(prev, source, node):
+        """Follows predecessor links from `node` back to `source`.
+
+        Returns:
+            list: The node indices from `source` to `node`.
+        """
+        path = [node]
+        while path[-1] != source:
+            path.append(prev[path[-1]])
+        path.reverse()
+        return path
+
+    def bidirectional_path(self, source, target):
+        """Runs Dijkstra's algorithm from both ends until the searches meet.
+
+        Each step advances whichever frontier is smaller. The search stops
+        once the two frontier minimums add up to at least the best meeting
+        latency found so far, which on long-diameter topologies settles
+        roughly two balls of half the radius instead of one full ball.
+
+        Args:
+            source (int): The index of the starting node.
+            target (int): The index of the destination node.
+
+        Returns:
+            tuple: A list of node indices from source to target and the total
+                   latency, or (None, float('inf')) if no path exists.
+        """
+        active = self.active
+        if not (active[source] and active[target]):
+            return None, INF
+        if source == target:
+            self._scratch.settled = 1
+            return [source], 0
+
+        offsets, targets, latencies = self.offsets, self.targets, self.latencies
+        dists, prevs = zip(self._buffers(0), self._buffers(1))
+        touched = ([source], [target])
+        dists[0][source] = 0
+        dists[1][target] = 0
+        heaps = ([(0, source)], [(0, target)])
+        heappop, heappush = heapq.heappop, heapq.heappush
+        best, meeting, settled = INF, -1, 0
+
+        try:
+            while heaps[0] and heaps[1]:
+                if heaps[0][0][0] + heaps[1][0][0] >= best:
+                    break
+                side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+                dist, other, prev = dists[side], dists[1 - side], prevs[side]
+                heap, seen = heaps[side], touched[side]
+                d, u = heappop(heap)
+                if d > dist[u]:
+                    continue
+                settled += 1
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if not active[v]:
+                        continue
+                    nd = d + latencies[k]
+                    if nd < dist[v]:
+                        if dist[v] == INF:
+                            seen.append(v)
+                        dist[v] = nd
+                        prev[v] = u
+                        heappush(heap, (nd, v))
+                    if nd + other[v] < best:
+                        best, meeting = nd + other[v], v
+
+            self._scratch.settled = settled
+            if meeting < 0:
+                return None, INF
+            path = self._walk_back(prevs[0], source, meeting)
+            path.extend(reversed(self._walk_back(prevs[1], target, meeting)[:-1]))
+            return path, best
+        finally:
+            for side in (0, 1):
+                dist, prev = dists[side], prevs[side]
+                for v in touched[side]:
+                    dist[v] = INF
+                    prev[v] = -1
+
+    def shortest_path_tree(self, source, respect_status=True, active=None):
+        """Runs Dijkstra's algorithm from `source` over the whole graph.
+
+        Args:
+            source (int): The index of the root node.
+            respect_status (bool, optional): Skip offline nodes. Pass False to
+                measure the topology as if every node were online. Defaults
+                to True.
+            active (bytearray, optional): A status bitmap to use instead of
+                the graph's own, e.g. one a simulation is evolving privately.
+
+        Returns:
+            ShortestPathTree: Distances and predecessors for every node.
+        """
+        n = len(self)
+        offsets, targets, latencies = self.offsets, self.targets, self.latencies
+        if active is None:
+            active = self.active if respect_status else bytearray(b"\x01") * n
+        dist = [INF] * n
+        prev = array("q", [-1]) * n
+        settled = 0
+        if active[source]:
+            dist[source] = 0
+            heap = [(0, source)]
+            heappop, heappush = heapq.heappop, heapq.heappush
+            while heap:
+                d, u = heappop(heap)
+                if d > dist[u]:
+                    continue
+                settled += 1
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if not active[v]:
+                        continue
+                    nd = d + latencies[k]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        prev[v] = u
+                        heappush(heap, (nd, v))
+        self._scratch.settled = settled
+        return ShortestPathTree(source, dist, prev)
+
+
+class ShortestPathTree:
+    """The shortest paths from one source node to every other node.
+
+    Attributes:
+        source (int): The index of the root node.
+        dist (list): The latency from the source to each node, or
+                     float('inf') for unreachable nodes.
+        prev (array): The predecessor of each node on its shortest path, or
+                      -1 for the source and for unreachable nodes.
+    """
+
+    __slots__ = ("source", "dist", "prev")
+
+    def __init__(self, source, dist, prev):
+        """Initializes a new ShortestPathTree instance."""
+        self.source = source
+        self.dist = dist
+        self.prev = prev
+
+    def path_to(self, target):
+        """Walks the predecessor links back from `target` to the source.
+
+        Args:
+            target (int): The index of the destination node.
+
+        Returns:
+            tuple: A list of node indices from source to target and the total
+                   latency, or (None, float('inf')) if `target` is unreachable.
+        """
+        if self.dist[target] == INF:
+            return None, INF
+        prev = self.prev
+        path = [target]
+        while path[-1] != self.source:
+            parent = prev[path[-1]]
+            if parent < 0:
+                return None, INF
+            path.append(parent)
+        path.reverse()
+        return path, self.dist[target]
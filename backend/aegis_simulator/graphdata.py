@@ -0,0 +1,86 @@
+# backend/aegis_simulator/graphdata.py
+
+ONLINE_COLOR = "#4ade80"
+OFFLINE_COLOR = "#f87171"
+
+
+def node_view(node):
+    """Formats a node for the dashboard's Vis.js dataset."""
+    return {
+        "id": node.id,
+        "label": node.name,
+        "color": ONLINE_COLOR if node.is_active else OFFLINE_COLOR,
+    }
+
+
+def edge_view(node, neighbor, latency):
+    """Formats a link for the Vis.js dataset, keyed by its sorted node IDs."""
+    return {
+        "id": ":".join(sorted((node.id, neighbor.id))),
+        "from": node.id,
+        "to": neighbor.id,
+        "label": f"{latency}ms",
+    }
+
+
+def graph_snapshot(network):
+    """Builds the full dashboard view of a network.
+
+    Args:
+        network (Network): The network to describe.
+
+    Returns:
+        dict: The current 'version', 'full' set to True, and 'nodes' and
+              'edges' lists with one entry per node and per link.
+    """
+    version = network.topology_version
+    nodes, edges = [], []
+    members = network.nodes
+    for node in members.values():
+        nodes.append(node_view(node))
+        for neighbor, latency in node.neighbors.items():
+            if node.id < neighbor.id or neighbor.id not in members:
+                edges.append(edge_view(node, neighbor, latency))
+    return {"version": version, "full": True, "nodes": nodes, "edges": edges}
+
+
+def graph_delta(network, since):
+    """Builds the dashboard view of what changed after topology version `since`.
+
+    Args:
+        network (Network): The network to describe.
+        since (int): A topology version the caller has already seen.
+
+    Returns:
+        dict: The current 'version', 'full' set to False, the changed
+              'nodes' and 'edges', and the IDs of any that were removed in
+              'removed_nodes' and 'removed_edges'; or a full snapshot (see
+              `graph_snapshot`) if `Network.changes_since` cannot answer
+              for `since`.
+    """
+    version = network.topology_version
+    changes = network.changes_since(since)
+    if changes is None:
+        return graph_snapshot(network)
+    node_ids, link_keys = changes
+    nodes, edges, removed_nodes, removed_edges = [], [], [], []
+    for node_id in node_ids:
+        node = network.nodes.get(node_id)
+        if node is None:
+            removed_nodes.append(node_id)
+        else:
+            nodes.append(node_view(node))
+    for first_id, second_id in link_keys:
+        node, neighbor = network.nodes.get(first_id), network.nodes.get(second_id)
+        if node is None or neighbor is None or neighbor not in node.neighbors:
+            removed_edges.append(f"{first_id}:{second_id}")
+        else:
+            edges.append(edge_view(node, neighbor, node.neighbors[neighbor]))
+    return {
+        "version": version,
+        "full": False,
+        "nodes": nodes,
+        "edges": edges,
+        "removed_nodes": removed_nodes,
+        "removed_edges": removed_edges,
+    }
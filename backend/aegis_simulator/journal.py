@@ -0,0 +1,90 @@
+# backend/aegis_simulator/journal.py
+
+import threading
+from collections import deque
+
+
+class ChangeJournal:
+    """A bounded log of which nodes and links changed at which version.
+
+    Each entry records the topology version a change produced and the key
+    of the element it touched: a node ID, or a sorted (node ID, node ID)
+    pair for a link. Once the journal is full the oldest entries are
+    dropped, and changes since a version older than the dropped entries can
+    no longer be answered. Entries can be recorded and read from several
+    threads at once.
+
+    Attributes:
+        maxlen (int): The number of entries kept.
+    """
+
+    NODE = "node"
+    EDGE = "edge"
+
+    def __init__(self, maxlen=4096):
+        """Initializes an empty journal.
+
+        Args:
+            maxlen (int, optional): The number of entries to keep. Must be at
+                least 1. Defaults to 4096.
+        """
+        self.maxlen = maxlen
+        self._entries = deque(maxlen=maxlen)
+        # Every change made after this version is still in the journal.
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, version, kind, key):
+        """Adds an entry, dropping the oldest one if the journal is full.
+
+        Args:
+            version (int): The topology version produced by the change.
+            kind (str): ChangeJournal.NODE or ChangeJournal.EDGE.
+            key: The node ID, or the sorted pair of node IDs of a link.
+        """
+        entries = self._entries
+        with self._lock:
+            if len(entries) == self.maxlen:
+                self._floor = entries[0][0]
+            entries.append((version, kind, key))
+
+    def reset(self, version):
+        """Forgets every entry; changes up to `version` can no longer be asked for.
+
+        Used after bulk changes too large to journal one by one, so that
+        callers that saw an earlier version fall back to a full snapshot.
+
+        Args:
+            version (int): The topology version after the bulk change.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._floor = version
+
+    def changes_since(self, version, current):
+        """Collects the keys of everything changed after `version`.
+
+        Only the entries newer than `version` are visited, so the cost is
+        proportional to the number of changes rather than to the topology.
+
+        Args:
+            version (int): The version the caller last saw.
+            current (int): The current topology version.
+
+        Returns:
+            tuple: A set of changed node IDs and a set of changed link keys,
+                   or None if `version` is older than the journal's history
+                   or newer than `current`.
+        """
+        nodes, edges = set(), set()
+        with self._lock:
+            if version < self._floor or version > current:
+                return None
+            for entry_version, kind, key in reversed(self._entries):
+                if entry_version <= version:
+                    break
+                (nodes if kind == self.NODE else edges).add(key)
+        return nodes, edges
@@ -0,0 +1,154 @@
+# backend/aegis_simulator/landmarks.py
+
+import heapq
+
+from .graph import INF
+
+
+class LandmarkTable:
+    """Precomputed landmark distances for goal-directed (ALT) A* search.
+
+    For every landmark L the table stores d(L, v) for all nodes v, measured
+    with every node online. Because links are symmetric, the triangle
+    inequality gives |d(L, t) - d(L, v)| as a lower bound on d(v, t). Taking
+    nodes offline or raising a latency can only lengthen paths, so the
+    bounds stay valid; only a latency decrease or a new link makes the
+    table stale.
+
+    Attributes:
+        graph (CompactGraph): The graph the table was computed on.
+        landmarks (list): The indices of the landmark nodes.
+        distances (list): One distance list per landmark.
+        latency_decreases (int): The graph's counter when the table was built.
+    """
+
+    def __init__(self, graph, count=8):
+        """Selects landmarks by farthest-point sampling and measures them.
+
+        Each new landmark is the node farthest from all landmarks chosen so
+        far, which spreads landmarks around the periphery of the topology
+        where they give the tightest bounds. Nodes in components no landmark
+        reaches yet count as infinitely far, so every component gets one.
+
+        Args:
+            graph (CompactGraph): The graph to compute the table on.
+            count (int, optional): The number of landmarks. Defaults to 8.
+        """
+        self.graph = graph
+        self.latency_decreases = graph.latency_decreases
+        self.landmarks = []
+        self.distances = []
+        n = len(graph)
+        if not n:
+            return
+
+        offsets = graph.offsets
+        nearest = [INF] * n
+        candidate = max(range(n), key=lambda v: offsets[v + 1] - offsets[v])
+        for _ in range(min(count, n)):
+            dist = graph.shortest_path_tree(candidate, respect_status=False).dist
+            self.landmarks.append(candidate)
+            self.distances.append(dist)
+            for v in range(n):
+                if dist[v] < nearest[v]:
+                    nearest[v] = dist[v]
+            candidate = max(range(n), key=nearest.__getitem__)
+            if nearest[candidate] == 0:
+                break
+
+    def is_current(self, graph):
+        """Returns True if the table's bounds are still valid for `graph`."""
+        return graph is self.graph and graph.latency_decreases == self.latency_decreases
+
+    def _tables_for(self, source, target, limit):
+        """Picks the `limit` landmarks giving the best bound between the endpoints."""
+        scored = []
+        for dist in self.distances:
+            ds, dt = dist[source], dist[target]
+            if ds == INF and dt == INF:
+                continue
+            scored.append((abs(ds - dt) if INF not in (ds, dt) else INF, dist))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [dist for _, dist in scored[:limit]]
+
+    def shortest_path(self, source, target, active_limit=4):
+        """Runs A* from `source` to `target` guided by the landmark bounds.
+
+        Args:
+            source (int): The index of the starting node.
+            target (int): The index of the destination node.
+            active_limit (int, optional): How many of the landmarks to consult
+                per query; the ones bounding the endpoints best are used.
+                Defaults to 4.
+
+        Returns:
+            tuple: A list of node indices from source to target and the total
+                   latency, or (None, float('inf')) if no path exists.
+        """
+        graph = self.graph
+        active = graph.active
+        if not (active[source] and active[target]):
+            return None, INF
+
+        tables = [
+            (dist, dist[target])
+            for dist in self._tables_for(source, target, active_limit)
+        ]
+        potentials = {}
+
+        def potential(v):
+            h = potentials.get(v)
+            if h is None:
+                h = 0
+                for dist, to_target in tables:
+                    dv = dist[v]
+                    if dv == INF or to_target == INF:
+                        if dv != to_target:
+                            h = INF
+                            break
+                        continue
+                    bound = dv - to_target if dv > to_target else to_target - dv
+                    if bound > h:
+                        h = bound
+                potentials[v] = h
+            return h
+
+        offsets, targets, latencies = graph.offsets, graph.targets, graph.latencies
+        dist, prev = graph._buffers()
+        touched = [source]
+        dist[source] = 0
+        heap = [(potential(source), 0, source)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        settled = 0
+
+        try:
+            while heap:
+                _, d, u = heappop(heap)
+                if d > dist[u]:
+                    continue
+                settled += 1
+                if u == target:
+                    break
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if not active[v]:
+                        continue
+                    nd = d + latencies[k]
+                    if nd < dist[v]:
+                        h = potential(v)
+                        if h == INF:
+                            continue
+                        if dist[v] == INF:
+                            touched.append(v)
+                        dist[v] = nd
+                        prev[v] = u
+                        heappush(heap, (nd + h, nd, v))
+
+            graph._scratch.settled = settled
+            if dist[target] == INF:
+                return None, INF
+            return graph._walk_back(prev, source, target), dist[target]
+        finally:
+            for v in touched:
+                dist[v] = INF
+                prev[v] = -1
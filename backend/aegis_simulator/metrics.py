@@ -0,0 +1,387 @@
+# backend/aegis_simulator/metrics.py
+
+import bisect
+import functools
+import operator
+import threading
+import time
+
+from .ch import ContractionHierarchy
+from .graph import INF, CompactGraph
+from .landmarks import LandmarkTable
+from .models import Network
+
+# Latency buckets in seconds, from 50 microseconds to 5 seconds.
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+# Buckets for the number of nodes a search settles.
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == INF:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing count, optionally split by labels.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The description shown in the exposition.
+        label_names (tuple): The names of the labels, in order.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, help, label_names=()):
+        """Initializes a counter with no samples."""
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, labels=()):
+        """Adds `amount` to the count for the label values `labels`."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        """Returns the current count for the label values `labels`."""
+        return self._values.get(labels, 0)
+
+    def samples(self):
+        """Yields Prometheus text lines for every label combination."""
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.label_names, labels)} {value}"
+
+
+class Histogram:
+    """Counts observations in cumulative buckets, optionally split by labels.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The description shown in the exposition.
+        buckets (tuple): The upper bounds of the buckets, ascending.
+        label_names (tuple): The names of the labels, in order.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS, label_names=()):
+        """Initializes a histogram with no observations."""
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        """Records one observation for the label values `labels`."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, labels=()):
+        """Returns the number of observations for the label values `labels`."""
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def samples(self):
+        """Yields Prometheus text lines for every label combination."""
+        with self._lock:
+            series = sorted(
+                (labels, (list(counts), total, count))
+                for labels, (counts, total, count) in self._series.items()
+            )
+        names = self.label_names
+        for labels, (counts, total, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (INF,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(names, labels)} {_format_number(total)}"
+            yield f"{self.name}_count{_labels(names, labels)} {count}"
+
+
+class MetricsRegistry:
+    """Holds every metric and renders them in the Prometheus text format.
+
+    Besides counters and histograms updated as things happen, a registry
+    can hold collectors: callables run at scrape time that return current
+    values, such as cache sizes, as (name, kind, help, samples) tuples
+    where `samples` is a list of (labels dict, value) pairs.
+    """
+
+    def __init__(self):
+        """Initializes an empty registry."""
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name, help, label_names=()):
+        """Returns the counter called `name`, creating it if needed."""
+        return self._get(Counter, name, help, label_names)
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS, label_names=()):
+        """Returns the histogram called `name`, creating it if needed."""
+        return self._get(Histogram, name, help, buckets, label_names)
+
+    def add_collector(self, collector):
+        """Registers a callable whose values are read at every scrape."""
+        self._collectors.append(collector)
+
+    def clear(self):
+        """Removes every metric and collector."""
+        with self._lock:
+            self._metrics.clear()
+            self._collectors.clear()
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, ending in a newline.
+        """
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in list(self._collectors):
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_text = _labels(labels.keys(), labels.values())
+                    lines.append(f"{name}{label_text} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# (owner class, attribute name) -> the original attribute, while enabled.
+_originals = {}
+
+
+def is_enabled():
+    """Returns True if the hot paths are currently instrumented."""
+    return bool(_originals)
+
+
+def _wrap(owner, attribute, wrapper_factory):
+    original = owner.__dict__[attribute]
+    _originals[(owner, attribute)] = original
+    if isinstance(original, classmethod):
+        setattr(owner, attribute, classmethod(wrapper_factory(original.__func__)))
+    else:
+        setattr(owner, attribute, wrapper_factory(original))
+
+
+def _timed(operation, after=None):
+    """Builds a wrapper factory that times calls as `operation`."""
+    durations = registry.histogram(
+        "aegis_network_operation_seconds",
+        "Time spent in core Network operations.",
+        label_names=("operation",),
+    )
+    errors = registry.counter(
+        "aegis_network_operation_errors_total",
+        "Core Network operations that raised an exception.",
+        label_names=("operation",),
+    )
+    labels = (operation,)
+    perf_counter = time.perf_counter
+
+    def factory(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except Exception:
+                errors.inc(labels=labels)
+                raise
+            durations.observe(perf_counter() - start, labels)
+            if after is not None:
+                after(args, result)
+            return result
+
+        return wrapper
+
+    return factory
+
+
+def _counted_search(search, graph_of=None):
+    """Builds a wrapper factory that records how many nodes a search settled.
+
+    The count is read from the searched graph's `last_settled`, which every
+    search sets as it finishes. `graph_of` maps the wrapped method's `self`
+    to that graph, for searches that live on an index over a CompactGraph.
+    """
+    settled = registry.histogram(
+        "aegis_search_settled_nodes",
+        "Nodes settled per shortest-path search.",
+        buckets=SIZE_BUCKETS,
+        label_names=("search",),
+    )
+    labels = (search,)
+
+    def factory(function):
+        @functools.wraps(function)
+        def wrapper(self, *args, **kwargs):
+            result = function(self, *args, **kwargs)
+            graph = self if graph_of is None else graph_of(self)
+            settled.observe(graph.last_settled(), labels)
+            return result
+
+        return wrapper
+
+    return factory
+
+
+def enable():
+    """Instruments the Network and CompactGraph hot paths.
+
+    The instrumented methods are replaced by timing wrappers on their
+    classes, so `disable` can put the originals back and leave no overhead
+    at all behind.
+    """
+    if is_enabled():
+        return
+    routed = registry.counter(
+        "aegis_messages_routed_total",
+        "Messages routed through Network.route_message(s), by result.",
+        label_names=("result",),
+    )
+
+    def count_one(args, delivered):
+        routed.inc(labels=("delivered" if delivered else "failed",))
+
+    def count_batch(args, results):
+        delivered = sum(1 for success, _, _ in results if success)
+        routed.inc(delivered, ("delivered",))
+        routed.inc(len(results) - delivered, ("failed",))
+
+    _wrap(Network, "find_shortest_path", _timed("find_shortest_path"))
+    _wrap(Network, "route_message", _timed("route_message", count_one))
+    _wrap(Network, "route_messages", _timed("route_messages", count_batch))
+    _wrap(Network, "create_from_config", _timed("create_from_config"))
+    _wrap(Network, "load_snapshot", _timed("load_snapshot"))
+    _wrap(CompactGraph, "shortest_path", _counted_search("dijkstra"))
+    _wrap(CompactGraph, "bidirectional_path", _counted_search("bidirectional"))
+    _wrap(CompactGraph, "shortest_path_tree", _counted_search("tree"))
+    search_graph = operator.attrgetter("graph")
+    _wrap(LandmarkTable, "shortest_path", _counted_search("alt", search_graph))
+    _wrap(ContractionHierarchy, "shortest_path", _counted_search("ch", search_graph))
+
+
+def disable():
+    """Restores the uninstrumented methods; recorded values are kept."""
+    for (owner, attribute), original in _originals.items():
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+def network_collector(network):
+    """Returns a collector reporting `network`'s size and path cache counters.
+
+    Args:
+        network (Network): The network to report on.
+
+    Returns:
+        callable: A collector for `MetricsRegistry.add_collector`.
+    """
+
+    def collect():
+        info = network.path_cache_info()
+        lookups = info["hits"] + info["misses"]
+        return [
+            (
+                "aegis_nodes",
+                "gauge",
+                "Nodes in the network.",
+                [({}, len(network.nodes))],
+            ),
+            (
+                "aegis_topology_version",
+                "gauge",
+                "Topology changes since startup.",
+                [({}, info["topology_version"])],
+            ),
+            (
+                "aegis_path_cache_hits_total",
+                "counter",
+                "Shortest-path tree cache hits.",
+                [({}, info["hits"])],
+            ),
+            (
+                "aegis_path_cache_misses_total",
+                "counter",
+                "Shortest-path tree cache misses.",
+                [({}, info["misses"])],
+            ),
+            (
+                "aegis_path_cache_hit_ratio",
+                "gauge",
+                "Fraction of cache lookups that hit.",
+                [({}, info["hits"] / lookups if lookups else 0.0)],
+            ),
+            (
+                "aegis_path_cache_size",
+                "gauge",
+                "Trees currently cached.",
+                [({}, info["size"])],
+            ),
+        ]
+
+    return collect
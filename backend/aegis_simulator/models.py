@@ -4,9 +4,47 @@ import uuid
 import logging
 import yaml
 import heapq
+import gc
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
 
 # --- MODIFIED: Changed to a relative import ---
 from .reporter import Reporter
+from .graph import CompactGraph
+from .cache import PathTreeCache
+from .connectivity import ConnectivityIndex
+from .distances import DistanceTable, distance_matrix, distance_rows, distances_from
+from .dynamic import DynamicShortestPathTree
+from .landmarks import LandmarkTable
+from .ch import ContractionHierarchy
+from .journal import ChangeJournal
+from .paths import StandbyPaths, disjoint_path, k_shortest_paths
+from .snapshot import read_snapshot, write_snapshot
+from .shared import SharedTopology
+from .fork import NetworkFork
+from .view import NetworkView
+
+# The C (libyaml) loader is many times faster than the pure-Python one.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@contextmanager
+def _gc_paused():
+    """Suspends the cyclic garbage collector during a bulk load.
+
+    Loading allocates millions of containers and none of them is garbage,
+    yet each allocation burst triggers a collection that walks them all.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
 
 
 class Message:
@@ -46,17 +84,53 @@ class Node:
         self.name = name
         self.neighbors = {}
         self.is_active = True
+        self._observers = []
         logging.info(f"Node '{self.name}' created with ID {self.id}")
 
+    @classmethod
+    def _restore(cls, node_id, name, is_active=True):
+        """Creates a node with a known ID and no links, without logging it.
+
+        Used by the bulk loaders, where a log line per node would dominate
+        the loading time.
+
+        Args:
+            node_id (str): The ID to give the node.
+            name (str): The human-readable name of the node.
+            is_active (bool, optional): The node's status. Defaults to True.
+
+        Returns:
+            Node: The new node.
+        """
+        node = cls.__new__(cls)
+        node.id = node_id
+        node.name = name
+        node.neighbors = {}
+        node.is_active = is_active
+        node._observers = []
+        return node
+
+    def _notify(self, change, other=None):
+        """Tells every observing Network that this node has changed.
+
+        Args:
+            change (str): Either "status" or "link".
+            other (Node, optional): The other end of a new link.
+        """
+        for observer in self._observers:
+            observer(self, change, other)
+
     def take_offline(self):
         """Sets the node's status to inactive (offline)."""
         self.is_active = False
         logging.warning(f"Node '{self.name}' has been taken OFFLINE.")
+        self._notify("status")
 
     def bring_online(self):
         """Sets the node's status to active (online)."""
         self.is_active = True
         logging.info(f"Node '{self.name}' has been brought ONLINE.")
+        self._notify("status")
 
     def add_neighbor(self, neighbor_node, latency):
         """Establishes a bilateral connection to another node.
@@ -71,6 +145,8 @@ class Node:
             logging.info(
                 f"Node '{self.name}' connected to '{neighbor_node.name}' with latency {latency}ms"
             )
+            self._notify("link", neighbor_node)
+            neighbor_node._notify("link", self)
 
     def receive_message(self, message):
         """Processes a message that has arrived at this node.
@@ -91,6 +167,54 @@ class Node:
         return False
 
 
+class SharedNeighbors(Mapping):
+    """The neighbor map of a node in a shared topology.
+
+    Behaves like the `neighbors` dictionary of an ordinary Node, but reads
+    the links and latencies from the compact graph's memory-mapped arrays
+    instead of holding its own copy. It is read-only: links cannot be added
+    to a shared topology, and latencies change through
+    `Network.set_link_latency`.
+    """
+
+    __slots__ = ("_graph", "_row")
+
+    def __init__(self, graph, row):
+        """Initializes the view of row `row` of `graph`'s adjacency."""
+        self._graph = graph
+        self._row = row
+
+    def _bounds(self):
+        offsets = self._graph.offsets
+        return offsets[self._row], offsets[self._row + 1]
+
+    def __getitem__(self, node):
+        graph = self._graph
+        j = graph.index.get(getattr(node, "id", None))
+        position = -1 if j is None else graph._edge_position(self._row, j)
+        if position < 0:
+            raise KeyError(node)
+        return graph.latencies[position]
+
+    def __iter__(self):
+        start, end = self._bounds()
+        return map(self._graph.nodes.__getitem__, self._graph.targets[start:end])
+
+    def __len__(self):
+        start, end = self._bounds()
+        return end - start
+
+    def items(self):
+        """Returns (neighbor Node, latency) pairs without a lookup per pair."""
+        start, end = self._bounds()
+        return zip(iter(self), self._graph.latencies[start:end])
+
+
+def _link_key(node1, node2):
+    """Returns the sorted pair of node IDs identifying the link between them."""
+    return (node1.id, node2.id) if node1.id < node2.id else (node2.id, node1.id)
+
+
 class Network:
     """Manages the entire collection of nodes and their interactions.
 
@@ -98,14 +222,76 @@ class Network:
     and routing messages.
 
     Attributes:
+        PATH_STRATEGIES (tuple): The accepted `strategy` values for
+                                 `find_shortest_path`.
         nodes (dict): A dictionary mapping node IDs to their Node objects.
         reporter (Reporter): An instance of the Reporter class for logging events.
+        use_compact_graph (bool): Whether pathfinding runs on the array-backed
+                                  CompactGraph instead of the Node objects.
+        topology_version (int): A counter bumped on every status, latency or
+                                link change; cached paths are only reused
+                                while it is unchanged.
+        watched_sources (set): IDs of the nodes whose shortest-path trees are
+                               kept up to date incrementally.
+        journal (ChangeJournal): Which nodes and links changed at each
+                                 topology version; see `changes_since`.
+
+    Changes (status, latency, links, nodes) are serialized by a lock, and
+    after each one the network publishes an immutable NetworkView of the
+    new topology; see `view`. Path queries with the "dijkstra" and
+    "bidirectional" strategies run on the current view without taking the
+    lock, so they scale across threads while changes are being made.
     """
 
-    def __init__(self, reporter=None):
-        """Initializes a new Network instance."""
+    PATH_STRATEGIES = ("dijkstra", "bidirectional", "alt", "ch")
+    # The most routes protected at once; see `protect_route`.
+    MAX_PROTECTED_ROUTES = 1024
+
+    def __init__(
+        self,
+        reporter=None,
+        use_compact_graph=True,
+        path_cache_size=128,
+        watched_sources=(),
+        journal_size=4096,
+    ):
+        """Initializes a new Network instance.
+
+        Args:
+            reporter (Reporter, optional): An instance of the reporter.
+            use_compact_graph (bool, optional): Run pathfinding on the
+                array-backed graph. Defaults to True. Its Dijkstra search is
+                still pure Python, so it only avoids the per-node dictionary
+                lookups: on 50,000 node benchmark topologies it is about 1.5
+                to 2 times faster than the Node-based search, and at 10,000
+                nodes only 1.1 to 1.4 times. The goal-directed strategies,
+                which explore less of the graph, save far more.
+            path_cache_size (int, optional): The number of shortest-path trees
+                to keep in the LRU cache; 0 disables caching. Only used with
+                the compact graph. Defaults to 128.
+            watched_sources (iterable, optional): IDs of nodes to watch; see
+                `watch_source`.
+            journal_size (int, optional): The number of changes remembered
+                for `changes_since`. Defaults to 4096.
+        """
         self.nodes = {}
+        self._names = {}
         self.reporter = reporter if reporter else self._create_dummy_reporter()
+        self.use_compact_graph = use_compact_graph
+        self.topology_version = 0
+        self._graph = None
+        self._path_cache = PathTreeCache(path_cache_size) if path_cache_size else None
+        self._watched = {node_id: None for node_id in watched_sources}
+        self._landmarks = None
+        self._hierarchy = None
+        self._listeners = []
+        self.journal = ChangeJournal(journal_size)
+        self._shared = None
+        self._shared_version = 0
+        self._lock = threading.RLock()
+        self._view = None
+        self._standby = OrderedDict()
+        self._connectivity = None
 
     def _create_dummy_reporter(self):
         """Creates a non-functional reporter for when none is provided."""
@@ -114,6 +300,9 @@ class Network:
             def log_routing_attempt(self, *args, **kwargs):
                 pass
 
+            def log_routing_attempts(self, *args, **kwargs):
+                pass
+
         return DummyReporter()
 
     def add_node(self, node):
@@ -121,9 +310,306 @@ class Network:
 
         Args:
             node (Node): The node object to add.
+
+        Raises:
+            ValueError: If the network uses a shared topology, whose nodes
+                are fixed by its snapshot.
         """
-        if node.id not in self.nodes:
+        if self._shared is not None:
+            raise ValueError("Nodes cannot be added to a shared topology")
+        with self._lock:
+            if node.id in self.nodes:
+                return
+            self._view = None
             self.nodes[node.id] = node
+            self._names.setdefault(node.name, node)
+            node._observers.append(self._on_node_changed)
+            self._graph = None
+            self.topology_version += 1
+            version = self.topology_version
+            self.journal.record(version, ChangeJournal.NODE, node.id)
+            for neighbor in node.neighbors:
+                if neighbor.id in self.nodes:
+                    self.journal.record(
+                        version, ChangeJournal.EDGE, _link_key(node, neighbor)
+                    )
+
+    def _add_loaded_nodes(self, nodes, graph=None):
+        """Adds many nodes at once, as one topology change.
+
+        Unlike `add_node`, nothing is journaled per node or link: the
+        journal is reset instead, so clients holding an older version fetch
+        a full snapshot.
+
+        Args:
+            nodes (list): The Node objects to add, already linked together.
+            graph (CompactGraph, optional): A compact graph of exactly these
+                nodes, for a network that was empty, to use instead of
+                building one on first use.
+        """
+        with self._lock:
+            self._view = None
+            was_empty = not self.nodes
+            on_changed = self._on_node_changed
+            for node in nodes:
+                if node.id not in self.nodes:
+                    self.nodes[node.id] = node
+                    self._names.setdefault(node.name, node)
+                    node._observers.append(on_changed)
+            self._graph = graph if was_empty else None
+            self.topology_version += 1
+            self.journal.reset(self.topology_version)
+
+    def changes_since(self, version):
+        """Returns what changed in the topology after `version`.
+
+        Args:
+            version (int): A `topology_version` value seen earlier.
+
+        Returns:
+            tuple: A set of the IDs of nodes that were added or changed status
+                   and a set of (node ID, node ID) pairs, sorted, for links
+                   that were added or changed latency. None if the journal no
+                   longer reaches back to `version`, or if the network is on
+                   a shared topology, in which case the caller needs a full
+                   snapshot.
+        """
+        if self._shared is not None:
+            # Every process numbers its own versions, and the caller may
+            # have seen `version` in another one.
+            return None
+        return self.journal.changes_since(version, self.topology_version)
+
+    def add_listener(self, listener):
+        """Registers a callback for topology changes.
+
+        The callback is called as `listener(change, data)` after each change,
+        where `change` is "node_status", "link_latency" or "link_added" and
+        `data` is a JSON-serializable dictionary describing it. A "resync"
+        change with empty data means that changes were missed and listeners
+        should reload the whole topology.
+
+        Args:
+            listener (callable): The callback to register.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregisters a callback added with `add_listener`."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _publish(self, change, data):
+        """Passes a topology change on to every registered listener."""
+        for listener in self._listeners:
+            listener(change, data)
+
+    def _on_node_changed(self, node, change, other=None):
+        """Keeps the compact graph in step with changes made through a Node.
+
+        Status changes are patched into the status bitmap in place; new links
+        change the adjacency structure, so the graph is rebuilt on next use.
+        With a shared topology, status changes are also published to the
+        other processes.
+        """
+        with self._lock:
+            if self._shared is not None and change == "status":
+                self._shared.set_active(self._graph.index[node.id], node.is_active)
+            self._apply_node_change(node, change, other)
+
+    def _apply_node_change(self, node, change, other=None):
+        """Records a node change, patches the compact graph and publishes a view.
+
+        Called with the lock held.
+        """
+        if change != "status":
+            self._view = None
+        self.topology_version += 1
+        if change == "status":
+            self.journal.record(self.topology_version, ChangeJournal.NODE, node.id)
+        elif other is not None:
+            self.journal.record(
+                self.topology_version, ChangeJournal.EDGE, _link_key(node, other)
+            )
+        if self._listeners:
+            if change == "status":
+                self._publish(
+                    "node_status",
+                    {"id": node.id, "name": node.name, "is_active": node.is_active},
+                )
+            elif other is not None and node.id < other.id:
+                # Both ends report a new link; publish it once.
+                latency = node.neighbors[other]
+                self._publish(
+                    "link_added", {"from": node.id, "to": other.id, "latency": latency}
+                )
+        graph = self._graph
+        if graph is None:
+            self._view = None
+            return
+        if change == "status":
+            index = graph.index[node.id]
+            if self._shared is None:
+                graph.set_active(index, node.is_active)
+            else:
+                # The shared bitmap already holds the new status.
+                graph.status_patched()
+            for tree in self._watched_trees(graph):
+                tree.node_status_changed(index)
+            connectivity = self._connectivity
+            if connectivity is not None and connectivity.graph is graph:
+                connectivity.node_status_changed(index)
+            view = self._view
+            if view is not None:
+                self._view = view.with_status(
+                    index, node.is_active, self.topology_version
+                )
+        else:
+            self._graph = None
+
+    @property
+    def watched_sources(self):
+        """set: IDs of the nodes whose trees are maintained incrementally."""
+        return set(self._watched)
+
+    def watch_source(self, node_id):
+        """Keeps the shortest-path tree from `node_id` permanently up to date.
+
+        Instead of being flushed on every topology change, the tree of a
+        watched source is repaired in place when a node changes status or a
+        link latency changes, so path queries from it stay cheap under a
+        steady stream of updates. Adding links or nodes still triggers a
+        full recomputation.
+
+        Args:
+            node_id (str): The ID of the node to watch.
+
+        Returns:
+            bool: True if the node exists and is now watched, False otherwise.
+        """
+        if node_id not in self.nodes:
+            return False
+        self._watched.setdefault(node_id, None)
+        return True
+
+    def unwatch_source(self, node_id):
+        """Stops maintaining the shortest-path tree from `node_id`."""
+        self._watched.pop(node_id, None)
+
+    def _watched_trees(self, graph):
+        """Yields the watched trees that are already built on `graph`."""
+        for tree in list(self._watched.values()):
+            if tree is not None and tree.graph is graph:
+                yield tree
+
+    def _watched_tree(self, graph, node_id):
+        """Returns the up-to-date tree for a watched source, building it if needed."""
+        tree = self._watched.get(node_id)
+        if tree is None or tree.graph is not graph:
+            tree = DynamicShortestPathTree(graph, graph.index[node_id])
+            self._watched[node_id] = tree
+        return tree
+
+    def compact_graph(self):
+        """Returns the array-backed view of the network, building it if needed.
+
+        The graph is patched in place as the network changes; threads that
+        read it while others make changes should use `view` instead.
+
+        Returns:
+            CompactGraph: The current compact graph for this network.
+        """
+        graph = self._graph
+        if graph is None:
+            with self._lock:
+                graph = self._graph
+                if graph is None:
+                    graph = self._graph = CompactGraph(self.nodes.values())
+        return graph
+
+    def connectivity(self):
+        """Returns the index of connected components, building it if needed.
+
+        The index is kept up to date as nodes go online and offline, and is
+        rebuilt after nodes or links are added.
+
+        Returns:
+            ConnectivityIndex: The components of the current compact graph.
+        """
+        graph = self.compact_graph()
+        index = self._connectivity
+        if index is None or index.graph is not graph:
+            with self._lock:
+                graph = self.compact_graph()
+                index = self._connectivity
+                if index is None or index.graph is not graph:
+                    index = self._connectivity = ConnectivityIndex(graph)
+        return index
+
+    def partition_of(self, node_id):
+        """Returns the label of the partition a node belongs to.
+
+        Two online nodes can reach each other exactly when they have the
+        same label. A label stays the same while its partition only grows
+        or loses pieces smaller than the rest of it.
+
+        Args:
+            node_id (str): The ID of the node.
+
+        Returns:
+            int: The partition label, or None if the node is offline or unknown.
+        """
+        index = self.connectivity()
+        position = index.graph.index.get(node_id)
+        if position is None or index.label(position) < 0:
+            return None
+        return index.label(position)
+
+    def partitions(self):
+        """Lists the partitions of the online nodes, largest first.
+
+        Returns:
+            list: (label, nodes) tuples, where `nodes` is a list of Node objects.
+        """
+        index = self.connectivity()
+        nodes = index.graph.nodes
+        return [
+            (label, [nodes[i] for i in members])
+            for label, members in index.components()
+        ]
+
+    def view(self):
+        """Returns an immutable view of the current topology.
+
+        The latest view is published by every change, so this never waits
+        for a lock except right after nodes or links were added, when the
+        first caller builds the new view. The view does not change after it
+        is returned; call `view` again to see later changes.
+
+        Returns:
+            NetworkView: The view of the latest published topology version.
+        """
+        view = self._view
+        if view is None:
+            with self._lock:
+                view = self._view
+                if view is None:
+                    view = self._view = NetworkView.of(
+                        self.compact_graph(), self.topology_version
+                    )
+        return view
+
+    def fork(self):
+        """Returns a what-if copy of the network for scenario analysis.
+
+        The fork shares the current view's topology and records its own
+        status and latency changes as a small overlay; changing it never
+        affects the network, and vice versa.
+
+        Returns:
+            NetworkFork: A fork of the current topology.
+        """
+        return NetworkFork(self.view(), self._names)
 
     def get_node_by_name(self, name):
         """Retrieves a node from the network by its unique name.
@@ -134,10 +620,7 @@ class Network:
         Returns:
             Node or None: The found Node object, or None if not found.
         """
-        for node in self.nodes.values():
-            if node.name == name:
-                return node
-        return None
+        return self._names.get(name)
 
     def get_node(self, node_id):
         """Retrieves a node from the network by its ID.
@@ -186,8 +669,17 @@ class Network:
             )
             return False
         if node2 in node1.neighbors:
-            node1.neighbors[node2] = new_latency
-            node2.neighbors[node1] = new_latency
+            with self._lock:
+                old_latency = node1.neighbors[node2]
+                if self._shared is not None:
+                    graph = self._graph
+                    self._shared.set_latency(
+                        graph.index[node1.id], graph.index[node2.id], new_latency
+                    )
+                else:
+                    node1.neighbors[node2] = new_latency
+                    node2.neighbors[node1] = new_latency
+                self._apply_latency_change(node1, node2, old_latency, new_latency)
             logging.info(
                 f"Updated latency between '{node1.name}' and '{node2.name}' to {new_latency}ms."
             )
@@ -197,10 +689,45 @@ class Network:
         )
         return False
 
+    def _apply_latency_change(self, node1, node2, old_latency, new_latency):
+        """Records a latency change, patches the compact graph and publishes a view.
+
+        Called with the lock held.
+        """
+        self.topology_version += 1
+        self.journal.record(
+            self.topology_version, ChangeJournal.EDGE, _link_key(node1, node2)
+        )
+        self._publish(
+            "link_latency",
+            {"from": node1.id, "to": node2.id, "latency": new_latency},
+        )
+        graph = self._graph
+        if graph is None:
+            self._view = None
+            return
+        i, j = graph.index[node1.id], graph.index[node2.id]
+        if self._shared is not None:
+            # The shared arrays already hold the new latency.
+            graph.latency_patched(old_latency, new_latency)
+        elif not graph.set_latency(i, j, new_latency):
+            self._graph = self._view = None
+            return
+        for tree in self._watched_trees(graph):
+            tree.link_latency_changed(i, j, old_latency, new_latency)
+        view = self._view
+        if view is not None:
+            self._view = view.with_latency(i, j, new_latency, self.topology_version)
+
     @classmethod
     def create_from_config(cls, config_path, reporter=None):
         """Factory method to create a Network instance from a YAML config file.
 
+        The file is parsed with the C YAML loader when PyYAML was built with
+        libyaml, and nodes and links are created in bulk, with a single log
+        line for the whole network. A node entry may give an 'id' to keep;
+        otherwise a new random ID is assigned.
+
         Args:
             config_path (str): The file path to the YAML config file.
             reporter (Reporter, optional): An instance of the reporter. Defaults to None.
@@ -211,48 +738,349 @@ class Network:
         # --- MODIFIED: This method now handles opening the file itself ---
         network = cls(reporter=reporter)
         try:
-            with open(config_path, "r") as f:
-                config_data = yaml.safe_load(f)
+            with open(config_path, "r") as f, _gc_paused():
+                config_data = yaml.load(f, Loader=_YAML_LOADER)
         except (FileNotFoundError, yaml.YAMLError) as e:
             logging.error(f"Failed to load or parse config file: {e}")
             # Return an empty network on failure
             return network
+        with _gc_paused():
+            link_count = network._build_from_config(config_data)
+        logging.info(
+            f"Loaded {len(network.nodes)} nodes and {link_count} links"
+            f" from '{config_path}'"
+        )
+        return network
+
+    def _build_from_config(self, config_data):
+        """Creates the nodes and links of a parsed config in bulk.
 
+        Returns:
+            int: The number of links created.
+        """
         name_to_node_map = {}
+        nodes = []
+        link_count = 0
         for node_data in config_data.get("nodes", []):
             node_name = node_data["name"]
             if node_name not in name_to_node_map:
-                node = Node(name=node_name)
-                network.add_node(node)
+                node_id = node_data.get("id") or str(uuid.uuid4())
+                node = Node._restore(str(node_id), node_name)
+                nodes.append(node)
                 name_to_node_map[node_name] = node
         for link_data in config_data.get("links", []):
             node1_name, node2_name, latency = link_data
             node1, node2 = name_to_node_map.get(node1_name), name_to_node_map.get(
                 node2_name
             )
-            if node1 and node2:
-                node1.add_neighbor(node2, int(latency))
+            # Same rules as Node.add_neighbor: the first link between two
+            # nodes wins.
+            if node1 and node2 and node2 not in node1.neighbors:
+                latency = int(latency)
+                node1.neighbors[node2] = latency
+                node2.neighbors[node1] = latency
+                link_count += 1
+        self._add_loaded_nodes(nodes)
+        return link_count
+
+    def write_snapshot(self, path):
+        """Saves the topology to a compact binary snapshot file.
+
+        A snapshot holds node IDs, names and statuses and every link with
+        its latency, as the arrays of the compact graph. Loading it with
+        `load_snapshot` is much faster than parsing a YAML config, and the
+        nodes keep their IDs.
+
+        Args:
+            path (str): The file to write; it is replaced atomically.
+        """
+        write_snapshot(self.compact_graph(), path)
+
+    @classmethod
+    def load_snapshot(cls, path, reporter=None):
+        """Factory method to create a Network from a snapshot file.
+
+        The arrays in the file become the network's compact graph directly,
+        so the first path query does not have to build it.
+
+        Args:
+            path (str): A file written by `write_snapshot`.
+            reporter (Reporter, optional): An instance of the reporter.
+                Defaults to None.
+
+        Returns:
+            Network: A new Network with the saved nodes, IDs and links.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the file is not a valid snapshot.
+        """
+        snapshot = read_snapshot(path)
+        network = cls(reporter=reporter)
+        with _gc_paused():
+            network._build_from_snapshot(snapshot)
+        logging.info(
+            f"Loaded {len(network.nodes)} nodes and {len(snapshot.targets) // 2}"
+            f" links from '{path}'"
+        )
+        return network
+
+    def _build_from_snapshot(self, snapshot):
+        """Creates the nodes, links and compact graph of a snapshot in bulk."""
+        restore = Node._restore
+        nodes = [
+            restore(node_id, name, bool(is_active))
+            for node_id, name, is_active in zip(
+                snapshot.ids, snapshot.names, snapshot.active
+            )
+        ]
+        offsets, targets, latencies = (
+            snapshot.offsets,
+            snapshot.targets,
+            snapshot.latencies,
+        )
+        node_at = nodes.__getitem__
+        for i, node in enumerate(nodes):
+            start, end = offsets[i], offsets[i + 1]
+            if start != end:
+                node.neighbors = dict(
+                    zip(map(node_at, targets[start:end]), latencies[start:end])
+                )
+        graph = CompactGraph.from_arrays(
+            nodes, offsets, targets, latencies, snapshot.active
+        )
+        self._add_loaded_nodes(nodes, graph)
+
+    @classmethod
+    def from_shared(cls, topology, reporter=None):
+        """Factory method to create a Network over a shared topology.
+
+        The network's compact graph uses the topology's memory-mapped arrays
+        directly, and the nodes' `neighbors` are SharedNeighbors views of
+        them, so creating the network copies no adjacency data. Status and
+        latency changes made through this network are written to the shared
+        state; call `sync_shared` to pick up those made by other processes.
+        Nodes and links cannot be added.
+
+        Args:
+            topology (SharedTopology): The mapped snapshot and state files.
+            reporter (Reporter, optional): An instance of the reporter.
+                Defaults to None.
+
+        Returns:
+            Network: A new Network over the shared topology.
+        """
+        network = cls(reporter=reporter)
+        # Read before the statuses, so no later change can be missed.
+        version = topology.version
+        with _gc_paused():
+            restore = Node._restore
+            nodes = [
+                restore(node_id, name, bool(is_active))
+                for node_id, name, is_active in zip(
+                    topology.ids, topology.names, topology.active
+                )
+            ]
+            graph = CompactGraph.from_arrays(
+                nodes,
+                topology.offsets,
+                topology.targets,
+                topology.latencies,
+                topology.active,
+            )
+            for i, node in enumerate(nodes):
+                node.neighbors = SharedNeighbors(graph, i)
+            network._add_loaded_nodes(nodes, graph)
+        network._shared = topology
+        network._shared_version = version
+        logging.info(
+            f"Attached to shared topology '{topology.snapshot_path}' with"
+            f" {len(nodes)} nodes"
+        )
         return network
 
-    def find_shortest_path(self, start_node_id, end_node_id):
+    def sync_shared(self):
+        """Applies the status and latency changes made by other processes.
+
+        Each change goes through the same bookkeeping as a local one: the
+        topology version is bumped, the journal records it, listeners are
+        told and watched trees are repaired. If so many changes were made
+        that the shared change ring no longer holds them all, the network
+        resynchronizes in full instead and listeners get a "resync".
+
+        Cheap when nothing changed, so it can run before every request.
+
+        Returns:
+            int: The number of changes applied; 0 without a shared topology.
+        """
+        shared = self._shared
+        if shared is None or shared.version == self._shared_version:
+            return 0
+        with self._lock:
+            changes = shared.changes_since(self._shared_version)
+            if changes is None:
+                return self._resync_shared()
+            graph, pid, applied = self._graph, os.getpid(), 0
+            if any(change.pid != pid for change in changes):
+                # The shared arrays may already be ahead of the change being
+                # replayed, so watched trees are rebuilt rather than repaired.
+                self._watched = dict.fromkeys(self._watched)
+            for change in changes:
+                self._shared_version = change.version
+                # This process applied its own changes when it made them.
+                if change.pid == pid:
+                    continue
+                node = graph.nodes[change.i]
+                if change.kind == SharedTopology.STATUS:
+                    node.is_active = bool(change.new)
+                    self._apply_node_change(node, "status")
+                else:
+                    old, new = change.old, change.new
+                    if graph.latencies.format == "q":
+                        old, new = int(old), int(new)
+                    self._apply_latency_change(node, graph.nodes[change.j], old, new)
+                applied += 1
+            return applied
+
+    def _resync_shared(self):
+        """Reloads every status from the shared state after missed changes."""
+        shared, graph = self._shared, self._graph
+        version = shared.version
+        changed = 0
+        for node, is_active in zip(graph.nodes, shared.active):
+            if node.is_active != bool(is_active):
+                node.is_active = bool(is_active)
+                changed += 1
+        # Which latencies changed is unknown, so assume they all did.
+        graph.latency_patched(1, 0)
+        self._view = self._connectivity = None
+        self._watched = dict.fromkeys(self._watched)
+        self.topology_version += 1
+        self.journal.reset(self.topology_version)
+        self._shared_version = version
+        self._publish("resync", {})
+        logging.warning(f"Resynchronized with shared topology: {changed} statuses")
+        return changed
+
+    def _landmark_table(self, graph):
+        """Returns landmark distances for `graph`, recomputing them if stale."""
+        table = self._landmarks
+        if table is None or not table.is_current(graph):
+            table = self._landmarks = LandmarkTable(graph)
+        return table
+
+    def build_contraction_hierarchy(self):
+        """Preprocesses the network into a customizable contraction hierarchy.
+
+        Building is optional: the "ch" strategy builds the hierarchy on first
+        use. Calling this up front (e.g. right after `create_from_config`)
+        moves the preprocessing cost out of the first query and returns its
+        report.
+
+        Returns:
+            dict: Sizes, per-phase timings in seconds and an estimate of the
+                  memory used, as reported by ContractionHierarchy.stats.
+        """
+        with self._lock:
+            self._hierarchy = ContractionHierarchy(self.compact_graph())
+            return dict(self._hierarchy.stats)
+
+    def _contraction_hierarchy(self, graph):
+        """Returns a hierarchy matching `graph`, re-customizing or rebuilding it."""
+        hierarchy = self._hierarchy
+        if hierarchy is None or hierarchy.graph is not graph:
+            hierarchy = self._hierarchy = ContractionHierarchy(graph)
+        elif not hierarchy.is_current(graph):
+            hierarchy.customize()
+        return hierarchy
+
+    def find_shortest_path(self, start_node_id, end_node_id, strategy="dijkstra"):
         """Finds the fastest path between two nodes using Dijkstra's algorithm.
 
         The path is calculated based on the cumulative latency of the links,
-        avoiding any nodes that are currently inactive.
+        avoiding any nodes that are currently inactive. With the compact graph,
+        nodes in different partitions (see `partitions`) are rejected without
+        a search. All strategies return a path of the same (minimal) latency;
+        they differ in how much of the network they explore:
+
+        - "dijkstra": one-sided search that stops at the destination,
+          answered from the watched-source trees or the path cache when
+          possible. A source's whole tree is only built and cached once it
+          is queried a second time at the same topology version.
+        - "bidirectional": searches from both ends until the frontiers meet.
+        - "alt": A* guided by landmark distance tables, which are refreshed
+          lazily after a change that can shorten paths.
+        - "ch": a bidirectional upward search in the contraction hierarchy
+          (see `build_contraction_hierarchy`). Status and latency changes
+          re-customize the hierarchy lazily; new links rebuild it.
+
+        The goal-directed strategies need the compact graph; without it every
+        strategy falls back to plain Dijkstra.
 
         Args:
             start_node_id (str): The ID of the starting node.
             end_node_id (str): The ID of the destination node.
+            strategy (str, optional): One of PATH_STRATEGIES. Defaults to
+                                      "dijkstra".
 
         Returns:
             tuple: A tuple containing the path (list of Node objects) and the
                    total latency (int). Returns (None, float('inf')) if no
                    path is found.
+
+        Raises:
+            ValueError: If `strategy` is not one of PATH_STRATEGIES.
         """
+        if strategy not in self.PATH_STRATEGIES:
+            raise ValueError(f"Unknown path strategy '{strategy}'")
         start_node, end_node = self.get_node(start_node_id), self.get_node(end_node_id)
         if not all([start_node, end_node, start_node.is_active, end_node.is_active]):
             return None, float("inf")
 
+        if self.use_compact_graph:
+            # Nodes in different partitions are rejected without a search.
+            connectivity = self.connectivity()
+            index = connectivity.graph.index
+            if not connectivity.connected(index[start_node_id], index[end_node_id]):
+                return None, float("inf")
+            if strategy in ("alt", "ch") or (
+                strategy == "dijkstra" and start_node_id in self._watched
+            ):
+                # Landmarks, hierarchies and watched trees are patched in
+                # place, so these queries wait for changes in progress.
+                with self._lock:
+                    graph = self.compact_graph()
+                    source = graph.index[start_node_id]
+                    target = graph.index[end_node_id]
+                    if strategy == "alt":
+                        table = self._landmark_table(graph)
+                        path, latency = table.shortest_path(source, target)
+                    elif strategy == "ch":
+                        hierarchy = self._contraction_hierarchy(graph)
+                        path, latency = hierarchy.shortest_path(source, target)
+                    else:
+                        tree = self._watched_tree(graph, start_node_id)
+                        path, latency = tree.path_to(target)
+            else:
+                view = self.view()
+                graph = view.graph
+                source, target = graph.index[start_node_id], graph.index[end_node_id]
+                if strategy == "bidirectional":
+                    path, latency = graph.bidirectional_path(source, target)
+                else:
+                    tree = None
+                    if self._path_cache is not None:
+                        tree = self._shortest_path_tree(
+                            graph, source, view.version, repeated_only=True
+                        )
+                    if tree is not None:
+                        path, latency = tree.path_to(target)
+                    else:
+                        path, latency = graph.shortest_path(source, target)
+            if path is None:
+                return None, float("inf")
+            return [graph.nodes[i] for i in path], latency
+
         distances = {node_id: float("inf") for node_id in self.nodes}
         distances[start_node_id] = 0
         previous_nodes = {node_id: None for node_id in self.nodes}
@@ -279,19 +1107,263 @@ class Network:
         path = []
         current_node = end_node
         while current_node is not None:
-            path.insert(0, current_node)
+            path.append(current_node)
             current_node = previous_nodes.get(current_node.id)
+        path.reverse()
 
         if path and path[0] == start_node:
             return path, distances[end_node_id]
 
         return None, float("inf")
 
+    def distances_from(self, source_node_id):
+        """Returns the latency from one node to every node in the network.
+
+        Args:
+            source_node_id (str): The ID of the source node.
+
+        Returns:
+            DistanceTable: A single row of float64 latencies, one per node of
+                           `nodes`, inf where unreachable; or None if the
+                           source is unknown.
+        """
+        graph = self.view().graph
+        source = graph.index.get(source_node_id)
+        if source is None:
+            return None
+        return DistanceTable(
+            [graph.nodes[source]], list(graph.nodes), distances_from(graph, source)
+        )
+
+    def distance_matrix(self, sources=None, workers=None):
+        """Returns the latencies from several nodes to every node.
+
+        See `distances.distance_rows` for how the matrix is computed.
+
+        Args:
+            sources (list, optional): IDs of the source nodes. Defaults to
+                every node, for the full N x N matrix.
+            workers (int, optional): The number of worker processes. Defaults
+                to the number of CPUs.
+
+        Returns:
+            DistanceTable: One row of float64 latencies per source.
+
+        Raises:
+            ValueError: If a source ID is unknown.
+        """
+        graph, indices = self._distance_sources(sources)
+        return DistanceTable(
+            [graph.nodes[i] for i in indices],
+            list(graph.nodes),
+            distance_matrix(graph, indices, workers),
+        )
+
+    def distance_blocks(self, sources=None, workers=None):
+        """Like `distance_matrix`, but computes the rows block by block.
+
+        Returns:
+            DistanceTable: The sources and nodes, with `values` an iterator
+                           over float64 blocks of rows, in source order.
+
+        Raises:
+            ValueError: If a source ID is unknown.
+        """
+        graph, indices = self._distance_sources(sources)
+        return DistanceTable(
+            [graph.nodes[i] for i in indices],
+            list(graph.nodes),
+            distance_rows(graph, indices, workers),
+        )
+
+    def _distance_sources(self, sources):
+        """Returns the current view's graph and the indices of `sources`."""
+        graph = self.view().graph
+        if sources is None:
+            return graph, list(range(len(graph)))
+        indices = []
+        for node_id in sources:
+            if node_id not in graph.index:
+                raise ValueError(f"Unknown node ID '{node_id}'")
+            indices.append(graph.index[node_id])
+        return graph, indices
+
+    def k_shortest_paths(self, start_node_id, end_node_id, k):
+        """Finds up to `k` shortest loopless paths between two online nodes.
+
+        Args:
+            start_node_id (str): The ID of the starting node.
+            end_node_id (str): The ID of the destination node.
+            k (int): The maximum number of paths to return.
+
+        Returns:
+            list: (path, latency) tuples in order of increasing latency, where
+                  a path is a list of Node objects; empty if no path exists.
+        """
+        graph = self.view().graph
+        source, target = graph.index.get(start_node_id), graph.index.get(end_node_id)
+        if source is None or target is None:
+            return []
+        return [
+            ([graph.nodes[i] for i in path], latency)
+            for path, latency in k_shortest_paths(graph, source, target, k)
+        ]
+
+    def disjoint_paths(self, start_node_id, end_node_id):
+        """Finds the shortest path and a backup sharing no node with it.
+
+        Args:
+            start_node_id (str): The ID of the starting node.
+            end_node_id (str): The ID of the destination node.
+
+        Returns:
+            tuple: The primary and the backup, each a (path, latency) tuple
+                   as returned by `find_shortest_path`.
+        """
+        graph = self.view().graph
+        source, target = graph.index.get(start_node_id), graph.index.get(end_node_id)
+        missing = None, float("inf")
+        if source is None or target is None:
+            return missing, missing
+        primary = k_shortest_paths(graph, source, target, 1)
+        if not primary:
+            return missing, missing
+        path, latency = primary[0]
+        backup, backup_latency = disjoint_path(graph, path)
+        return (
+            ([graph.nodes[i] for i in path], latency),
+            ([graph.nodes[i] for i in backup], backup_latency) if backup else missing,
+        )
+
+    def protect_route(self, start_node_id, end_node_id, k=3):
+        """Precomputes standby paths so that failures are rerouted instantly.
+
+        The `k` shortest loopless paths and a node-disjoint backup are
+        computed as if every node were online. From then on `route_message`
+        switches to the fastest standby path that is fully online instead
+        of searching the graph, and only searches again when every standby
+        path is down. Standby paths are recomputed after new links are
+        added.
+
+        Protecting a route that is already protected with the same `k`
+        returns its standby paths without recomputing them. At most
+        MAX_PROTECTED_ROUTES routes are protected at once; beyond that, the
+        route protected least recently loses its standby paths.
+
+        Args:
+            start_node_id (str): The ID of the starting node.
+            end_node_id (str): The ID of the destination node.
+            k (int, optional): How many shortest paths to keep, besides the
+                backup. Defaults to 3.
+
+        Returns:
+            list: One (path, latency, available) tuple per standby path,
+                  where `available` says whether all of its nodes are online
+                  now. Empty if the nodes are unknown or never connected.
+        """
+        graph = self.view().graph
+        source, target = graph.index.get(start_node_id), graph.index.get(end_node_id)
+        if source is None or target is None:
+            return []
+        key = (start_node_id, end_node_id)
+        with self._lock:
+            standby = self._current_standby(graph, start_node_id, end_node_id)
+            if standby is None or standby.k != k:
+                standby = StandbyPaths(graph, source, target, k)
+            self._standby[key] = standby
+            self._standby.move_to_end(key)
+            while len(self._standby) > self.MAX_PROTECTED_ROUTES:
+                self._standby.popitem(last=False)
+        return self._describe_standby(graph, standby)
+
+    def unprotect_route(self, start_node_id, end_node_id):
+        """Drops the standby paths of a route; see `protect_route`."""
+        with self._lock:
+            self._standby.pop((start_node_id, end_node_id), None)
+
+    def standby_paths(self, start_node_id, end_node_id):
+        """Returns the standby paths of a protected route.
+
+        Returns:
+            list: (path, latency, available) tuples as returned by
+                  `protect_route`, or None if the route is not protected.
+        """
+        graph = self.view().graph
+        standby = self._current_standby(graph, start_node_id, end_node_id)
+        return None if standby is None else self._describe_standby(graph, standby)
+
+    @staticmethod
+    def _describe_standby(graph, standby):
+        nodes, paths = graph.nodes, []
+        for (path, positions), latency in zip(standby.paths, standby.latencies(graph)):
+            if latency is None:
+                latency = sum(graph.latencies[k] for k in positions)
+            paths.append(
+                ([nodes[i] for i in path], latency, all(graph.active[i] for i in path))
+            )
+        return paths
+
+    def _current_standby(self, graph, start_node_id, end_node_id):
+        """Returns a route's StandbyPaths for `graph`, rebuilding stale ones."""
+        key = (start_node_id, end_node_id)
+        standby = self._standby.get(key)
+        if standby is None or standby.is_current(graph):
+            return standby
+        standby = StandbyPaths(
+            graph, graph.index[start_node_id], graph.index[end_node_id], standby.k
+        )
+        with self._lock:
+            # Keep an unprotected or evicted route out.
+            if key in self._standby:
+                self._standby[key] = standby
+        return standby
+
+    def _shortest_path_tree(self, graph, source, version, repeated_only=False):
+        """Returns the shortest-path tree rooted at `source`, using the cache.
+
+        Args:
+            graph (CompactGraph): The current compact graph.
+            source (int): The compact graph index of the root node.
+            version (int): The topology version read before `graph` was
+                           fetched, so a concurrent change is never masked.
+            repeated_only (bool, optional): On a miss, only build the tree if
+                `source` already missed at `version`; a single path query is
+                cheaper with an early-exit search. Defaults to False.
+
+        Returns:
+            ShortestPathTree: The tree for the topology at `version`, or None
+                              if `repeated_only` and the tree was not built.
+        """
+        tree = self._path_cache.get(source, version)
+        if tree is None:
+            if repeated_only and not self._path_cache.repeated(source, version):
+                return None
+            tree = graph.shortest_path_tree(source)
+            self._path_cache.put(source, version, tree)
+        return tree
+
+    def path_cache_info(self):
+        """Reports the shortest-path cache counters.
+
+        Returns:
+            dict: The cache 'hits', 'misses', current 'size' and 'maxsize',
+                  plus the current 'topology_version'. Counters are zero when
+                  caching is disabled.
+        """
+        if self._path_cache is None:
+            info = {"hits": 0, "misses": 0, "size": 0, "maxsize": 0}
+        else:
+            info = self._path_cache.info()
+        info["topology_version"] = self.topology_version
+        return info
+
     def route_message(self, message):
         """Routes a message from source to destination using the fastest path.
 
         This method uses `find_shortest_path` to determine the route and
-        logs the attempt to the reporter.
+        logs the attempt to the reporter. Routes protected with
+        `protect_route` use the fastest online standby path instead, and
+        only search when all of them are down.
 
         Args:
             message (Message): The message object to route.
@@ -305,7 +1377,11 @@ class Network:
         if not source_node or not dest_node:
             return False
 
-        path, total_latency = self.find_shortest_path(source_node.id, dest_node.id)
+        path = None
+        if (source_node.id, dest_node.id) in self._standby:
+            path, total_latency = self._reroute(source_node, dest_node)
+        if path is None:
+            path, total_latency = self.find_shortest_path(source_node.id, dest_node.id)
 
         if not path:
             self.reporter.log_routing_attempt(
@@ -318,3 +1394,97 @@ class Network:
             message, source_node, dest_node, path, total_latency, success
         )
         return success
+
+    def _reroute(self, source_node, dest_node):
+        """Picks the fastest online standby path of a protected route."""
+        graph = self.view().graph
+        standby = self._current_standby(graph, source_node.id, dest_node.id)
+        if standby is None:
+            return None, float("inf")
+        path, latency = standby.best(graph)
+        if path is None:
+            return None, float("inf")
+        return [graph.nodes[i] for i in path], latency
+
+    def route_messages(self, messages):
+        """Routes a batch of messages, sharing work between common sources.
+
+        Messages are grouped by source node and one shortest-path tree is
+        computed per distinct source, so a traffic matrix with many messages
+        per source costs one Dijkstra run per source rather than one per
+        message. All routing attempts are handed to the reporter in a single
+        call at the end.
+
+        Args:
+            messages (iterable): The Message objects to route.
+
+        Returns:
+            list: One (success, path, total_latency) tuple per message, in the
+                  input order. `path` is a list of Node objects, or None (with
+                  a latency of float('inf')) when no route exists or either
+                  endpoint is unknown.
+        """
+        messages = list(messages)
+        results = [(False, None, float("inf"))] * len(messages)
+        attempts = [None] * len(messages)
+        by_source = {}
+        for position, message in enumerate(messages):
+            by_source.setdefault(message.source_id, []).append(position)
+
+        view = self.view() if self.use_compact_graph else None
+        for source_id, positions in by_source.items():
+            source_node = self.get_node(source_id)
+            if not source_node:
+                continue
+            route = self._batch_router(view, source_node)
+            for position in positions:
+                message = messages[position]
+                dest_node = self.get_node(message.destination_id)
+                if not dest_node:
+                    continue
+                path, total_latency = route(dest_node)
+                if not path:
+                    attempts[position] = (
+                        message, source_node, dest_node, None, 0, False
+                    )
+                    continue
+                success = path[-1].receive_message(message)
+                results[position] = (success, path, total_latency)
+                attempts[position] = (
+                    message, source_node, dest_node, path, total_latency, success
+                )
+
+        self.reporter.log_routing_attempts([a for a in attempts if a is not None])
+        return results
+
+    def _batch_router(self, view, source_node):
+        """Returns a function mapping a destination Node to (path, latency).
+
+        With the compact graph, the function answers from a single
+        shortest-path tree rooted at `source_node`, computed on `view`.
+        Watched trees change in place, so they are queried one path at a
+        time through `find_shortest_path`.
+        """
+        if (
+            view is None
+            or not source_node.is_active
+            or source_node.id in self._watched
+        ):
+            return lambda dest: self.find_shortest_path(source_node.id, dest.id)
+
+        graph = view.graph
+        source = graph.index[source_node.id]
+        if self._path_cache is not None:
+            tree = self._shortest_path_tree(graph, source, view.version)
+        else:
+            tree = graph.shortest_path_tree(source)
+
+        def route(dest_node):
+            if not dest_node.is_active:
+                return None, float("inf")
+            path, latency = tree.path_to(graph.index[dest_node.id])
+            if path is None:
+                return None, float("inf")
+            return [graph.nodes[i] for i in path], latency
+
+        return route
@@ -0,0 +1,221 @@
+# backend/aegis_simulator/paths.py
+
+import heapq
+
+from .graph import INF
+
+
+def _search(graph, source, target, active, blocked=(), banned=()):
+    """Runs Dijkstra's algorithm with some nodes and half-links removed.
+
+    Distances are kept in dictionaries, so a search only pays for the part
+    of the graph it visits; Yen's algorithm runs many short spur searches.
+
+    Args:
+        graph (CompactGraph): The graph to search.
+        source (int): The index of the starting node.
+        target (int): The index of the destination node.
+        active (bytearray): The status bitmap to respect.
+        blocked (set, optional): Indices of nodes that may not be entered.
+        banned (set, optional): (u, v) half-links that may not be used.
+
+    Returns:
+        tuple: A list of node indices from source to target and the total
+               latency, or (None, float('inf')) if no path exists.
+    """
+    if not (active[source] and active[target]):
+        return None, INF
+    offsets, targets, latencies = graph.offsets, graph.targets, graph.latencies
+    dist, prev = {source: 0}, {}
+    heap = [(0, source)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    while heap:
+        d, u = heappop(heap)
+        if u == target:
+            break
+        if d > dist[u]:
+            continue
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            if not active[v] or v in blocked or (u, v) in banned:
+                continue
+            nd = d + latencies[k]
+            if nd < dist.get(v, INF):
+                dist[v] = nd
+                prev[v] = u
+                heappush(heap, (nd, v))
+    if target not in dist:
+        return None, INF
+    path = [target]
+    while path[-1] != source:
+        path.append(prev[path[-1]])
+    path.reverse()
+    return path, dist[target]
+
+
+def path_latencies(graph, path):
+    """Returns the cumulative latency at each node of `path`, starting at 0."""
+    totals = [0]
+    for u, v in zip(path, path[1:]):
+        totals.append(totals[-1] + graph.latencies[graph._edge_position(u, v)])
+    return totals
+
+
+def k_shortest_paths(graph, source, target, k, active=None):
+    """Finds up to `k` shortest loopless paths with Yen's algorithm.
+
+    Each path after the first deviates from an earlier one at some spur
+    node: the search from the spur node avoids the nodes before it on the
+    shared root and the links the earlier paths took out of it.
+
+    Args:
+        graph (CompactGraph): The graph to search.
+        source (int): The index of the starting node.
+        target (int): The index of the destination node.
+        k (int): The maximum number of paths to return.
+        active (bytearray, optional): A status bitmap to use instead of the
+            graph's own.
+
+    Returns:
+        list: (path, latency) tuples in order of increasing latency, where a
+              path is a list of node indices; empty if no path exists.
+    """
+    if active is None:
+        active = graph.active
+    first = _search(graph, source, target, active)
+    if first[0] is None or k < 1:
+        return []
+    paths = [first]
+    seen = {tuple(first[0])}
+    candidates = []
+    while len(paths) < k:
+        last = paths[-1][0]
+        totals = path_latencies(graph, last)
+        for i in range(len(last) - 1):
+            root = last[: i + 1]
+            banned = {
+                (last[i], path[i + 1]) for path, _ in paths if path[: i + 1] == root
+            }
+            spur, latency = _search(
+                graph, last[i], target, active, set(root[:-1]), banned
+            )
+            if spur is None:
+                continue
+            candidate = root[:-1] + spur
+            if tuple(candidate) not in seen:
+                seen.add(tuple(candidate))
+                heapq.heappush(candidates, (totals[i] + latency, candidate))
+        if not candidates:
+            break
+        latency, path = heapq.heappop(candidates)
+        paths.append((path, latency))
+    return paths
+
+
+def disjoint_path(graph, path, active=None):
+    """Finds the shortest path between the ends of `path` that shares no
+    other node with it, nor its link if it is a single hop.
+
+    The backup is found by removing the primary's interior nodes, so on
+    some topologies it is not the best possible disjoint pair, or misses
+    one that exists.
+
+    Args:
+        graph (CompactGraph): The graph to search.
+        path (list): The primary path, as node indices.
+        active (bytearray, optional): A status bitmap to use instead of the
+            graph's own.
+
+    Returns:
+        tuple: The backup path and its latency, or (None, float('inf')).
+    """
+    source, target = path[0], path[-1]
+    if source == target:
+        return None, INF
+    banned = {(source, target)} if len(path) == 2 else ()
+    return _search(
+        graph,
+        source,
+        target,
+        graph.active if active is None else active,
+        set(path[1:-1]),
+        banned,
+    )
+
+
+class StandbyPaths:
+    """Precomputed alternative paths between one pair of nodes.
+
+    The paths are computed as if every node were online: the k shortest
+    loopless paths plus a node-disjoint backup of the shortest one. When
+    nodes fail, `best` picks the fastest path whose nodes are all online at
+    the current latencies, in time proportional to the paths' lengths
+    rather than to the graph. The paths stay valid until a link is added.
+
+    Attributes:
+        k (int): The number of shortest paths that were asked for.
+        targets (array): The CSR targets of the graph the paths were built
+                         on, to tell whether that graph's links still apply.
+        paths (list): (path, positions) tuples: the node indices of each
+                      path and the positions of its half-links in the CSR
+                      arrays.
+    """
+
+    __slots__ = ("k", "targets", "paths")
+
+    def __init__(self, graph, source, target, k):
+        """Computes the standby paths on `graph`.
+
+        Args:
+            graph (CompactGraph): The graph to search.
+            source (int): The index of the starting node.
+            target (int): The index of the destination node.
+            k (int): How many shortest paths to keep, besides the backup.
+        """
+        everyone = bytearray(b"\x01") * len(graph)
+        shortest = k_shortest_paths(graph, source, target, k, everyone)
+        paths = [path for path, _ in shortest]
+        if paths:
+            backup, _ = disjoint_path(graph, paths[0], everyone)
+            if backup is not None and backup not in paths:
+                paths.append(backup)
+        self.k = k
+        self.targets = graph.targets
+        self.paths = [
+            (path, [graph._edge_position(u, v) for u, v in zip(path, path[1:])])
+            for path in paths
+        ]
+
+    def is_current(self, graph):
+        """Returns whether `graph` has the links the paths were built on."""
+        return graph.targets is self.targets
+
+    def latencies(self, graph):
+        """Returns each path's current latency, or None where a node is offline.
+
+        Args:
+            graph (CompactGraph): A graph for which `is_current` holds.
+        """
+        active, latencies = graph.active, graph.latencies
+        return [
+            sum(latencies[k] for k in positions)
+            if all(active[i] for i in path)
+            else None
+            for path, positions in self.paths
+        ]
+
+    def best(self, graph):
+        """Returns the fastest standby path that is fully online in `graph`.
+
+        Args:
+            graph (CompactGraph): A graph for which `is_current` holds.
+
+        Returns:
+            tuple: The path's node indices and latency, or
+                   (None, float('inf')) if every standby path is down.
+        """
+        best, best_latency = None, INF
+        for (path, _), latency in zip(self.paths, self.latencies(graph)):
+            if latency is not None and latency < best_latency:
+                best, best_latency = path, latency
+        return best, best_latency
@@ -3,16 +3,144 @@
 import csv
 import datetime
 import os
+import threading
+import time
+
+from .events import NAN, EventStore
 
 
 class Reporter:
-    """Logs simulation events and generates a CSV report."""
+    """Logs simulation events and generates a CSV report.
+
+    Events are kept in a bounded EventStore, so memory use stays flat
+    however long the simulation runs; the oldest events are dropped once
+    `capacity` is reached or they are older than `max_age` seconds.
+
+    The reporter is safe to use from several threads: one lock is held
+    while events are appended and passed on to the sinks and listeners, so
+    every event gets its own sequence number and is delivered exactly once,
+    in sequence order.
+    """
+
+    def __init__(self, capacity=100000, max_age=None):
+        """Initializes the reporter with an empty log.
 
-    def __init__(self):
-        """Initializes the reporter with an empty log."""
-        self.log_entries = []
+        Args:
+            capacity (int, optional): The maximum number of events retained.
+                Defaults to 100000.
+            max_age (float, optional): The retention period in seconds.
+                Defaults to None (limited by capacity only).
+        """
+        self.events = EventStore(capacity, max_age)
+        self._listeners = []
+        self._sinks = []
+        self._lock = threading.RLock()
+        self._new_events = threading.Condition(self._lock)
         print("Reporter initialized.")
 
+    @property
+    def log_entries(self):
+        """list: Every retained event rendered as a dictionary, oldest first.
+
+        This renders the whole store on each access; use `recent_events` or
+        `events_after` to read only part of it.
+        """
+        with self._lock:
+            return self.events.entries()
+
+    def add_listener(self, listener):
+        """Registers a callback that receives every new log entry.
+
+        Args:
+            listener (callable): Called as `listener(entry)` after each entry
+                                 is logged.
+        """
+        self._listeners.append(listener)
+
+    def add_sink(self, sink):
+        """Streams every event logged from now on to `sink`.
+
+        Args:
+            sink (ReportSink): A sink whose `submit` method takes a list of
+                               EventRecords.
+        """
+        self._sinks.append(sink)
+
+    def close(self):
+        """Flushes and closes every sink added with `add_sink`."""
+        for sink in self._sinks:
+            sink.close()
+
+    def wait_for_events(self, after, timeout):
+        """Blocks until an event with a sequence number above `after` exists.
+
+        Args:
+            after (int): The sequence number of the last event seen.
+            timeout (float): The longest time to wait in seconds.
+
+        Returns:
+            bool: True if such an event has been logged.
+        """
+        with self._new_events:
+            return self._new_events.wait_for(
+                lambda: self.events.next_seq > after + 1, timeout
+            )
+
+    def events_after(self, after, limit=100):
+        """Returns the events logged after sequence number `after`.
+
+        Unlike calling `events.after` directly, this cannot observe an event
+        that another thread is still appending.
+
+        Args:
+            after (int): The sequence number of the last event seen; -1 to
+                start from the beginning.
+            limit (int, optional): The maximum number of events. Defaults to
+                100.
+
+        Returns:
+            tuple: The entries and the number of missed events, as returned
+                   by `EventStore.after`.
+        """
+        with self._lock:
+            return self.events.after(after, limit)
+
+    def recent_events(self, limit=10, event_type=None):
+        """Returns the newest events, newest first, like `events.recent`.
+
+        Like `events_after`, this cannot observe an event that another
+        thread is still appending.
+
+        Args:
+            limit (int, optional): The maximum number of events. Defaults to 10.
+            event_type (str, optional): Only return events of this type.
+
+        Returns:
+            list: Rendered log entries, each with its sequence number 'seq'.
+        """
+        with self._lock:
+            return self.events.recent(limit, event_type)
+
+    def _notify(self, first_seq, end_seq):
+        """Passes the entries numbered `first_seq` to `end_seq` - 1 on.
+
+        Must be called with the lock held, by the call that appended them.
+        """
+        events = self.events
+        self._new_events.notify_all()
+        # A batch larger than the store has already overwritten its own start.
+        new = range(max(first_seq, events.first_seq), end_seq)
+        if self._sinks:
+            records = [events.record(seq) for seq in new]
+            for sink in self._sinks:
+                sink.submit(records)
+        if not self._listeners:
+            return
+        entries = [events.get(seq) for seq in new]
+        for listener in self._listeners:
+            for entry in entries:
+                listener(entry)
+
     @staticmethod
     def get_timestamp():
         """Returns a consistently formatted timestamp string."""
@@ -22,35 +150,102 @@ class Reporter:
         self, message, source_node, dest_node, path, latency, success
     ):
         """Logs the result of a single message routing attempt."""
-        entry = {
-            "timestamp": self.get_timestamp(),
-            "event_type": "MESSAGE_ROUTE",
-            "details": f"Route from '{source_node.name}' to '{dest_node.name}' {'SUCCEEDED' if success else 'FAILED'}.",
-            "status": "SUCCESS" if success else "FAILED",
-            "path_taken": (
-                " -> ".join([n.name for n in path]) if path else "No path found"
-            ),
-            "total_latency_ms": latency if success else "N/A",
-        }
-        self.log_entries.append(entry)
+        self.log_routing_attempts(
+            [(message, source_node, dest_node, path, latency, success)]
+        )
+
+    def log_routing_attempts(self, attempts):
+        """Logs the results of many routing attempts in one call.
+
+        All entries share a single timestamp, which is taken once per batch
+        with the lock held, so timestamps never decrease along the log.
+
+        Args:
+            attempts (list): Tuples of (message, source_node, dest_node, path,
+                             latency, success), as for `log_routing_attempt`.
+        """
+        events = self.events
+        with self._lock:
+            timestamp = time.time()
+            first_seq, number = events.next_seq, events.node_number
+            for _, source, dest, path, latency, success in attempts:
+                events.append(
+                    "MESSAGE_ROUTE",
+                    timestamp,
+                    number(source),
+                    number(dest),
+                    1 if success else 0,
+                    latency if success else NAN,
+                    path=tuple(number(node) for node in path) if path else None,
+                )
+            self._notify(first_seq, events.next_seq)
+
+    def log_transits(self, transits):
+        """Logs the outcomes of simulated hop-by-hop message transits.
+
+        Args:
+            transits (list): Tuples of (source_node, dest_node, success,
+                             sim_time, transit_time, reason). `sim_time` is
+                             when the message arrived or was lost, in
+                             simulated milliseconds; `reason` says why a
+                             lost message was dropped.
+        """
+        events = self.events
+        with self._lock:
+            timestamp = time.time()
+            first_seq, number = events.next_seq, events.node_number
+            for source, dest, success, sim_time, transit_time, reason in transits:
+                events.append(
+                    "MESSAGE_TRANSIT",
+                    timestamp,
+                    number(source),
+                    number(dest),
+                    1 if success else 0,
+                    transit_time if success else NAN,
+                    sim_time,
+                    reason=None if success else reason,
+                )
+            self._notify(first_seq, events.next_seq)
+
+    def log_status_change(self, node, is_active):
+        """Logs a node being taken offline or brought online.
+
+        Args:
+            node (Node): The node whose status changed.
+            is_active (bool): The node's new status.
+        """
+        events = self.events
+        with self._lock:
+            seq = events.append(
+                "STATUS_CHANGE",
+                time.time(),
+                destination=events.node_number(node),
+                status=1 if is_active else 0,
+            )
+            self._notify(seq, seq + 1)
 
     def write_report(self, filename="simulation_report.csv"):
-        """Writes all logged entries to a specified CSV file."""
+        """Writes all retained entries to a specified CSV file.
+
+        For long runs, add a ReportSink instead: it writes events as they
+        are logged rather than all at once from memory.
+        """
         output_dir = os.path.join("output", "csv")
         os.makedirs(output_dir, exist_ok=True)
         filepath = os.path.join(output_dir, filename)
-        if not self.log_entries:
+        entries = self.log_entries
+        if not entries:
             print("No events to report.")
             return False
 
-        # Dynamically get headers from the first entry to handle different event types
-        headers = self.log_entries[0].keys()
+        # Collect the headers of every event type present, in first-seen order
+        headers = list(dict.fromkeys(key for entry in entries for key in entry))
 
         try:
             with open(filepath, "w", newline="", encoding="utf-8") as f:
                 writer = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore")
                 writer.writeheader()
-                writer.writerows(self.log_entries)
+                writer.writerows(entries)
             print(f"Successfully wrote report to '{filepath}'")
             return True
         except IOError as e:
@@ -0,0 +1,302 @@
+# backend/aegis_simulator/sharding.py
+
+import math
+import multiprocessing
+import os
+import time
+from array import array
+from collections import deque
+
+from .graph import INF
+from .simulation import FAIL, RECOVER, Simulation, SimulationStats
+
+
+def partition_graph(graph, shard_count):
+    """Splits a CompactGraph into `shard_count` connected regions.
+
+    Nodes are laid out in breadth-first order, one connected component
+    after another, and the order is cut into equal-sized runs. Each run is
+    a contiguous region of the topology, which keeps most links inside a
+    shard and the boundary traffic between shards low.
+
+    Args:
+        graph (CompactGraph): The graph to partition.
+        shard_count (int): The number of shards.
+
+    Returns:
+        array: The shard number of every node.
+    """
+    n = len(graph)
+    offsets, targets = graph.offsets, graph.targets
+    seen = bytearray(n)
+    order = []
+    for root in range(n):
+        if seen[root]:
+            continue
+        seen[root] = 1
+        queue = deque([root])
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if not seen[v]:
+                    seen[v] = 1
+                    queue.append(v)
+
+    shard_of = array("q", [0]) * n
+    size = max(1, -(-n // max(1, shard_count)))
+    for position, v in enumerate(order):
+        shard_of[v] = position // size
+    return shard_of
+
+
+def _run_shard(connection, graph, shard_of, shard, options):
+    """Worker process loop: runs one shard's Simulation on coordinator command.
+
+    Commands are tuples whose first element names them:
+
+    - ("admit", entries): schedule messages, given as outbox-style tuples.
+    - ("status", events): schedule (time, node, online) status changes.
+    - ("advance", until): run every event before `until` and reply with
+      (outbox, next event time, delivered, dropped).
+    - ("stop",): reply with the shard's stats and exit.
+    """
+    simulation = Simulation(
+        None, graph=graph, shard_of=shard_of, shard=shard, **options
+    )
+    while True:
+        command = connection.recv()
+        if command[0] == "admit":
+            for entry in command[1]:
+                simulation.accept(*entry)
+        elif command[0] == "status":
+            for at, node, online in command[1]:
+                simulation._push(at, RECOVER if online else FAIL, node)
+        elif command[0] == "advance":
+            simulation.run(before=command[1])
+            connection.send(
+                (
+                    simulation.outbox,
+                    simulation.next_event_time(),
+                    simulation.delivered,
+                    simulation.dropped,
+                )
+            )
+            simulation.outbox, simulation.delivered, simulation.dropped = [], [], []
+        else:
+            connection.send(simulation.stats)
+            connection.close()
+            return
+
+
+class ShardedSimulation:
+    """Runs a Simulation split across worker processes, one per shard.
+
+    The network is partitioned into connected regions (see
+    `partition_graph`) and each region runs in its own process. Every
+    worker gets the whole compact topology, so it can compute next hops
+    toward any destination, but only keeps queues and events for the nodes
+    it owns. Messages crossing a shard boundary are sent back to the
+    coordinator and handed to the owning shard.
+
+    Shards are kept in step with conservative time windows: in each round,
+    every shard runs the events before the earliest pending event time plus
+    the smallest latency of any cross-shard link. A message from another
+    shard can arrive exactly at that bound, so the window is half-open and
+    events at the bound wait for the next round. Node failures are
+    scheduled in every shard, because every shard routes over the whole
+    topology.
+
+    Attributes:
+        network (Network): The network being simulated.
+        shard_of (array): The shard number of every node.
+        shard_count (int): The number of worker processes.
+        lookahead (float): The smallest cross-shard link latency.
+        delivered (list): (Message, arrival time) pairs, in arrival order.
+        dropped (list): (Message, drop time, reason) triples, in time order.
+    """
+
+    def __init__(self, network, shard_count=None, **options):
+        """Partitions `network` and prepares the shard workers.
+
+        Args:
+            network (Network): The network to simulate.
+            shard_count (int, optional): The number of shards. Defaults to the
+                number of CPU cores.
+            **options: Passed on to each shard's Simulation (service_time,
+                queue_capacity, max_hops).
+        """
+        self.network = network
+        self.graph = network.compact_graph()
+        shard_count = shard_count or os.cpu_count() or 1
+        self.shard_count = max(1, min(shard_count, len(self.graph)))
+        self.shard_of = partition_graph(self.graph, self.shard_count)
+        self.options = options
+        self.delivered = []
+        self.dropped = []
+        self._keys = []
+        self._sent_at = array("d")
+        self._pending = [[] for _ in range(self.shard_count)]
+        self._status = []
+
+        graph, shard_of = self.graph, self.shard_of
+        lookahead = INF
+        for u in range(len(graph)):
+            for k in range(graph.offsets[u], graph.offsets[u + 1]):
+                if shard_of[graph.targets[k]] != shard_of[u]:
+                    lookahead = min(lookahead, graph.latencies[k])
+        self.lookahead = lookahead
+
+    def send(self, message, at=0.0):
+        """Schedules `message` to enter the network at simulated time `at`.
+
+        Returns:
+            bool: True if the message was scheduled, False if either endpoint
+                  is not part of the network.
+        """
+        index = self.graph.index
+        source = index.get(message.source_id)
+        destination = index.get(message.destination_id)
+        if source is None or destination is None:
+            return False
+        key = len(self._keys)
+        self._keys.append(message)
+        self._sent_at.append(at)
+        self._pending[self.shard_of[source]].append(
+            (at, source, destination, at, 0.0, 0, key)
+        )
+        return True
+
+    def schedule_failure(self, node_id, at):
+        """Schedules the node `node_id` to go offline at simulated time `at`."""
+        self._status.append((at, self.graph.index[node_id], False))
+
+    def schedule_recovery(self, node_id, at):
+        """Schedules the node `node_id` to come back online at time `at`."""
+        self._status.append((at, self.graph.index[node_id], True))
+
+    def run(self, reporter=None):
+        """Runs every shard to completion and merges the results.
+
+        Args:
+            reporter (Reporter, optional): If given, the outcome of every
+                message is logged to it in one bulk call, in simulated time
+                order.
+
+        Returns:
+            dict: The merged SimulationStats summary, plus the number of
+                  synchronization 'rounds' and of 'shards'.
+        """
+        context = multiprocessing.get_context()
+        connections, workers = [], []
+        started = time.perf_counter()
+        for shard in range(self.shard_count):
+            parent, child = context.Pipe()
+            worker = context.Process(
+                target=_run_shard,
+                args=(child, self.graph, self.shard_of, shard, self.options),
+                daemon=True,
+            )
+            worker.start()
+            connections.append(parent)
+            workers.append(worker)
+
+        try:
+            if self._status:
+                for connection in connections:
+                    connection.send(("status", self._status))
+            inbound = self._pending
+            self._pending = [[] for _ in range(self.shard_count)]
+            next_times = [INF] * self.shard_count
+            for shard, entries in enumerate(inbound):
+                next_times[shard] = min([entry[0] for entry in entries], default=INF)
+            for at, _, _ in self._status:
+                next_times = [min(t, at) for t in next_times]
+
+            rounds = 0
+            while True:
+                now = min(next_times)
+                if now == INF:
+                    break
+                # With a zero lookahead the window still covers `now` itself.
+                until = max(now + self.lookahead, math.nextafter(now, INF))
+                for shard, connection in enumerate(connections):
+                    if inbound[shard]:
+                        connection.send(("admit", inbound[shard]))
+                    connection.send(("advance", until))
+                inbound = [[] for _ in range(self.shard_count)]
+                outboxes = []
+                for shard, connection in enumerate(connections):
+                    outbox, next_times[shard], delivered, dropped = connection.recv()
+                    outboxes.append(outbox)
+                    self.delivered.extend(delivered)
+                    self.dropped.extend(dropped)
+                for entry in (entry for outbox in outboxes for entry in outbox):
+                    target = self.shard_of[entry[1]]
+                    inbound[target].append(entry)
+                    if entry[0] < next_times[target]:
+                        next_times[target] = entry[0]
+                rounds += 1
+
+            shard_stats = []
+            for connection in connections:
+                connection.send(("stop",))
+                shard_stats.append(connection.recv())
+        finally:
+            for worker in workers:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+
+        self.delivered.sort(key=lambda item: item[1])
+        self.dropped.sort(key=lambda item: item[1])
+        stats = self._merge(shard_stats, time.perf_counter() - started)
+        if reporter is not None:
+            self._report(reporter)
+        self.delivered = [(self._keys[key], at) for key, at in self.delivered]
+        self.dropped = [
+            (self._keys[key], at, reason) for key, at, reason in self.dropped
+        ]
+        summary = stats.summary()
+        summary["rounds"] = rounds
+        summary["shards"] = self.shard_count
+        return summary
+
+    def _merge(self, shard_stats, wall_seconds):
+        """Combines the per-shard counters into one SimulationStats."""
+        merged = SimulationStats()
+        for stats in shard_stats:
+            merged.events += stats.events
+            merged.delivered += stats.delivered
+            for reason, count in stats.dropped.items():
+                merged.dropped[reason] += count
+            merged.sim_time = max(merged.sim_time, stats.sim_time)
+            merged.max_queue_length = max(
+                merged.max_queue_length, stats.max_queue_length
+            )
+            merged.transit_times.extend(stats.transit_times)
+            merged.queueing_delays.extend(stats.queueing_delays)
+        merged.injected = len(self._keys)
+        merged.wall_seconds = wall_seconds
+        return merged
+
+    def _report(self, reporter):
+        """Hands every message outcome to `reporter` in simulated time order."""
+        get_node, keys, sent_at = self.network.get_node, self._keys, self._sent_at
+        outcomes = [(key, at, True, None) for key, at in self.delivered]
+        outcomes.extend((key, at, False, reason) for key, at, reason in self.dropped)
+        outcomes.sort(key=lambda item: item[1])
+        reporter.log_transits(
+            [
+                (
+                    get_node(keys[key].source_id),
+                    get_node(keys[key].destination_id),
+                    success,
+                    at,
+                    at - sent_at[key],
+                    reason,
+                )
+                for key, at, success, reason in outcomes
+            ]
+        )
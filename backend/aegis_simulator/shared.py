@@ -0,0 +1,281 @@
+# backend/aegis_simulator/shared.py
+
+import mmap
+import os
+import struct
+import sys
+import threading
+import weakref
+from collections import namedtuple
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; shared topologies are POSIX only.
+    fcntl = None
+
+from .snapshot import read_layout, read_strings
+
+# The state file holds everything workers may change: a header, the change
+# counter, the status bitmap, the link latencies and a ring of recent
+# changes, each section starting on an 8-byte boundary.
+STATE_MAGIC = b"AEGISSHM"
+# magic, snapshot size and modification time, node count, half-link count,
+# change ring capacity; the change counter follows at _VERSION_OFFSET.
+_STATE_HEADER = struct.Struct("<8sqqqqq")
+_VERSION_OFFSET = _STATE_HEADER.size
+_ACTIVE_OFFSET = _VERSION_OFFSET + 8
+# version, writer process ID, kind, node index, other node index (or -1),
+# old and new value: the latency, or for a status change 1.0 for online
+_CHANGE = struct.Struct("<qqqqqdd")
+
+Change = namedtuple("Change", "version pid kind i j old new")
+
+
+def _aligned(length):
+    return length + (-length % 8)
+
+
+class SharedTopology:
+    """A network topology shared by every process on the machine.
+
+    The adjacency comes from a snapshot file (see `Network.write_snapshot`)
+    that is memory-mapped read-only, so any number of worker processes use
+    one copy of it in the page cache. Node statuses and link latencies live
+    in a second, writable memory-mapped state file next to it. A write takes
+    an exclusive file lock, updates the value, appends it to a ring of
+    recent changes and then bumps a shared change counter. Readers never
+    lock to read values; they compare the counter with the last one they
+    saw and replay the ring to learn what changed (see
+    `Network.sync_shared`).
+
+    The state file is created from the snapshot by the first process to
+    open it, and recreated whenever the snapshot file changes; restart all
+    processes after replacing the snapshot.
+
+    Attributes:
+        STATUS (int): The kind of a node status change.
+        LATENCY (int): The kind of a link latency change.
+        snapshot_path (str): The memory-mapped snapshot file.
+        state_path (str): The memory-mapped state file.
+        node_count (int): The number of nodes.
+        ids (list): Node IDs, by index.
+        names (list): Node names, by index.
+        offsets (memoryview): CSR row offsets, read-only.
+        targets (memoryview): Neighbor indices, read-only.
+        active (memoryview): The shared status bitmap.
+        latencies (memoryview): The shared link latencies.
+    """
+
+    STATUS = 0
+    LATENCY = 1
+
+    def __init__(self, snapshot_path, state_path=None, ring_size=65536):
+        """Maps a snapshot and its state file, creating the state if needed.
+
+        Args:
+            snapshot_path (str): A file written by `Network.write_snapshot`.
+            state_path (str, optional): The state file. Defaults to the
+                snapshot path with ".state" appended.
+            ring_size (int, optional): How many recent changes are kept for
+                readers to catch up from. Defaults to 65536.
+
+        Raises:
+            OSError: If the platform lacks file locking or is big-endian.
+            ValueError: If the snapshot file is not valid.
+        """
+        if fcntl is None or sys.byteorder != "little":
+            raise OSError("Shared topologies need a little-endian POSIX system")
+        self.snapshot_path = snapshot_path
+        self.state_path = state_path or f"{snapshot_path}.state"
+        with open(snapshot_path, "rb") as f:
+            self._snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            stat = os.fstat(f.fileno())
+        data = self._data = memoryview(self._snapshot)
+        layout = read_layout(data, snapshot_path)
+        self.node_count = layout.node_count
+        self.ids, self.names = read_strings(data, layout)
+        self.offsets = data[slice(*layout.offsets)].cast("q")
+        self.targets = data[slice(*layout.targets)].cast(layout.target_code)
+
+        n, half_links = layout.node_count, layout.half_links
+        latency_bytes = layout.latencies[1] - layout.latencies[0]
+        latencies_offset = _ACTIVE_OFFSET + _aligned(n)
+        ring_offset = latencies_offset + _aligned(latency_bytes)
+        size = ring_offset + ring_size * _CHANGE.size
+        header = _STATE_HEADER.pack(
+            STATE_MAGIC, stat.st_size, stat.st_mtime_ns, n, half_links, ring_size
+        )
+        descriptor = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._file = os.fdopen(descriptor, "r+b")
+        self._thread_lock = threading.Lock()
+        with self._locked():
+            self._file.seek(0)
+            if (
+                self._file.read(len(header)) != header
+                or os.fstat(self._file.fileno()).st_size != size
+            ):
+                self._initialize(header, size, data, layout, latencies_offset)
+        self._state = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_WRITE)
+        state = self._state_data = memoryview(self._state)
+        self._version = state[_VERSION_OFFSET:_ACTIVE_OFFSET].cast("q")
+        self.active = state[_ACTIVE_OFFSET : _ACTIVE_OFFSET + n]
+        self.latencies = state[
+            latencies_offset : latencies_offset + latency_bytes
+        ].cast(layout.latency_code)
+        self._ring = state[ring_offset:size]
+        self._ring_size = ring_size
+
+        # File locks belong to the open file, which a forked child (e.g. a
+        # gunicorn worker of a preloaded app) would share with its parent,
+        # so each child opens the state file again.
+        reference = weakref.ref(self)
+
+        def reopen_in_child():
+            topology = reference()
+            if topology is not None:
+                topology._reopen()
+
+        os.register_at_fork(after_in_child=reopen_in_child)
+
+    def _reopen(self):
+        self._file = os.fdopen(os.open(self.state_path, os.O_RDWR), "r+b")
+        self._thread_lock = threading.Lock()
+
+    def _initialize(self, header, size, data, layout, latencies_offset):
+        """Writes a fresh state file from the snapshot's values."""
+        f = self._file
+        f.truncate(0)
+        f.truncate(size)
+        f.seek(0)
+        f.write(header)
+        f.seek(_ACTIVE_OFFSET)
+        f.write(data[slice(*layout.active)])
+        f.seek(latencies_offset)
+        f.write(data[slice(*layout.latencies)])
+        f.flush()
+
+    @contextmanager
+    def _locked(self, shared=False):
+        """Holds the lock on the state file, against threads and processes."""
+        with self._thread_lock:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        """Unmaps both files. The memoryviews handed out become unusable."""
+        for view in (
+            self.offsets,
+            self.targets,
+            self.active,
+            self.latencies,
+            self._version,
+            self._ring,
+            self._data,
+            self._state_data,
+        ):
+            view.release()
+        self._snapshot.close()
+        self._state.close()
+        self._file.close()
+
+    @property
+    def version(self):
+        """int: The number of changes made to the shared state so far."""
+        return self._version[0]
+
+    def _edge_positions(self, i, j):
+        """Returns the positions of the half-links i -> j and j -> i, or None."""
+        offsets, targets = self.offsets, self.targets
+        positions = []
+        for a, b in ((i, j), (j, i)):
+            for k in range(offsets[a], offsets[a + 1]):
+                if targets[k] == b:
+                    positions.append(k)
+                    break
+            else:
+                return None
+        return positions
+
+    def _record(self, kind, i, j=-1, old=0.0, new=0.0):
+        """Appends a change to the ring and publishes it; call with the lock."""
+        version = self._version[0] + 1
+        slot = (version % self._ring_size) * _CHANGE.size
+        _CHANGE.pack_into(
+            self._ring,
+            slot,
+            version,
+            os.getpid(),
+            kind,
+            i,
+            j,
+            old,
+            new,
+        )
+        # The counter is written last, so a reader that sees it also sees
+        # the change.
+        self._version[0] = version
+        return version
+
+    def set_active(self, i, is_active):
+        """Sets the shared status of the node at index `i`.
+
+        Returns:
+            int: The change counter after this change.
+        """
+        with self._locked():
+            self.active[i] = 1 if is_active else 0
+            return self._record(self.STATUS, i, new=1.0 if is_active else 0.0)
+
+    def set_latency(self, i, j, latency):
+        """Sets the shared latency of the link between nodes `i` and `j`.
+
+        Args:
+            i (int): The index of the first node.
+            j (int): The index of the second node.
+            latency (int): The new latency; must be an integer if the
+                snapshot stored integer latencies.
+
+        Returns:
+            int: The change counter after this change, or None if the nodes
+                 are not linked.
+
+        Raises:
+            ValueError: If `latency` cannot be stored in the latency array.
+        """
+        if self.latencies.format == "q" and not isinstance(latency, int):
+            raise ValueError("This shared topology stores integer latencies")
+        positions = self._edge_positions(i, j)
+        if positions is None:
+            return None
+        with self._locked():
+            old_latency = self.latencies[positions[0]]
+            for k in positions:
+                self.latencies[k] = latency
+            return self._record(self.LATENCY, i, j, old_latency, latency)
+
+    def changes_since(self, version):
+        """Returns the changes made after `version`, oldest first.
+
+        Args:
+            version (int): A change counter value seen earlier.
+
+        Returns:
+            list: Change tuples, or None if the ring no longer holds all of
+                  them and the caller must resynchronize in full.
+        """
+        with self._locked(shared=True):
+            current = self._version[0]
+            if current - version > self._ring_size or version > current:
+                return None
+            return [
+                Change(
+                    *_CHANGE.unpack_from(
+                        self._ring, (expected % self._ring_size) * _CHANGE.size
+                    )
+                )
+                for expected in range(version + 1, current + 1)
+            ]
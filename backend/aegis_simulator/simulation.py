@@ -0,0 +1,363 @@
+# backend/aegis_simulator/simulation.py
+
+import heapq
+import time
+from array import array
+
+from .graph import INF
+
+# Event kinds. Events are plain tuples (time, sequence, kind, a, b) so that
+# the heap compares them without any Python-level __lt__ calls.
+ARRIVE = 0
+DEPART = 1
+FAIL = 2
+RECOVER = 3
+
+
+class SimulationStats:
+    """Counters collected by a Simulation run.
+
+    Times are in simulated milliseconds, matching link latencies.
+
+    Attributes:
+        events (int): The number of events processed.
+        injected (int): The number of messages sent into the network.
+        delivered (int): The number of messages that reached their destination.
+        dropped (dict): Dropped message counts keyed by reason ("node_offline",
+                        "queue_full", "no_route" or "hop_limit").
+        sim_time (float): The simulated time of the last processed event.
+        wall_seconds (float): The wall-clock time spent inside `run`.
+        max_queue_length (int): The longest queue seen at any node.
+        transit_times (array): End-to-end time of each delivered message.
+        queueing_delays (array): Total time each delivered message spent
+                                 waiting in node queues.
+    """
+
+    def __init__(self):
+        """Initializes all counters to zero."""
+        self.events = 0
+        self.injected = 0
+        self.delivered = 0
+        self.dropped = dict.fromkeys(
+            ("node_offline", "queue_full", "no_route", "hop_limit"), 0
+        )
+        self.sim_time = 0.0
+        self.wall_seconds = 0.0
+        self.max_queue_length = 0
+        self.transit_times = array("d")
+        self.queueing_delays = array("d")
+
+    @staticmethod
+    def _percentile(values, fraction):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self):
+        """Returns the headline numbers of the run as a dictionary.
+
+        Returns:
+            dict: Message counts, throughput in delivered messages per
+                  simulated second, events per wall-clock second, and mean,
+                  median and 99th percentile transit and queueing delays.
+        """
+        delays, transits = self.queueing_delays, self.transit_times
+        return {
+            "events": self.events,
+            "injected": self.injected,
+            "delivered": self.delivered,
+            "dropped": dict(self.dropped),
+            "sim_time_ms": self.sim_time,
+            "wall_seconds": self.wall_seconds,
+            "throughput_per_sim_second": (
+                self.delivered / (self.sim_time / 1000.0) if self.sim_time else None
+            ),
+            "events_per_wall_second": (
+                self.events / self.wall_seconds if self.wall_seconds else None
+            ),
+            "max_queue_length": self.max_queue_length,
+            "transit_ms": {
+                "mean": sum(transits) / len(transits) if transits else None,
+                "p50": self._percentile(transits, 0.5),
+                "p99": self._percentile(transits, 0.99),
+            },
+            "queueing_delay_ms": {
+                "mean": sum(delays) / len(delays) if delays else None,
+                "p50": self._percentile(delays, 0.5),
+                "p99": self._percentile(delays, 0.99),
+            },
+        }
+
+
+class Simulation:
+    """A discrete-event simulation of messages moving through a Network.
+
+    Unlike `Network.route_message`, which delivers instantly, a Simulation
+    moves each message hop by hop. A message arriving at a node waits in
+    that node's FIFO queue, is forwarded after `service_time`, and reaches
+    the next hop after the link latency. The next hop is looked up at every
+    node from shortest-path trees rooted at each destination, so messages
+    in flight route around nodes that fail during the run.
+
+    The simulation works on a private copy of the node status bitmap:
+    scheduled failures and recoveries never touch the live Network. No
+    logging happens per event; results are collected in `stats`.
+
+    A Simulation can also run one shard of a larger network (see
+    aegis_simulator.sharding): it then only holds events for the nodes it
+    owns and puts messages bound for other shards in `outbox` instead of
+    its own event queue.
+
+    Attributes:
+        network (Network): The network being simulated, or None for a shard
+                           running on a detached graph.
+        now (float): The current simulated time in milliseconds.
+        stats (SimulationStats): Counters for the run so far.
+        delivered (list): (Message, arrival time) pairs for delivered messages.
+        dropped (list): (Message, drop time, reason) triples for lost messages.
+        outbox (list): Messages handed over to other shards, as tuples of
+                       (arrival time, node, destination, start time, time
+                       queued, hops, message).
+    """
+
+    def __init__(
+        self,
+        network,
+        service_time=0.0,
+        queue_capacity=None,
+        realtime_ratio=None,
+        max_hops=None,
+        graph=None,
+        shard_of=None,
+        shard=0,
+    ):
+        """Initializes a new Simulation over the current state of `network`.
+
+        Args:
+            network (Network): The network to simulate.
+            service_time (float, optional): The time in milliseconds a node
+                takes to forward one message. Defaults to 0 (no queueing).
+            queue_capacity (int, optional): The maximum number of messages
+                waiting at a node; arrivals beyond it are dropped. Defaults to
+                None (unbounded).
+            realtime_ratio (float, optional): Simulated seconds per wall-clock
+                second. Defaults to None, which runs as fast as possible.
+            max_hops (int, optional): Messages are dropped after this many
+                hops. Defaults to the number of nodes.
+            graph (CompactGraph, optional): The graph to simulate on instead
+                of `network.compact_graph()`.
+            shard_of (array, optional): The shard number of every node.
+                Defaults to None, meaning this simulation owns every node.
+            shard (int, optional): The shard this simulation runs.
+        """
+        self.network = network
+        self.graph = graph if graph is not None else network.compact_graph()
+        self.service_time = service_time
+        self.queue_capacity = queue_capacity
+        self.realtime_ratio = realtime_ratio
+        self.max_hops = max_hops if max_hops is not None else len(self.graph)
+        self.now = 0.0
+        self.stats = SimulationStats()
+        self.delivered = []
+        self.dropped = []
+        self.outbox = []
+        self.shard_of = shard_of
+        self.shard = shard
+
+        n = len(self.graph)
+        self._active = bytearray(self.graph.active)
+        self._busy_until = [0.0] * n
+        self._queued = array("q", [0]) * n
+        self._trees = {}
+        self._events = []
+        self._sequence = 0
+        # Per-message state, indexed by the message's slot number.
+        self._messages = []
+        self._destinations = array("q")
+        self._started = array("d")
+        self._waited = array("d")
+        self._hops = array("q")
+
+    def _push(self, at, kind, a, b=-1):
+        self._sequence += 1
+        # Status changes sort ahead of message events at the same instant, so
+        # the outcome does not depend on the order events were scheduled in.
+        sequence = -self._sequence if kind >= FAIL else self._sequence
+        heapq.heappush(self._events, (at, sequence, kind, a, b))
+
+    def send(self, message, at=None):
+        """Schedules `message` to enter the network at its source node.
+
+        Args:
+            message (Message): The message to send.
+            at (float, optional): The simulated injection time. Defaults to now.
+
+        Returns:
+            bool: True if the message was scheduled, False if either endpoint
+                  is not part of the network.
+        """
+        index = self.graph.index
+        source = index.get(message.source_id)
+        destination = index.get(message.destination_id)
+        if source is None or destination is None:
+            return False
+        at = self.now if at is None else at
+        self.stats.injected += 1
+        self.accept(at, source, destination, at, 0.0, 0, message)
+        return True
+
+    def accept(self, at, node, destination, started, waited, hops, message):
+        """Schedules a message, possibly already in transit, to arrive at `node`.
+
+        Used by `send` and to hand over messages from other shards; the
+        arguments are those of an `outbox` entry.
+        """
+        slot = len(self._messages)
+        self._messages.append(message)
+        self._destinations.append(destination)
+        self._started.append(started)
+        self._waited.append(waited)
+        self._hops.append(hops)
+        self._push(at, ARRIVE, slot, node)
+
+    def next_event_time(self):
+        """Returns the time of the earliest pending event, or float('inf')."""
+        return self._events[0][0] if self._events else INF
+
+    def schedule_failure(self, node_id, at):
+        """Schedules the node `node_id` to go offline at simulated time `at`."""
+        self._push(at, FAIL, self.graph.index[node_id])
+
+    def schedule_recovery(self, node_id, at):
+        """Schedules the node `node_id` to come back online at time `at`."""
+        self._push(at, RECOVER, self.graph.index[node_id])
+
+    def pending(self):
+        """Returns the number of events still waiting to be processed."""
+        return len(self._events)
+
+    def _next_hop(self, node, destination):
+        """Returns (next hop, link latency) toward `destination`, or (-1, inf)."""
+        tree = self._trees.get(destination)
+        if tree is None:
+            tree = self.graph.shortest_path_tree(destination, active=self._active)
+            self._trees[destination] = tree
+        hop = tree.prev[node]
+        if hop < 0:
+            return -1, INF
+        return hop, tree.dist[node] - tree.dist[hop]
+
+    def run(self, until=None, max_events=None, before=None):
+        """Processes events in time order.
+
+        Args:
+            until (float, optional): Stop before the first event later than
+                this simulated time. Defaults to None (run to completion).
+            max_events (int, optional): Stop after this many events.
+            before (float, optional): Stop before the first event at or
+                after this simulated time. Defaults to None.
+
+        Returns:
+            SimulationStats: The counters accumulated so far.
+        """
+        events, stats = self._events, self.stats
+        heappop = heapq.heappop
+        active, busy_until, queued = self._active, self._busy_until, self._queued
+        destinations, started, waited = self._destinations, self._started, self._waited
+        service, capacity = self.service_time, self.queue_capacity
+        ratio = self.realtime_ratio
+        processed = 0
+        wall_start = time.perf_counter()
+        sim_start = self.now
+
+        while events:
+            if until is not None and events[0][0] > until:
+                break
+            if before is not None and events[0][0] >= before:
+                break
+            if max_events is not None and processed >= max_events:
+                break
+            at, _, kind, a, b = heappop(events)
+            if ratio:
+                due = (at - sim_start) / 1000.0 / ratio
+                lag = due - (time.perf_counter() - wall_start)
+                if lag > 0:
+                    time.sleep(lag)
+            self.now = at
+            processed += 1
+
+            if kind == ARRIVE:
+                slot, node = a, b
+                if not active[node]:
+                    self._drop(slot, at, "node_offline")
+                    continue
+                if node == destinations[slot]:
+                    stats.delivered += 1
+                    stats.transit_times.append(at - started[slot])
+                    stats.queueing_delays.append(waited[slot])
+                    self.delivered.append((self._messages[slot], at))
+                    continue
+                if not service:
+                    self._forward(slot, node, at)
+                    continue
+                if capacity is not None and queued[node] >= capacity:
+                    self._drop(slot, at, "queue_full")
+                    continue
+                start = busy_until[node] if busy_until[node] > at else at
+                busy_until[node] = start + service
+                waited[slot] += start - at
+                queued[node] += 1
+                if queued[node] > stats.max_queue_length:
+                    stats.max_queue_length = queued[node]
+                self._push(start + service, DEPART, slot, node)
+            elif kind == DEPART:
+                queued[b] -= 1
+                if not active[b]:
+                    self._drop(a, at, "node_offline")
+                    continue
+                self._forward(a, b, at)
+            elif kind == FAIL:
+                if active[a]:
+                    active[a] = 0
+                    self._trees.clear()
+            elif kind == RECOVER:
+                if not active[a]:
+                    active[a] = 1
+                    self._trees.clear()
+
+        stats.events += processed
+        stats.sim_time = self.now
+        stats.wall_seconds += time.perf_counter() - wall_start
+        return stats
+
+    def _drop(self, slot, at, reason):
+        """Records that the message in `slot` was lost at time `at`."""
+        self.stats.dropped[reason] += 1
+        self.dropped.append((self._messages[slot], at, reason))
+
+    def _forward(self, slot, node, at):
+        """Sends the message in `slot` from `node` to its next hop."""
+        hops = self._hops
+        if hops[slot] >= self.max_hops:
+            self._drop(slot, at, "hop_limit")
+            return
+        hop, latency = self._next_hop(node, self._destinations[slot])
+        if hop < 0:
+            self._drop(slot, at, "no_route")
+            return
+        hops[slot] += 1
+        if self.shard_of is not None and self.shard_of[hop] != self.shard:
+            self.outbox.append(
+                (
+                    at + latency,
+                    hop,
+                    self._destinations[slot],
+                    self._started[slot],
+                    self._waited[slot],
+                    hops[slot],
+                    self._messages[slot],
+                )
+            )
+            return
+        self._push(at + latency, ARRIVE, slot, hop)
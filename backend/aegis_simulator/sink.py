@@ -0,0 +1,395 @@
+# backend/aegis_simulator/sink.py
+
+import abc
+import csv
+import gzip
+import io
+import logging
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+from .events import EventRecord, format_timestamp, render
+
+# Columns of the CSV format: the union of the keys of every event type.
+CSV_FIELDS = (
+    "timestamp",
+    "event_type",
+    "details",
+    "status",
+    "path_taken",
+    "sim_time_ms",
+    "total_latency_ms",
+)
+
+# The binary format is a magic header followed by tagged records. Strings
+# (event types, node names, drop reasons) are defined once per file and
+# referred to by number afterwards, so each file can be read on its own.
+BINARY_MAGIC = b"AEGISEV1"
+_STRING = struct.Struct("<BIH")  # tag, string number, byte length
+_EVENT = struct.Struct("<BdiiibddiH")  # tag, fields..., path length
+_STRING_TAG = 0
+_EVENT_TAG = 1
+
+FORMATS = ("csv", "binary")
+
+
+class BatchWriter(abc.ABC):
+    """Base class for sinks that persist events from a background thread.
+
+    Register a sink with `Reporter.add_sink`. Logging only hands the events
+    to an in-memory queue; a writer thread drains it in batches every
+    `flush_interval` seconds, or sooner once `batch_size` events are
+    waiting. Subclasses implement `_write(records)`, called on the writer
+    thread with each batch, and may override `_finish()`, called on the
+    writer thread after the last batch. They call `_start()` once they are
+    ready to receive batches.
+
+    A batch whose write fails (disk full, I/O error) is logged and dropped,
+    and the writer goes on with the next one. Should the writer thread stop
+    anyway, later events are dropped instead of queued, so memory use stays
+    bounded either way.
+
+    Attributes:
+        dropped (int): The number of events that were never written.
+    """
+
+    def __init__(self, flush_interval=1.0, batch_size=1000):
+        """Initializes the queue; the thread is started by `_start`.
+
+        Args:
+            flush_interval (float, optional): The longest time in seconds an
+                event waits in memory. Defaults to 1.0.
+            batch_size (int, optional): Wake the writer early once this many
+                events are waiting. Defaults to 1000.
+        """
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._pending = deque()
+        self._submitted = 0
+        self._processed = 0
+        self.dropped = 0
+        self._progress = threading.Condition()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _start(self):
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, records):
+        """Queues EventRecords for writing; never blocks on disk I/O."""
+        if self._closed:
+            return
+        with self._progress:
+            if self._thread.ident is not None and not self._thread.is_alive():
+                self.dropped += len(records)
+                return
+            self._pending.extend(records)
+            self._submitted += len(records)
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self, timeout=None):
+        """Waits until everything submitted so far is written or dropped.
+
+        Args:
+            timeout (float, optional): The longest time to wait in seconds.
+
+        Returns:
+            bool: True if the queue was drained in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._progress:
+            target = self._submitted
+            while self._processed < target and self._thread.is_alive():
+                self._wake.set()
+                wait = 0.05
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return False
+                self._progress.wait(wait)
+            return self._processed >= target
+
+    def close(self):
+        """Writes out the remaining events and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        pending = self._pending
+        try:
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                batch = []
+                while pending:
+                    batch.append(pending.popleft())
+                if batch:
+                    failed = False
+                    try:
+                        self._write(batch)
+                    except Exception as e:
+                        failed = True
+                        logging.error(
+                            f"{type(self).__name__} dropped {len(batch)} events: {e}"
+                        )
+                    with self._progress:
+                        if failed:
+                            self.dropped += len(batch)
+                        self._processed += len(batch)
+                        self._progress.notify_all()
+                if self._closed and not pending:
+                    break
+        finally:
+            self._finish()
+
+    @abc.abstractmethod
+    def _write(self, records):
+        """Persists a batch of EventRecords; called on the writer thread."""
+
+    def _finish(self):
+        pass
+
+
+class ReportSink(BatchWriter):
+    """Appends logged events to report files from a background thread.
+
+    See BatchWriter for how events are queued and batched. Files are named
+    `<prefix>-<number>.<csv|bin>[.gz]` inside `directory` and are rotated
+    when they reach `max_bytes` or are older than `rotate_interval`
+    seconds. Every file starts with its own CSV header or binary string
+    table, so rotated files can be read on their own; see `read_binary`.
+
+    Attributes:
+        directory (str): Where report files are written.
+        format (str): "csv" or "binary".
+        compress (bool): Whether files are gzip-compressed.
+        files (list): Paths of the files written so far, oldest first.
+    """
+
+    def __init__(
+        self,
+        directory,
+        prefix="events",
+        format="csv",
+        compress=False,
+        max_bytes=None,
+        rotate_interval=None,
+        flush_interval=1.0,
+        batch_size=1000,
+    ):
+        """Creates the output directory and starts the writer thread.
+
+        Args:
+            directory (str): Where report files are written.
+            prefix (str, optional): The file name prefix. Defaults to "events".
+            format (str, optional): "csv" or "binary". Defaults to "csv".
+            compress (bool, optional): Gzip the files. Defaults to False.
+            max_bytes (int, optional): Rotate once this many uncompressed
+                bytes have been written to a file. Defaults to None.
+            rotate_interval (float, optional): Rotate files older than this
+                many seconds. Defaults to None.
+            flush_interval (float, optional): The longest time in seconds an
+                event waits in memory. Defaults to 1.0.
+            batch_size (int, optional): Wake the writer early once this many
+                events are waiting. Defaults to 1000.
+
+        Raises:
+            ValueError: If `format` is not one of FORMATS.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown report format '{format}'")
+        super().__init__(flush_interval, batch_size)
+        self.directory = directory
+        self.prefix = prefix
+        self.format = format
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.files = []
+        self._file = None
+        self._record_bytes = 64
+        os.makedirs(directory, exist_ok=True)
+        self._start()
+
+    def _finish(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        extension = "csv" if self.format == "csv" else "bin"
+        path = os.path.join(
+            self.directory,
+            f"{self.prefix}-{len(self.files) + 1:06d}.{extension}"
+            + (".gz" if self.compress else ""),
+        )
+        self._file = (gzip.open if self.compress else open)(path, "wb")
+        self._opened_at = time.monotonic()
+        self._written = 0
+        self._strings = {}
+        self.files.append(path)
+        header = (
+            self._csv_bytes([dict(zip(CSV_FIELDS, CSV_FIELDS))])
+            if self.format == "csv"
+            else BINARY_MAGIC
+        )
+        self._emit(header)
+
+    def _should_rotate(self):
+        if self.max_bytes is not None and self._written >= self.max_bytes:
+            return True
+        return (
+            self.rotate_interval is not None
+            and time.monotonic() - self._opened_at >= self.rotate_interval
+        )
+
+    def _emit(self, data):
+        self._file.write(data)
+        self._written += len(data)
+
+    def _write(self, records):
+        encode = self._csv_bytes if self.format == "csv" else self._binary_bytes
+        start = 0
+        while start < len(records):
+            if self._file is None or self._should_rotate():
+                if self._file is not None:
+                    self._file.close()
+                self._open()
+            end = len(records)
+            if self.max_bytes is not None:
+                # Size the chunk from the average record size seen so far, so
+                # that files end close to `max_bytes` even for large batches.
+                room = max(1, self.max_bytes - self._written)
+                end = min(end, start + max(1, room // self._record_bytes))
+            data = encode(records[start:end])
+            self._emit(data)
+            self._record_bytes = max(1, len(data) // (end - start))
+            start = end
+        self._file.flush()
+
+    @staticmethod
+    def _csv_bytes(rows):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(
+            buffer, fieldnames=CSV_FIELDS, extrasaction="ignore", restval=""
+        )
+        stamp_second, stamp = None, ""
+        for row in rows:
+            if isinstance(row, EventRecord):
+                second = int(row.timestamp)
+                if second != stamp_second:
+                    stamp_second, stamp = second, format_timestamp(second)
+                row = render(row, stamp)
+            writer.writerow(row)
+        return buffer.getvalue().encode("utf-8")
+
+    def _string_number(self, value, out):
+        """Returns the number of `value`, defining it in this file if new."""
+        if value is None:
+            return -1
+        number = self._strings.get(value)
+        if number is None:
+            number = self._strings[value] = len(self._strings)
+            data = value.encode("utf-8")
+            out.append(_STRING.pack(_STRING_TAG, number, len(data)))
+            out.append(data)
+        return number
+
+    def _binary_bytes(self, records):
+        out = []
+        string = self._string_number
+        for record in records:
+            path = [string(name, out) for name in record.path or ()]
+            kind = string(record.event_type, out)
+            source = string(record.source, out)
+            dest = string(record.destination, out)
+            reason = string(record.reason, out)
+            out.append(
+                _EVENT.pack(
+                    _EVENT_TAG,
+                    record.timestamp,
+                    kind,
+                    source,
+                    dest,
+                    record.status,
+                    record.latency,
+                    record.sim_time,
+                    reason,
+                    len(path),
+                )
+            )
+            if path:
+                out.append(struct.pack(f"<{len(path)}i", *path))
+        return b"".join(out)
+
+
+def read_binary(path):
+    """Reads back a file written by a ReportSink in the binary format.
+
+    Args:
+        path (str): The file to read; a ".gz" suffix means gzip-compressed.
+
+    Yields:
+        EventRecord: The events in the order they were logged.
+
+    Raises:
+        ValueError: If the file is not a binary event report.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(BINARY_MAGIC):
+        raise ValueError(f"'{path}' is not a binary event report")
+    strings = {-1: None}
+    position = len(BINARY_MAGIC)
+    while position < len(data):
+        if data[position] == _STRING_TAG:
+            _, number, length = _STRING.unpack_from(data, position)
+            position += _STRING.size
+            strings[number] = data[position : position + length].decode("utf-8")
+            position += length
+            continue
+        (
+            _,
+            timestamp,
+            kind,
+            source,
+            dest,
+            status,
+            latency,
+            sim_time,
+            reason,
+            path_length,
+        ) = _EVENT.unpack_from(data, position)
+        position += _EVENT.size
+        path = None
+        if path_length:
+            numbers = struct.unpack_from(f"<{path_length}i", data, position)
+            position += 4 * path_length
+            path = tuple(strings[n] for n in numbers)
+        yield EventRecord(
+            timestamp,
+            strings[kind],
+            strings[source],
+            strings[dest],
+            status,
+            latency,
+            sim_time,
+            path,
+            strings[reason],
+        )
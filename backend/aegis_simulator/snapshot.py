@@ -0,0 +1,198 @@
+# backend/aegis_simulator/snapshot.py
+
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+# A snapshot is a fixed header followed by the compact graph's arrays and
+# the node IDs and names, each section starting on an 8-byte boundary.
+# Everything is little-endian, whatever machine wrote it.
+SNAPSHOT_MAGIC = b"AEGISNET"
+SNAPSHOT_VERSION = 1
+# magic, format version, target and latency typecodes, node count,
+# half-link count, byte lengths of the ID and name tables
+_HEADER = struct.Struct("<8sHcc4xqqqq")
+# Separates the entries of the ID and name tables.
+_SEPARATOR = "\0"
+
+Snapshot = namedtuple("Snapshot", "ids names active offsets targets latencies")
+# Typecodes, sizes and the (start, end) byte range of each section.
+SnapshotLayout = namedtuple(
+    "SnapshotLayout",
+    "target_code latency_code node_count half_links"
+    " active offsets targets latencies ids names",
+)
+
+
+def _padding(length):
+    return b"\0" * (-length % 8)
+
+
+def _typecode(values):
+    """Returns the typecode of an array or of a memoryview cast like one."""
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def _little_endian(values):
+    """Returns the bytes of an array or memoryview in little-endian order."""
+    if sys.byteorder == "big":
+        values = array(_typecode(values), values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode, data):
+    """Reads an array from little-endian bytes."""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _string_table(strings, what):
+    for value in strings:
+        if _SEPARATOR in value:
+            raise ValueError(f"A node {what} contains a NUL character: {value!r}")
+    return _SEPARATOR.join(strings).encode("utf-8")
+
+
+def write_snapshot(graph, path):
+    """Writes a compact graph and its nodes' IDs and names to a snapshot file.
+
+    The file is written next to `path` and renamed into place, so readers
+    never see a partly written snapshot.
+
+    Args:
+        graph (CompactGraph): The graph to save; its `nodes` must be Node
+            objects.
+        path (str): The file to write.
+
+    Raises:
+        ValueError: If a node ID or name contains a NUL character.
+    """
+    n = len(graph.nodes)
+    # Four-byte neighbor indices halve the largest section on any network
+    # that fits in memory.
+    targets = graph.targets
+    if n < 2**31 and _typecode(targets) != "i":
+        targets = array("i", targets)
+    ids = _string_table([node.id for node in graph.nodes], "ID")
+    names = _string_table([node.name for node in graph.nodes], "name")
+    sections = [
+        _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_VERSION,
+            _typecode(targets).encode("ascii"),
+            _typecode(graph.latencies).encode("ascii"),
+            n,
+            len(targets),
+            len(ids),
+            len(names),
+        ),
+        bytes(graph.active),
+        _padding(n),
+        _little_endian(graph.offsets),
+        _little_endian(targets),
+        _padding(len(targets) * targets.itemsize),
+        _little_endian(graph.latencies),
+        ids,
+        _padding(len(ids)),
+        names,
+    ]
+    temporary = f"{path}.tmp{os.getpid()}"
+    with open(temporary, "wb") as f:
+        f.writelines(sections)
+    os.replace(temporary, path)
+
+
+def read_layout(data, path):
+    """Locates the sections of a snapshot held in memory.
+
+    Args:
+        data (memoryview): The whole snapshot file, read or memory-mapped.
+        path (str): The file name, for error messages.
+
+    Returns:
+        SnapshotLayout: The array typecodes, sizes and the (start, end) byte
+                        range of every section.
+
+    Raises:
+        ValueError: If the data is not a snapshot or uses a newer format.
+    """
+    if len(data) < _HEADER.size or data[:8] != SNAPSHOT_MAGIC:
+        raise ValueError(f"'{path}' is not a network snapshot")
+    (
+        _,
+        version,
+        target_code,
+        latency_code,
+        n,
+        half_links,
+        ids_length,
+        names_length,
+    ) = _HEADER.unpack_from(data)
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"'{path}' uses snapshot format {version}")
+    target_code, latency_code = target_code.decode(), latency_code.decode()
+    sections = []
+    position = _HEADER.size
+    for length in (
+        n,
+        8 * (n + 1),
+        array(target_code).itemsize * half_links,
+        array(latency_code).itemsize * half_links,
+        ids_length,
+        names_length,
+    ):
+        sections.append((position, position + length))
+        position += length + (-length % 8)
+    if sections[-1][1] > len(data):
+        raise ValueError(f"'{path}' is truncated")
+    return SnapshotLayout(target_code, latency_code, n, half_links, *sections)
+
+
+def read_snapshot(path):
+    """Reads a snapshot file written by `write_snapshot`.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        Snapshot: The node IDs and names (lists of str), the status bitmap
+                  (bytearray) and the CSR `offsets`, `targets` and
+                  `latencies` arrays, in the layout used by CompactGraph.
+
+    Raises:
+        ValueError: If the file is not a snapshot or uses a newer format.
+    """
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+    layout = read_layout(data, path)
+    return Snapshot(
+        *read_strings(data, layout),
+        bytearray(data[slice(*layout.active)]),
+        _read_array("q", data[slice(*layout.offsets)]),
+        _read_array(layout.target_code, data[slice(*layout.targets)]),
+        _read_array(layout.latency_code, data[slice(*layout.latencies)]),
+    )
+
+
+def read_strings(data, layout):
+    """Decodes the node IDs and names of a snapshot.
+
+    Args:
+        data (memoryview): The whole snapshot file.
+        layout (SnapshotLayout): Its layout, from `read_layout`.
+
+    Returns:
+        tuple: The list of node IDs and the list of node names.
+    """
+    if not layout.node_count:
+        return [], []
+    return tuple(
+        bytes(data[slice(*section)]).decode("utf-8").split(_SEPARATOR)
+        for section in (layout.ids, layout.names)
+    )
@@ -0,0 +1,114 @@
+# backend/aegis_simulator/stream.py
+
+import json
+import queue
+import threading
+
+
+class EventBroadcaster:
+    """Fans out change notifications to any number of streaming clients.
+
+    Every subscriber gets its own bounded queue. Publishing never blocks:
+    if a slow client's queue is full, the client is sent a single "resync"
+    event instead of the backlog, telling it to fetch a fresh snapshot.
+
+    Attributes:
+        max_queue (int): The number of events buffered per subscriber.
+    """
+
+    def __init__(self, max_queue=1000):
+        """Initializes a broadcaster with no subscribers."""
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscriber_count(self):
+        """Returns the number of connected subscribers."""
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self):
+        """Registers a new subscriber.
+
+        Returns:
+            queue.Queue: The queue the subscriber's events are delivered to.
+        """
+        subscriber = queue.Queue(self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Removes a subscriber registered with `subscribe`."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event_type, data):
+        """Sends an event to every subscriber.
+
+        Args:
+            event_type (str): The event name, e.g. "node_status".
+            data (dict): A JSON-serializable payload.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event_type, data))
+            except queue.Full:
+                self._overflow(subscriber)
+
+    @staticmethod
+    def _overflow(subscriber):
+        """Replaces a full subscriber's backlog with a single resync event."""
+        try:
+            while True:
+                subscriber.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            subscriber.put_nowait(("resync", {}))
+        except queue.Full:
+            pass
+
+    def stream(self, heartbeat=15.0):
+        """Yields server-sent event frames for a new subscriber until closed.
+
+        The subscriber is registered when the first frame is requested, not
+        when the generator is created, so a client that disconnects before
+        the response starts never leaves a subscriber behind. A comment
+        frame is sent every `heartbeat` seconds without events so that
+        proxies keep the connection open. The subscriber is removed when the
+        client disconnects and the generator is closed.
+
+        Args:
+            heartbeat (float, optional): Seconds between keep-alive frames.
+
+        Yields:
+            str: Text/event-stream frames.
+        """
+        subscriber = self.subscribe()
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event_type, data = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event_type, data)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def format_sse(event_type, data):
+    """Formats one server-sent event frame.
+
+    Args:
+        event_type (str): The event name.
+        data (dict): A JSON-serializable payload.
+
+    Returns:
+        str: The frame, terminated by a blank line.
+    """
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,115 @@
+# backend/aegis_simulator/view.py
+
+from array import array
+
+from .graph import CompactGraph
+
+
+def _private(values):
+    """Copies an array, or a memoryview of a shared one, into a new array."""
+    return array(getattr(values, "typecode", None) or values.format, values)
+
+
+class NetworkView:
+    """An immutable snapshot of a network's topology at one version.
+
+    A view wraps a CompactGraph whose arrays are never modified once the
+    view is published, so any number of threads can run path queries on it
+    without locks while the Network moves on. Changes are copy-on-write:
+    a status change yields a new view with a new status bitmap, a latency
+    change one with new latencies, and everything else (nodes, index,
+    offsets, targets and the other array) is shared with the previous
+    view.
+
+    Only the topology is frozen. The Node objects are shared with the
+    Network; read statuses through `is_active` or the graph's `active`
+    bitmap rather than `Node.is_active`.
+
+    Attributes:
+        version (int): The Network's `topology_version` this view shows.
+        graph (CompactGraph): The frozen graph.
+    """
+
+    __slots__ = ("version", "graph")
+
+    def __init__(self, version, graph):
+        """Wraps a graph that nobody will modify any more."""
+        self.version = version
+        self.graph = graph
+
+    @classmethod
+    def of(cls, graph, version):
+        """Freezes a copy of a live graph, sharing its immutable parts.
+
+        The status bitmap and latencies, which the Network patches in place,
+        are copied; the nodes, index, offsets and targets are shared.
+
+        Args:
+            graph (CompactGraph): The Network's current compact graph.
+            version (int): The topology version it reflects.
+
+        Returns:
+            NetworkView: The view.
+        """
+        frozen = CompactGraph.from_arrays(
+            graph.nodes,
+            graph.offsets,
+            graph.targets,
+            _private(graph.latencies),
+            bytearray(graph.active),
+            index=graph.index,
+        )
+        frozen.latency_decreases = graph.latency_decreases
+        frozen.metric_version = graph.metric_version
+        return cls(version, frozen)
+
+    def _derive(self, latencies, active):
+        graph = self.graph
+        derived = CompactGraph.from_arrays(
+            graph.nodes,
+            graph.offsets,
+            graph.targets,
+            latencies,
+            active,
+            index=graph.index,
+        )
+        derived.latency_decreases = graph.latency_decreases
+        derived.metric_version = graph.metric_version
+        return derived
+
+    def with_status(self, index, is_active, version):
+        """Returns a new view with the node at `index` online or offline.
+
+        Args:
+            index (int): The compact graph index of the node.
+            is_active (bool): Its new status.
+            version (int): The topology version after the change.
+
+        Returns:
+            NetworkView: The new view; this one is unchanged.
+        """
+        graph = self._derive(self.graph.latencies, bytearray(self.graph.active))
+        graph.set_active(index, is_active)
+        return NetworkView(version, graph)
+
+    def with_latency(self, i, j, latency, version):
+        """Returns a new view with a new latency for the link i - j.
+
+        Args:
+            i (int): The index of the first node.
+            j (int): The index of the second node.
+            latency (int): The new latency.
+            version (int): The topology version after the change.
+
+        Returns:
+            NetworkView: The new view, or None if the nodes are not linked.
+        """
+        graph = self._derive(_private(self.graph.latencies), self.graph.active)
+        if not graph.set_latency(i, j, latency):
+            return None
+        return NetworkView(version, graph)
+
+    def is_active(self, node_id):
+        """Returns the status of a node in this view, or None if unknown."""
+        index = self.graph.index.get(node_id)
+        return None if index is None else bool(self.graph.active[index])
@@ -1,8 +1,34 @@
 # backend/app.py
 
-from flask import Flask, jsonify, render_template, request
+import math
+import os
+import threading
+import time
+
+from flask import Flask, Response, g, jsonify, render_template, request
+from aegis_simulator import metrics
+from aegis_simulator.contingency import ContingencyAnalysis
+from aegis_simulator.distances import encode_rows, stream_header
+from aegis_simulator.eventlog import EventLog
+from aegis_simulator.graphdata import graph_delta, graph_snapshot
 from aegis_simulator.models import Network, Message
+from aegis_simulator.reliability import ReliabilityEstimator
 from aegis_simulator.reporter import Reporter
+from aegis_simulator.shared import SharedTopology
+from aegis_simulator.stream import EventBroadcaster
+
+# The most Monte Carlo trials a reliability request may ask for.
+MAX_RELIABILITY_TRIALS = 200_000
+# The most sampled N-2 scenarios and ranked scenarios a contingency
+# request may ask for.
+MAX_DOUBLE_FAILURES = 10_000
+MAX_CONTINGENCY_LIMIT = 1000
+# The most alternative paths a path request may ask for with `?k=`.
+MAX_K_PATHS = 100
+# The most sources a distance matrix request may cover, and the most
+# latencies it may return as JSON rather than as a binary stream.
+MAX_DISTANCE_SOURCES = 1000
+MAX_DISTANCE_JSON_CELLS = 1_000_000
 
 # Initialize the Flask application.
 # The `__name__` argument helps Flask find static and template files.
@@ -12,12 +38,94 @@ app = Flask(__name__)
 # This section initializes the core Aegis network simulator when the server starts.
 # It's kept in memory for the lifetime of the application.
 print("--- Initializing Aegis Network ---")
+# Instrumentation is on unless AEGIS_METRICS=0; when off, nothing is wrapped.
+if os.environ.get("AEGIS_METRICS", "1") != "0":
+    metrics.enable()
+http_request_seconds = metrics.registry.histogram(
+    "aegis_http_request_seconds",
+    "Time spent handling API requests.",
+    label_names=("route", "method"),
+)
+http_requests_total = metrics.registry.counter(
+    "aegis_http_requests_total",
+    "API requests handled, by status code.",
+    label_names=("route", "method", "status"),
+)
 network_reporter = Reporter()
-network = Network.create_from_config("network_config.yml", reporter=network_reporter)
+# With AEGIS_EVENT_LOG set to a database path, every event is also persisted
+# to an indexed SQLite log for /api/events/search.
+event_log = None
+event_log_path = os.environ.get("AEGIS_EVENT_LOG")
+if event_log_path:
+    event_log = EventLog(event_log_path)
+    network_reporter.add_sink(event_log)
+# A binary snapshot (see Network.write_snapshot) loads much faster than the
+# YAML config and keeps node IDs stable across restarts. With
+# AEGIS_SHARED_TOPOLOGY, every worker process maps the same snapshot and
+# shares node statuses and link latencies with the others.
+snapshot_path = os.environ.get("AEGIS_SNAPSHOT")
+shared_path = os.environ.get("AEGIS_SHARED_TOPOLOGY")
+if shared_path:
+    network = Network.from_shared(
+        SharedTopology(shared_path), reporter=network_reporter
+    )
+elif snapshot_path and os.path.exists(snapshot_path):
+    network = Network.load_snapshot(snapshot_path, reporter=network_reporter)
+else:
+    network = Network.create_from_config(
+        "network_config.yml", reporter=network_reporter
+    )
+# Changes are pushed to dashboards connected to /api/stream as they happen.
+broadcaster = EventBroadcaster()
+network.add_listener(broadcaster.publish)
+network_reporter.add_listener(lambda entry: broadcaster.publish("event", entry))
+metrics.registry.add_collector(metrics.network_collector(network))
+
+
+def sync_shared_topology(interval=0.5):
+    """Picks up changes made by other workers, so /api/stream pushes them."""
+    while True:
+        time.sleep(interval)
+        network.sync_shared()
+
+
+if shared_path:
+    threading.Thread(target=sync_shared_topology, daemon=True).start()
 print("--- Network Ready ---")
 # ---
 
 
+# --- Request Instrumentation ---
+
+
+@app.before_request
+def start_request_timer():
+    """Notes when the request started, if metrics are enabled."""
+    if metrics.is_enabled():
+        g.request_started = time.perf_counter()
+
+
+@app.before_request
+def sync_shared_state():
+    """Applies changes made by other workers to a shared topology first."""
+    network.sync_shared()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Records the request's duration and status code per route."""
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        http_request_seconds.observe(
+            time.perf_counter() - started, (route, request.method)
+        )
+        http_requests_total.inc(
+            labels=(route, request.method, str(response.status_code))
+        )
+    return response
+
+
 # --- API Endpoints ---
 
 
@@ -25,31 +133,26 @@ print("--- Network Ready ---")
 def get_network_graph_data():
     """Provides network data formatted for a graph library like Vis.js.
 
-    This endpoint is polled by the frontend to get the complete, current state
-    of the network for visualization.
+    The frontend loads the complete, current state of the network from this
+    endpoint on startup. Afterwards it passes the version it last saw as
+    `?since=<version>` and only receives what changed since then, read from
+    the network's change journal. A full snapshot is returned instead when
+    the journal no longer reaches back that far, and always with
+    AEGIS_SHARED_TOPOLOGY, where each worker numbers its own versions.
 
     Returns:
-        Response: A JSON object containing two keys: 'nodes' and 'edges'.
-                  Nodes include their ID, label, and color based on status.
-                  Edges include their source, target, and latency label.
+        Response: A JSON object with the current 'version', a 'full' flag,
+                  and 'nodes' and 'edges' lists. Nodes include their ID,
+                  label, and color based on status. Edges include a stable
+                  ID, their source, target, and latency label. Delta
+                  responses ('full' is false) only list changed nodes and
+                  edges, plus the IDs of any that were removed in
+                  'removed_nodes' and 'removed_edges'.
     """
-    nodes, edges, seen_edges = [], [], set()
-    for node in network.nodes.values():
-        nodes.append(
-            {
-                "id": node.id,
-                "label": node.name,
-                "color": "#4ade80" if node.is_active else "#f87171",
-            }
-        )
-        for neighbor, latency in node.neighbors.items():
-            edge_tuple = tuple(sorted((node.id, neighbor.id)))
-            if edge_tuple not in seen_edges:
-                edges.append(
-                    {"from": node.id, "to": neighbor.id, "label": f"{latency}ms"}
-                )
-                seen_edges.add(edge_tuple)
-    return jsonify({"nodes": nodes, "edges": edges})
+    since = request.args.get("since", type=int)
+    if since is None:
+        return jsonify(graph_snapshot(network))
+    return jsonify(graph_delta(network, since))
 
 
 @app.route("/api/nodes")
@@ -70,21 +173,313 @@ def get_node_names():
 def find_path():
     """Calculates the fastest path between two nodes.
 
-    Expects a JSON payload with 'from_node' and 'to_node' keys.
+    Expects a JSON payload with 'from_node' and 'to_node' keys, and an
+    optional 'strategy' key naming the search algorithm ("dijkstra",
+    "bidirectional", "alt" or "ch").
+
+    With `?k=<N>`, up to N alternative paths are returned as well. If the
+    route is protected (see `Network.protect_route`), these are its
+    precomputed standby paths; otherwise the N shortest loopless paths
+    over the online nodes are searched for this request only. With
+    `?k=<N>&protect=1` as well, the route is protected first: the N
+    shortest loopless paths and a node-disjoint backup are precomputed,
+    and messages on the route fail over between them without a new
+    search. In every case the fastest available path is returned.
 
     Returns:
-        Response: On success, a JSON object with the path and total latency.
-                  On failure, a 404 error with a JSON error message.
+        Response: On success, a JSON object with the path and total latency,
+                  plus with `k` a 'paths' list, each entry with 'path',
+                  'latency' and 'available' keys; the live graph is searched
+                  if all of them are down. On failure, a 404 error with a
+                  JSON error message, or a 400 error for an unknown strategy
+                  or a `k` outside 1 to MAX_K_PATHS.
     """
     data = request.get_json()
+    strategy = data.get("strategy", "dijkstra")
+    if strategy not in Network.PATH_STRATEGIES:
+        return jsonify({"error": f"Unknown strategy '{strategy}'"}), 400
     from_node = network.get_node_by_name(data.get("from_node"))
     to_node = network.get_node_by_name(data.get("to_node"))
     if not from_node or not to_node:
         return jsonify({"error": "Nodes not found"}), 404
-    path, latency = network.find_shortest_path(from_node.id, to_node.id)
+    k = request.args.get("k", type=int)
+    extra = {}
+    if k is not None:
+        if not 1 <= k <= MAX_K_PATHS:
+            return jsonify({"error": f"k must be 1 to {MAX_K_PATHS}"}), 400
+        if request.args.get("protect") in ("1", "true"):
+            paths = network.protect_route(from_node.id, to_node.id, k)
+        else:
+            paths = network.standby_paths(from_node.id, to_node.id)
+            if paths is None:
+                paths = [
+                    (path, latency, True)
+                    for path, latency in network.k_shortest_paths(
+                        from_node.id, to_node.id, k
+                    )
+                ]
+        standby = [
+            {"path": [n.name for n in path], "latency": latency, "available": up}
+            for path, latency, up in paths
+        ]
+        available = [entry for entry in standby if entry["available"]]
+        if available:
+            best = min(available, key=lambda entry: entry["latency"])
+            return jsonify(
+                {"path": best["path"], "latency": best["latency"], "paths": standby}
+            )
+        # Every standby path is down; search the live graph as usual.
+        extra["paths"] = standby
+    path, latency = network.find_shortest_path(
+        from_node.id, to_node.id, strategy=strategy
+    )
     if path:
-        return jsonify({"path": [n.name for n in path], "latency": latency})
-    return jsonify({"error": "No path found"}), 404
+        return jsonify({"path": [n.name for n in path], "latency": latency, **extra})
+    return jsonify({"error": "No path found", **extra}), 404
+
+
+def distance_response(table):
+    """Renders a DistanceTable as JSON, or as a binary stream on request.
+
+    With `?format=binary`, the response is the stream described in
+    `aegis_simulator.distances`, sent block by block as rows are computed.
+    Otherwise it is a JSON object with 'sources' and 'nodes' name lists and
+    a 'latencies' matrix, with null where a node is unreachable.
+    """
+    source_names = [node.name for node in table.sources]
+    node_names = [node.name for node in table.nodes]
+    # Without nodes there are no rows, and blocks cannot be reshaped into them.
+    blocks = table.values if node_names else ()
+    if request.args.get("format") == "binary":
+
+        def generate():
+            yield stream_header(source_names, node_names)
+            for block in blocks:
+                yield encode_rows(block.reshape(-1, len(node_names)))
+
+        return Response(generate(), mimetype="application/octet-stream")
+    latencies = []
+    for block in blocks:
+        for row in block.reshape(-1, len(node_names)).tolist():
+            latencies.append([None if math.isinf(value) else value for value in row])
+    return jsonify(
+        {"sources": source_names, "nodes": node_names, "latencies": latencies}
+    )
+
+
+@app.route("/api/network/distances")
+def get_distances():
+    """Returns the latency from one node to every node.
+
+    Expects a `?from=<name>` query parameter; see `distance_response` for
+    the formats.
+
+    Returns:
+        Response: A one-row latency table, or a 404 error if the node is
+                  unknown.
+    """
+    node = network.get_node_by_name(request.args.get("from"))
+    if not node:
+        return jsonify({"error": "Node not found"}), 404
+    table = network.distances_from(node.id)
+    return distance_response(table._replace(values=[table.values]))
+
+
+@app.route("/api/network/distance-matrix")
+def get_distance_matrix():
+    """Returns the latencies from several nodes, or from all, to every node.
+
+    Takes optional repeated `?source=<name>` parameters, defaulting to
+    every node; see `distance_response` for the formats. Rows are computed
+    in parallel worker processes on large networks. At most
+    MAX_DISTANCE_SOURCES sources are accepted, and a table of more than
+    MAX_DISTANCE_JSON_CELLS latencies must be requested with
+    `?format=binary`.
+
+    Returns:
+        Response: The latency table, a 400 error if it is too large, or a
+                  404 error if a source is unknown.
+    """
+    sources = None
+    names = request.args.getlist("source")
+    if names:
+        sources = []
+        for name in names:
+            node = network.get_node_by_name(name)
+            if not node:
+                return jsonify({"error": f"Node '{name}' not found"}), 404
+            sources.append(node.id)
+    source_count = len(sources) if sources is not None else len(network.nodes)
+    if source_count > MAX_DISTANCE_SOURCES:
+        return (
+            jsonify(
+                {
+                    "error": f"At most {MAX_DISTANCE_SOURCES} sources; "
+                    "pass 'source' parameters"
+                }
+            ),
+            400,
+        )
+    cells = source_count * len(network.nodes)
+    if cells > MAX_DISTANCE_JSON_CELLS and request.args.get("format") != "binary":
+        return (
+            jsonify(
+                {
+                    "error": f"More than {MAX_DISTANCE_JSON_CELLS} latencies; "
+                    "use format=binary"
+                }
+            ),
+            400,
+        )
+    return distance_response(network.distance_blocks(sources))
+
+
+@app.route("/api/network/contingency", methods=["POST"])
+def run_contingency_analysis():
+    """Ranks single and sampled double node failures by their impact.
+
+    Runs on a frozen copy of the topology in worker processes; the live
+    network is not touched. Expects a JSON payload with a 'terminals' list
+    of node names, and optional 'latency_threshold', 'double_failures' (the
+    number of N-2 scenarios to sample, at most MAX_DOUBLE_FAILURES) and
+    'limit' (the ranking length, 1 to MAX_CONTINGENCY_LIMIT) keys.
+
+    Returns:
+        Response: The report of `ContingencyAnalysis.run`, a 400 error for a
+                  malformed payload, or a 404 error for an unknown terminal.
+    """
+    data = request.get_json()
+    names = data.get("terminals") if isinstance(data, dict) else None
+    if not isinstance(names, list) or len(names) < 2:
+        return jsonify({"error": "Expected a 'terminals' list of two or more"}), 400
+    double_failures = data.get("double_failures", 0)
+    limit = data.get("limit", 50)
+    threshold = data.get("latency_threshold")
+    if not isinstance(double_failures, int) or not (
+        0 <= double_failures <= MAX_DOUBLE_FAILURES
+    ):
+        return (
+            jsonify({"error": f"double_failures must be 0 to {MAX_DOUBLE_FAILURES}"}),
+            400,
+        )
+    if not isinstance(limit, int) or not 1 <= limit <= MAX_CONTINGENCY_LIMIT:
+        return jsonify({"error": f"limit must be 1 to {MAX_CONTINGENCY_LIMIT}"}), 400
+    if threshold is not None and not isinstance(threshold, (int, float)):
+        return jsonify({"error": "latency_threshold must be a number"}), 400
+    terminal_ids = []
+    for name in names:
+        node = network.get_node_by_name(name)
+        if not node:
+            return jsonify({"error": f"Node '{name}' not found"}), 404
+        terminal_ids.append(node.id)
+    analysis = ContingencyAnalysis(
+        network,
+        terminal_ids,
+        latency_threshold=threshold,
+        double_failures=double_failures,
+    )
+    return jsonify(analysis.run(limit=limit))
+
+
+@app.route("/api/network/reliability", methods=["POST"])
+def estimate_reliability():
+    """Estimates delivery probability and latency percentiles by simulation.
+
+    Samples random node failures and link latencies on a frozen copy of the
+    topology; the live network is not touched. Expects a JSON payload with
+    a 'pairs' list of {'from_node', 'to_node'} names, and optional 'trials',
+    'failure_probability', 'failure_probabilities' (by node name), 'links'
+    (a list of {'from_node', 'to_node', 'distribution'} entries, where the
+    distribution is a list such as ["uniform", 2, 8]), 'jitter' and 'seed'
+    keys; see `ReliabilityEstimator`.
+
+    Returns:
+        Response: A JSON object with a 'results' list from
+                  `ReliabilityEstimator.run`, a 400 error for a malformed
+                  payload, or a 404 error for an unknown node.
+    """
+    data = request.get_json()
+    pairs = data.get("pairs") if isinstance(data, dict) else None
+    if not isinstance(pairs, list) or not pairs:
+        return jsonify({"error": "Expected a non-empty 'pairs' list"}), 400
+    trials = data.get("trials", 10000)
+    if not isinstance(trials, int) or not 1 <= trials <= MAX_RELIABILITY_TRIALS:
+        return (
+            jsonify({"error": f"trials must be 1 to {MAX_RELIABILITY_TRIALS}"}),
+            400,
+        )
+
+    def node_id(name):
+        node = network.get_node_by_name(name)
+        if not node:
+            raise LookupError(f"Node '{name}' not found")
+        return node.id
+
+    try:
+        node_pairs = [(node_id(p["from_node"]), node_id(p["to_node"])) for p in pairs]
+        failures = {
+            node_id(name): probability
+            for name, probability in data.get("failure_probabilities", {}).items()
+        }
+        links = {
+            (node_id(link["from_node"]), node_id(link["to_node"])): link["distribution"]
+            for link in data.get("links", [])
+        }
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except (AttributeError, KeyError, TypeError):
+        return jsonify({"error": "Malformed reliability request"}), 400
+    try:
+        estimator = ReliabilityEstimator(
+            network,
+            failure_probability=data.get("failure_probability", 0.0),
+            failure_probabilities=failures,
+            link_distributions=links,
+            jitter=data.get("jitter", 0.0),
+            seed=data.get("seed", 0),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"results": estimator.run(node_pairs, trials=trials)})
+
+
+@app.route("/api/network/partitions")
+def get_partitions():
+    """Reports how the online nodes are split into mutually unreachable groups.
+
+    With `?node=<name>`, only that node's partition is reported.
+
+    Returns:
+        Response: A JSON object with a 'count' of partitions and a
+                  'partitions' list, largest first, each with 'id', 'size'
+                  and sorted 'nodes' names. With `node`, an object with
+                  'node', 'partition' (null if the node is offline) and
+                  'size' keys, or a 404 error if the node is unknown.
+    """
+    name = request.args.get("node")
+    if name is not None:
+        node = network.get_node_by_name(name)
+        if not node:
+            return jsonify({"error": "Node not found"}), 404
+        label = network.partition_of(node.id)
+        size = 0 if label is None else network.connectivity().size(label)
+        return jsonify({"node": name, "partition": label, "size": size})
+    partitions = [
+        {"id": label, "size": len(members), "nodes": sorted(n.name for n in members)}
+        for label, members in network.partitions()
+    ]
+    return jsonify({"count": len(partitions), "partitions": partitions})
+
+
+@app.route("/api/network/path-cache")
+def get_path_cache_info():
+    """Reports the hit/miss counters of the network's shortest-path cache.
+
+    Returns:
+        Response: A JSON object with 'hits', 'misses', 'size', 'maxsize' and
+                  'topology_version' keys.
+    """
+    return jsonify(network.path_cache_info())
 
 
 @app.route("/api/network/route", methods=["POST"])
@@ -111,15 +506,181 @@ def route_message():
     )
 
 
+@app.route("/api/network/route/batch", methods=["POST"])
+def route_messages():
+    """Routes many messages in one request.
+
+    Expects a JSON payload with a 'messages' key holding a list of objects,
+    each with 'from_node', 'to_node' and optional 'payload' keys. Messages
+    sharing a source node share one shortest-path computation.
+
+    Returns:
+        Response: A JSON object with a 'results' list, one entry per message
+                  in request order, and a 'delivered' count. Each result has
+                  'success', 'path' and 'latency' keys, or an 'error' key if a
+                  node name is unknown. A 400 error is returned if 'messages'
+                  is missing or not a list.
+    """
+    data = request.get_json()
+    items = data.get("messages") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return jsonify({"error": "Expected a 'messages' list"}), 400
+
+    messages, positions, results = [], [], []
+    for item in items:
+        from_node = network.get_node_by_name(item.get("from_node"))
+        to_node = network.get_node_by_name(item.get("to_node"))
+        if not from_node or not to_node:
+            results.append({"success": False, "error": "Nodes not found"})
+            continue
+        positions.append(len(results))
+        results.append(None)
+        messages.append(Message(from_node.id, to_node.id, item.get("payload", "")))
+
+    for position, (success, path, latency) in zip(
+        positions, network.route_messages(messages)
+    ):
+        results[position] = {
+            "success": success,
+            "path": [n.name for n in path] if path else None,
+            "latency": latency if path else None,
+        }
+    delivered = sum(1 for result in results if result["success"])
+    return jsonify({"results": results, "delivered": delivered})
+
+
+@app.route("/api/network/scenario", methods=["POST"])
+def run_scenario():
+    """Answers path queries on a what-if fork of the network.
+
+    The live network is left untouched. Expects a JSON payload with optional
+    'offline' and 'online' lists of node names, an optional 'latencies' list
+    of objects with 'from', 'to' and 'latency' keys, and a 'paths' list of
+    objects with 'from_node' and 'to_node' keys.
+
+    Returns:
+        Response: A JSON object with the applied 'changes' and a 'results'
+                  list, one entry per requested path, each with 'path' and
+                  'latency' keys (both null if no path exists) or an 'error'
+                  key if a node name is unknown. A 400 error is returned for a
+                  malformed payload, and a 404 error for an unknown node or
+                  link among the changes.
+    """
+    data = request.get_json()
+    paths = data.get("paths") if isinstance(data, dict) else None
+    if not isinstance(paths, list):
+        return jsonify({"error": "Expected a 'paths' list"}), 400
+
+    scenario = network.fork()
+    for key, is_active in (("offline", False), ("online", True)):
+        for name in data.get(key, []):
+            node = scenario.get_node_by_name(name)
+            if not node:
+                return jsonify({"error": f"Node '{name}' not found"}), 404
+            scenario.set_status(node.id, is_active)
+    for change in data.get("latencies", []):
+        latency = change.get("latency")
+        if not isinstance(latency, (int, float)) or latency < 0:
+            return jsonify({"error": "Latency must be a non-negative number"}), 400
+        if not scenario.set_link_latency(change.get("from"), change.get("to"), latency):
+            return jsonify({"error": "Link not found"}), 404
+
+    messages, positions, results = [], [], []
+    for item in paths:
+        from_node = scenario.get_node_by_name(item.get("from_node"))
+        to_node = scenario.get_node_by_name(item.get("to_node"))
+        if not from_node or not to_node:
+            results.append({"error": "Nodes not found"})
+            continue
+        positions.append(len(results))
+        results.append(None)
+        messages.append(Message(from_node.id, to_node.id, ""))
+
+    for position, (_, path, latency) in zip(
+        positions, scenario.route_messages(messages)
+    ):
+        results[position] = {
+            "path": [n.name for n in path] if path else None,
+            "latency": latency if path else None,
+        }
+    return jsonify({"changes": scenario.changes(), "results": results})
+
+
 @app.route("/api/events")
 def get_events():
-    """Returns the 10 most recent simulation events from the reporter.
+    """Returns simulation events from the reporter.
+
+    Without parameters, returns the 10 most recent events. With
+    `?after=<seq>`, returns the events logged after sequence number `seq`,
+    oldest first, so a client that passes back the returned cursor receives
+    every event exactly once. Optional parameters are 'limit' (at most
+    1000, default 100) and 'wait', a number of seconds (at most 30) to
+    block for new events when there are none yet.
+
+    Returns:
+        Response: Without 'after', a JSON array of event log dictionaries,
+                  newest first. With 'after', a JSON object with an 'events'
+                  list, the 'cursor' to pass as 'after' next time, and
+                  'missed', the number of events that were discarded before
+                  they could be fetched. Every event carries its 'seq'.
+    """
+    after = request.args.get("after", type=int)
+    if after is None:
+        return jsonify(network_reporter.recent_events(10))
+
+    events = network_reporter.events
+    if after >= events.next_seq:
+        # The cursor is from before a restart; start over from the oldest event.
+        after = -1
+    limit = max(1, min(request.args.get("limit", 100, type=int), 1000))
+    wait = min(request.args.get("wait", 0.0, type=float), 30.0)
+    if wait > 0 and events.next_seq <= after + 1:
+        network_reporter.wait_for_events(after, wait)
+    entries, missed = network_reporter.events_after(after, limit)
+    cursor = entries[-1]["seq"] if entries else max(after, events.first_seq - 1)
+    return jsonify({"events": entries, "cursor": cursor, "missed": missed})
+
+
+@app.route("/api/events/search")
+def search_events():
+    """Searches the persistent event log.
+
+    Accepts the optional query parameters 'node' (either end of a route),
+    'source', 'destination', 'type', 'status' ("SUCCESS" or "FAILED"),
+    'start' and 'end' (seconds since the epoch), 'before_id' (to fetch the
+    next page) and 'limit' (at most 1000, default 100). The event log is
+    only kept when the AEGIS_EVENT_LOG environment variable names its file.
 
     Returns:
-        Response: A JSON array of event log dictionaries.
+        Response: A JSON object with an 'events' list, newest first, and a
+                  'next_before_id' to pass for the next page, or null when
+                  there are no more results. A 400 error is returned for an
+                  unknown status, and a 404 error if the event log is
+                  disabled.
     """
-    recent_events = reversed(network_reporter.log_entries[-10:])
-    return jsonify(list(recent_events))
+    if event_log is None:
+        return (
+            jsonify({"error": "The event log is disabled; set AEGIS_EVENT_LOG"}),
+            404,
+        )
+    args = request.args
+    status = args.get("status")
+    if status is not None and status not in ("SUCCESS", "FAILED"):
+        return jsonify({"error": f"Unknown status '{status}'"}), 400
+    limit = max(1, min(args.get("limit", 100, type=int), 1000))
+    events = event_log.search(
+        node=args.get("node"),
+        source=args.get("source"),
+        destination=args.get("destination"),
+        event_type=args.get("type"),
+        status=status,
+        start=args.get("start", type=float),
+        end=args.get("end", type=float),
+        before_id=args.get("before_id", type=int),
+        limit=limit,
+    )
+    next_before_id = events[-1]["id"] if len(events) == limit else None
+    return jsonify({"events": events, "next_before_id": next_before_id})
 
 
 @app.route("/api/node/<node_name>/offline", methods=["POST"])
@@ -135,13 +696,7 @@ def take_node_offline(node_name):
     node = network.get_node_by_name(node_name)
     if not node:
         return jsonify({"error": "Node not found"}), 404
-    network_reporter.log_entries.append(
-        {
-            "timestamp": Reporter.get_timestamp(),
-            "event_type": "STATUS_CHANGE",
-            "details": f"Node '{node.name}' taken OFFLINE.",
-        }
-    )
+    network_reporter.log_status_change(node, False)
     node.take_offline()
     return jsonify({"success": True, "status": "offline"})
 
@@ -159,17 +714,47 @@ def bring_node_online(node_name):
     node = network.get_node_by_name(node_name)
     if not node:
         return jsonify({"error": "Node not found"}), 404
-    network_reporter.log_entries.append(
-        {
-            "timestamp": Reporter.get_timestamp(),
-            "event_type": "STATUS_CHANGE",
-            "details": f"Node '{node.name}' brought ONLINE.",
-        }
-    )
+    network_reporter.log_status_change(node, True)
     node.bring_online()
     return jsonify({"success": True, "status": "online"})
 
 
+@app.route("/api/stream")
+def stream_events():
+    """Streams network changes to the dashboard as server-sent events.
+
+    Event types are 'node_status', 'link_latency' and 'link_added' for
+    topology changes, 'event' for new reporter log entries, and 'resync'
+    when a client fell too far behind and should reload the full state.
+
+    Returns:
+        Response: A text/event-stream response that stays open until the
+                  client disconnects.
+    """
+    return Response(
+        broadcaster.stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/metrics")
+def get_metrics():
+    """Exposes counters and latency histograms in Prometheus text format.
+
+    Covers the core Network operations, nodes settled per search, path
+    cache counters and every API route.
+
+    Returns:
+        Response: The text exposition, or a 404 error if metrics are disabled.
+    """
+    if not metrics.is_enabled():
+        return jsonify({"error": "Metrics are disabled"}), 404
+    return Response(
+        metrics.registry.render(), mimetype="text/plain; version=0.0.4"
+    )
+
+
 # --- Frontend Serving ---
 
 
@@ -0,0 +1,319 @@
+# backend/benchmarks/run.py
+"""Benchmarks the simulator on synthetic topologies.
+
+Usage:
+    python -m benchmarks.run --topologies grid scale_free --sizes 1000 10000 \\
+        --output results.json [--baseline previous.json]
+
+Results are written as JSON so that runs from different releases can be
+compared; with --baseline, the exit status is 1 if any benchmark's median
+got slower than the baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from aegis_simulator.graphdata import graph_snapshot
+from aegis_simulator.models import Message, Network
+from aegis_simulator.reliability import ReliabilityEstimator
+from aegis_simulator.reporter import Reporter
+from aegis_simulator.topology import TOPOLOGIES, generate_topology, write_config
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def _summary(samples):
+    """Summarizes a list of durations in seconds."""
+    ordered = sorted(samples)
+    return {
+        "iterations": len(ordered),
+        "mean_s": statistics.fmean(ordered),
+        "p50_s": ordered[len(ordered) // 2],
+        "p95_s": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "min_s": ordered[0],
+        "max_s": ordered[-1],
+    }
+
+
+def _time_calls(calls):
+    """Runs each zero-argument callable once and returns the durations."""
+    perf_counter = time.perf_counter
+    samples = []
+    for call in calls:
+        start = perf_counter()
+        call()
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _benchmark_visualizer(network, workdir):
+    """Times one image generation, or explains why it was skipped."""
+    try:
+        from aegis_simulator.visualizer import Visualizer
+    except ImportError as e:
+        return None, f"visualizer unavailable: {e}"
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        return _time_calls([lambda: Visualizer().generate_graph_image(network)]), None
+    finally:
+        os.chdir(cwd)
+
+
+def run_topology(
+    kind,
+    node_count,
+    queries=200,
+    seed=0,
+    strategies=("dijkstra", "bidirectional"),
+    workdir=None,
+    visualizer_max_nodes=2000,
+    reliability_trials=1000,
+):
+    """Runs every benchmark on one generated topology.
+
+    Args:
+        kind (str): One of aegis_simulator.topology.TOPOLOGIES.
+        node_count (int): The number of nodes to generate.
+        queries (int, optional): Random node pairs per query benchmark.
+        seed (int, optional): Seeds the topology and the query pairs.
+        strategies (tuple, optional): `find_shortest_path` strategies to time.
+        workdir (str, optional): Where the generated config and images go.
+            Defaults to a new temporary directory.
+        visualizer_max_nodes (int, optional): Skip the image benchmark on
+            larger topologies, where the layout alone takes hours.
+        reliability_trials (int, optional): Monte Carlo trials for the
+            reliability benchmark, which estimates one random pair with a 1%
+            node failure probability and 10% latency jitter; 0 skips it.
+
+    Returns:
+        list: One result dictionary per benchmark.
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix="aegis-bench-")
+    config_path = os.path.join(workdir, f"{kind}-{node_count}.yml")
+    common = {"topology": kind, "nodes": node_count}
+    results = []
+
+    start = time.perf_counter()
+    config = generate_topology(kind, node_count, seed)
+    write_config(config, config_path)
+    common["links"] = len(config["links"])
+    del config
+    results.append(
+        dict(common, benchmark="generate", **_summary([time.perf_counter() - start]))
+    )
+
+    network = None
+
+    def load():
+        nonlocal network
+        network = Network.create_from_config(config_path, reporter=Reporter())
+
+    samples = _time_calls([load])
+    results.append(dict(common, benchmark="config_load", **_summary(samples)))
+
+    snapshot_path = os.path.join(workdir, f"{kind}-{node_count}.snapshot")
+    samples = _time_calls([lambda: network.write_snapshot(snapshot_path)])
+    results.append(dict(common, benchmark="snapshot_write", **_summary(samples)))
+
+    def load_snapshot():
+        nonlocal network
+        network = Network.load_snapshot(snapshot_path, reporter=Reporter())
+
+    samples = _time_calls([load_snapshot])
+    results.append(dict(common, benchmark="snapshot_load", **_summary(samples)))
+
+    rng = random.Random(seed)
+    ids = list(network.nodes)
+    pairs = [(rng.choice(ids), rng.choice(ids)) for _ in range(queries)]
+    # The first query builds the compact graph; keep that out of the timings.
+    network.find_shortest_path(*pairs[0])
+
+    for strategy in strategies:
+        samples = _time_calls(
+            [
+                lambda s=s, t=t: network.find_shortest_path(s, t, strategy=strategy)
+                for s, t in pairs
+            ]
+        )
+        results.append(
+            dict(
+                common,
+                benchmark=f"find_shortest_path[{strategy}]",
+                **_summary(samples),
+            )
+        )
+
+    # The same queries on the Node objects, the baseline for the compact graph.
+    network.use_compact_graph = False
+    try:
+        samples = _time_calls(
+            [lambda s=s, t=t: network.find_shortest_path(s, t) for s, t in pairs]
+        )
+    finally:
+        network.use_compact_graph = True
+    results.append(
+        dict(common, benchmark="find_shortest_path[dict]", **_summary(samples))
+    )
+
+    # Fresh pairs, so that routing does not just reuse the trees cached above.
+    messages = [
+        Message(rng.choice(ids), rng.choice(ids), "benchmark") for _ in range(queries)
+    ]
+    samples = _time_calls([lambda m=m: network.route_message(m) for m in messages])
+    results.append(dict(common, benchmark="route_message", **_summary(samples)))
+
+    if reliability_trials:
+        estimator = ReliabilityEstimator(
+            network, failure_probability=0.01, jitter=0.1, seed=seed
+        )
+        pair = [(rng.choice(ids), rng.choice(ids))]
+        samples = _time_calls([lambda: estimator.run(pair, reliability_trials)])
+        results.append(dict(common, benchmark="reliability", **_summary(samples)))
+
+    samples = _time_calls([lambda: json.dumps(graph_snapshot(network))] * 3)
+    results.append(dict(common, benchmark="graph_data", **_summary(samples)))
+
+    if node_count <= visualizer_max_nodes:
+        samples, skipped = _benchmark_visualizer(network, workdir)
+        if samples:
+            results.append(dict(common, benchmark="visualizer", **_summary(samples)))
+        else:
+            results.append(dict(common, benchmark="visualizer", skipped=skipped))
+    return results
+
+
+def run_suite(topologies=TOPOLOGIES, sizes=DEFAULT_SIZES, log=None, **options):
+    """Runs `run_topology` for every topology and size.
+
+    Args:
+        topologies (iterable, optional): Topology kinds. Defaults to all.
+        sizes (iterable, optional): Node counts. Defaults to DEFAULT_SIZES.
+        log (callable, optional): Called with a line of text per result.
+        **options: Passed on to `run_topology`.
+
+    Returns:
+        dict: 'meta' describing the machine and revision, and 'results'.
+    """
+    results = []
+    for kind in topologies:
+        for size in sizes:
+            for result in run_topology(kind, size, **options):
+                results.append(result)
+                if log is not None:
+                    log(_format_result(result))
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "options": {k: v for k, v in options.items() if k != "workdir"},
+        },
+        "results": results,
+    }
+
+
+def _format_result(result):
+    name = f"{result['benchmark']:<34} {result['topology']:<13} {result['nodes']:>8}"
+    if "skipped" in result:
+        return f"{name}  skipped ({result['skipped']})"
+    return (
+        f"{name}  p50 {result['p50_s'] * 1000:10.3f} ms"
+        f"  p95 {result['p95_s'] * 1000:10.3f} ms  n={result['iterations']}"
+    )
+
+
+def compare(results, baseline, threshold=0.2):
+    """Finds benchmarks whose median got slower than in a baseline run.
+
+    Args:
+        results (dict): Output of `run_suite`.
+        baseline (dict): An earlier output of `run_suite`.
+        threshold (float, optional): The tolerated slowdown, as a fraction.
+
+    Returns:
+        list: (benchmark, topology, nodes, ratio) tuples for regressions.
+    """
+
+    def key(result):
+        return result["benchmark"], result["topology"], result["nodes"]
+
+    previous = {key(r): r for r in baseline["results"] if "p50_s" in r}
+    regressions = []
+    for result in results["results"]:
+        old = previous.get(key(result))
+        if old is None or "p50_s" not in result or not old["p50_s"]:
+            continue
+        ratio = result["p50_s"] / old["p50_s"]
+        if ratio > 1 + threshold:
+            regressions.append(key(result) + (ratio,))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--topologies", nargs="+", choices=TOPOLOGIES, default=TOPOLOGIES
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=Network.PATH_STRATEGIES,
+        default=["dijkstra", "bidirectional"],
+    )
+    parser.add_argument("--visualizer-max-nodes", type=int, default=2000)
+    parser.add_argument("--reliability-trials", type=int, default=1000)
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--baseline", help="A previous results file to compare to.")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run_suite(
+        args.topologies,
+        args.sizes,
+        log=print,
+        queries=args.queries,
+        seed=args.seed,
+        strategies=tuple(args.strategies),
+        visualizer_max_nodes=args.visualizer_max_nodes,
+        reliability_trials=args.reliability_trials,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for benchmark, kind, nodes, ratio in regressions:
+            print(f"REGRESSION {benchmark} {kind} {nodes}: {ratio:.2f}x slower")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,12 @@ document.addEventListener('DOMContentLoaded', () => {
     const eventLog = document.getElementById('event-log');
 
     let network = null; // This will hold our Vis.js network instance
+    let pollTimer = null; // Set while falling back to polling
+    let graphVersion = null; // Topology version of the rendered graph
+    let eventCursor = null; // Sequence number of the newest event shown
+    const POLL_INTERVAL_MS = 3000;
+    const ONLINE_COLOR = '#4ade80';
+    const OFFLINE_COLOR = '#f87171';
 
     // --- Graph Configuration ---
     const options = {
@@ -41,14 +47,21 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function fetchGraphData() {
         try {
-            const response = await fetch('/api/network/graph-data');
+            // Once a graph is rendered, only ask for what changed since
+            const query = network && graphVersion !== null ? `?since=${graphVersion}` : '';
+            const response = await fetch(`/api/network/graph-data${query}`);
             if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
             const graphData = await response.json();
             
             apiStatusLight.className = 'w-4 h-4 rounded-full bg-green-500';
             apiStatusText.textContent = 'Live';
 
-            renderGraph(graphData);
+            if (graphData.full) {
+                renderGraph(graphData);
+            } else {
+                applyGraphDelta(graphData);
+            }
+            graphVersion = graphData.version;
 
         } catch (error) {
             console.error("Failed to fetch graph data:", error);
@@ -70,12 +83,15 @@ document.addEventListener('DOMContentLoaded', () => {
                 if (params.nodes.length > 0) {
                     const nodeId = params.nodes[0];
                     const node = network.body.data.nodes.get(nodeId);
-                    const action = node.color === '#f87171' ? 'online' : 'offline'; // If red, action is 'online'
+                    const action = node.color === OFFLINE_COLOR ? 'online' : 'offline'; // If red, action is 'online'
                     
                     try {
                         await fetch(`/api/node/${node.label}/${action}`, { method: 'POST' });
-                        fetchGraphData(); // Refresh graph
-                        fetchEventLog(); // Refresh log
+                        if (pollTimer) {
+                            // The live stream pushes the change itself
+                            fetchGraphData();
+                            fetchEventLog();
+                        }
                     } catch(error) {
                         console.error(`Failed to set node ${node.label} to ${action}:`, error);
                     }
@@ -89,6 +105,14 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    function applyGraphDelta(delta) {
+        const { nodes, edges } = network.body.data;
+        nodes.remove(delta.removed_nodes);
+        edges.remove(delta.removed_edges);
+        nodes.update(delta.nodes);
+        edges.update(delta.edges);
+    }
+
     async function populateNodeSelectors() {
         try {
             const response = await fetch('/api/nodes');
@@ -120,43 +144,128 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function fetchEventLog() {
         try {
-            const response = await fetch('/api/events');
-            if (!response.ok) throw new Error('Failed to fetch event log');
-            const events = await response.json();
-            renderEventLog(events);
+            if (eventCursor === null) {
+                const response = await fetch('/api/events');
+                if (!response.ok) throw new Error('Failed to fetch event log');
+                const events = await response.json();
+                renderEventLog(events);
+                eventCursor = events.length > 0 ? events[0].seq : null;
+            } else {
+                // Only fetch the events logged since the newest one shown
+                const response = await fetch(`/api/events?after=${eventCursor}&limit=10`);
+                if (!response.ok) throw new Error('Failed to fetch event log');
+                const data = await response.json();
+                data.events.forEach(prependLogEntry);
+                eventCursor = data.cursor;
+            }
         } catch (error) {
             console.error(error);
         }
     }
 
+    function createLogEntry(event) {
+        const logEntry = document.createElement('div');
+        logEntry.className = 'text-xs p-2 rounded';
+        let statusIndicator = '';
+
+        if (event.status === 'SUCCESS') {
+            logEntry.classList.add('bg-green-900/50', 'text-green-300');
+            statusIndicator = '✅';
+        } else if (event.status === 'FAILED') {
+            logEntry.classList.add('bg-red-900/50', 'text-red-300');
+            statusIndicator = '❌';
+        } else {
+            logEntry.classList.add('bg-blue-900/50', 'text-blue-300');
+            statusIndicator = 'ℹ️';
+        }
+
+        logEntry.innerHTML = `
+            <span class="font-mono">${event.timestamp}</span>
+            <span class="font-bold mx-2">${statusIndicator}</span>
+            <span>${event.details}</span>
+        `;
+        return logEntry;
+    }
+
+    function prependLogEntry(event) {
+        if (!eventLog.querySelector('div')) {
+            eventLog.innerHTML = '';
+        }
+        eventLog.prepend(createLogEntry(event));
+        while (eventLog.children.length > 10) {
+            eventLog.lastElementChild.remove();
+        }
+    }
+
     function renderEventLog(events) {
         eventLog.innerHTML = '';
         if (events.length === 0) {
             eventLog.innerHTML = '<p class="text-gray-500">No events yet...</p>';
             return;
         }
-        events.forEach(event => {
-            const logEntry = document.createElement('div');
-            logEntry.className = 'text-xs p-2 rounded';
-            let statusIndicator = '';
-
-            if (event.status === 'SUCCESS') {
-                logEntry.classList.add('bg-green-900/50', 'text-green-300');
-                statusIndicator = '✅';
-            } else if (event.status === 'FAILED') {
-                logEntry.classList.add('bg-red-900/50', 'text-red-300');
-                statusIndicator = '❌';
-            } else {
-                logEntry.classList.add('bg-blue-900/50', 'text-blue-300');
-                statusIndicator = 'ℹ️';
-            }
+        events.forEach(event => eventLog.appendChild(createLogEntry(event)));
+    }
+
+    // --- Live Updates ---
 
-            logEntry.innerHTML = `
-                <span class="font-mono">${event.timestamp}</span>
-                <span class="font-bold mx-2">${statusIndicator}</span>
-                <span>${event.details}</span>
-            `;
-            eventLog.appendChild(logEntry);
+    function startPolling() {
+        if (pollTimer) return;
+        eventCursor = null; // Streamed events carry no cursor; reload once
+        pollTimer = setInterval(() => {
+            fetchGraphData();
+            fetchEventLog();
+        }, POLL_INTERVAL_MS);
+    }
+
+    function stopPolling() {
+        clearInterval(pollTimer);
+        pollTimer = null;
+    }
+
+    function connectStream() {
+        if (!window.EventSource) {
+            startPolling();
+            return;
+        }
+        const source = new EventSource('/api/stream');
+
+        source.onopen = () => {
+            // Catch up on anything missed while disconnected; the server may
+            // have restarted, so start again from a full snapshot
+            stopPolling();
+            graphVersion = null;
+            eventCursor = null;
+            fetchGraphData();
+            fetchEventLog();
+        };
+        source.onerror = () => {
+            // EventSource reconnects by itself; poll until it does
+            apiStatusLight.className = 'w-4 h-4 rounded-full bg-yellow-500';
+            apiStatusText.textContent = 'Polling';
+            startPolling();
+        };
+
+        source.addEventListener('node_status', (e) => {
+            const data = JSON.parse(e.data);
+            if (network) {
+                network.body.data.nodes.update({
+                    id: data.id,
+                    color: data.is_active ? ONLINE_COLOR : OFFLINE_COLOR,
+                });
+            }
+        });
+        source.addEventListener('link_latency', (e) => {
+            const data = JSON.parse(e.data);
+            if (network) {
+                const id = [data.from, data.to].sort().join(':');
+                network.body.data.edges.update({ id, label: `${data.latency}ms` });
+            }
+        });
+        source.addEventListener('link_added', () => fetchGraphData());
+        source.addEventListener('event', (e) => prependLogEntry(JSON.parse(e.data)));
+        source.addEventListener('resync', () => {
+            fetchGraphData();
+            fetchEventLog();
         });
     }
 
@@ -202,7 +311,7 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!response.ok) throw new Error(result.message || 'Routing failed');
             
             displayResult(result.message);
-            fetchEventLog(); // Refresh log after action
+            if (pollTimer) fetchEventLog(); // Otherwise the live stream pushes it
         } catch (error) {
             displayResult(`Error: ${error.message}`, true);
         }
@@ -213,11 +322,8 @@ document.addEventListener('DOMContentLoaded', () => {
         fetchGraphData();
         populateNodeSelectors();
         fetchEventLog();
-        // Update both graph and log every 3 seconds
-        setInterval(() => {
-            fetchGraphData();
-            fetchEventLog();
-        }, 60000);
+        // Changes are pushed over the live stream; polling is the fallback
+        connectStream();
     }
 
     initialize();
@@ -98,3 +98,440 @@ def test_take_node_offline_endpoint(mock_create_config, client):
         assert node_a_data["label"] == "Node-A"
         # The color should now be the "offline" color
         assert node_a_data["color"] == "#f87171"
+
+
+def test_path_cache_endpoint_counts_repeated_queries(client):
+    """
+    Tests that repeated path queries from one source are served from the cache.
+    """
+    test_network = Network()
+    node_a, node_b = Node("Node-A"), Node("Node-B")
+    node_a.add_neighbor(node_b, 50)
+    test_network.add_node(node_a)
+    test_network.add_node(node_b)
+
+    with patch("app.network", test_network):
+        for _ in range(3):
+            response = client.post(
+                "/api/network/path",
+                json={"from_node": "Node-A", "to_node": "Node-B"},
+            )
+            assert response.status_code == 200
+
+        data = json.loads(client.get("/api/network/path-cache").data)
+        # The second query builds the tree that answers the third.
+        assert data["misses"] == 2
+        assert data["hits"] == 1
+
+
+def test_find_path_endpoint_accepts_strategy(client):
+    """
+    Tests that POST /api/network/path honours and validates the strategy field.
+    """
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 10)
+    node_b.add_neighbor(node_c, 10)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        response = client.post(
+            "/api/network/path",
+            json={"from_node": "Node-A", "to_node": "Node-C", "strategy": "alt"},
+        )
+        assert response.status_code == 200
+        assert json.loads(response.data)["latency"] == 20
+
+        response = client.post(
+            "/api/network/path",
+            json={"from_node": "Node-A", "to_node": "Node-C", "strategy": "warp"},
+        )
+        assert response.status_code == 400
+
+
+def test_route_batch_endpoint_returns_results_in_order(client):
+    """
+    Tests the POST /api/network/route/batch endpoint.
+    """
+    test_network = Network()
+    node_a, node_b = Node("Node-A"), Node("Node-B")
+    node_a.add_neighbor(node_b, 50)
+    test_network.add_node(node_a)
+    test_network.add_node(node_b)
+
+    with patch("app.network", test_network):
+        response = client.post(
+            "/api/network/route/batch",
+            json={
+                "messages": [
+                    {"from_node": "Node-A", "to_node": "Node-B", "payload": "x"},
+                    {"from_node": "Node-A", "to_node": "Node-Z", "payload": "y"},
+                    {"from_node": "Node-B", "to_node": "Node-A", "payload": "z"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["delivered"] == 2
+        assert data["results"][0]["path"] == ["Node-A", "Node-B"]
+        assert data["results"][1]["error"] == "Nodes not found"
+        assert data["results"][2]["latency"] == 50
+
+
+def test_status_change_is_logged_and_streamed(client):
+    """
+    Tests that taking a node offline is logged and pushed to /api/stream
+    subscribers.
+    """
+    from app import broadcaster
+
+    test_network = Network()
+    node_a = Node("Node-A")
+    test_network.add_node(node_a)
+    test_network.add_listener(broadcaster.publish)
+    subscriber = broadcaster.subscribe()
+    try:
+        with patch("app.network", test_network):
+            response = client.post("/api/node/Node-A/offline")
+            assert response.status_code == 200
+        events = []
+        while not subscriber.empty():
+            events.append(subscriber.get_nowait())
+    finally:
+        broadcaster.unsubscribe(subscriber)
+    status = {"id": node_a.id, "name": "Node-A", "is_active": False}
+    assert ("node_status", status) in events
+    assert any(
+        event_type == "event" and data["event_type"] == "STATUS_CHANGE"
+        for event_type, data in events
+    )
+
+
+def test_graph_data_returns_delta_since_version(client):
+    """
+    Tests that GET /api/network/graph-data?since=<version> only returns what
+    changed after that version.
+    """
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 50)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        full = json.loads(client.get("/api/network/graph-data").data)
+        assert full["full"] is True
+        assert len(full["nodes"]) == 3
+
+        node_c.take_offline()
+        test_network.set_link_latency("Node-A", "Node-B", 20)
+        response = client.get(f"/api/network/graph-data?since={full['version']}")
+        delta = json.loads(response.data)
+        assert delta["full"] is False
+        assert delta["version"] == test_network.topology_version
+        assert [node["label"] for node in delta["nodes"]] == ["Node-C"]
+        assert [edge["label"] for edge in delta["edges"]] == ["20ms"]
+        assert delta["removed_nodes"] == [] and delta["removed_edges"] == []
+
+        response = client.get("/api/network/graph-data?since=-1")
+        assert json.loads(response.data)["full"] is True
+
+
+def test_search_events_endpoint(client, tmp_path):
+    """
+    Tests GET /api/events/search against the persistent event log.
+    """
+    from aegis_simulator.eventlog import EventLog
+    from aegis_simulator.reporter import Reporter
+
+    response = client.get("/api/events/search")
+    assert response.status_code == 404
+
+    reporter = Reporter()
+    with EventLog(str(tmp_path / "events.db"), flush_interval=0.01) as log:
+        reporter.add_sink(log)
+        reporter.log_status_change(Node("Search-B"), False)
+        assert log.flush(timeout=5)
+
+        with patch("app.event_log", log):
+            response = client.get("/api/events/search?node=Search-B&limit=5")
+            assert response.status_code == 200
+            data = json.loads(response.data)
+            assert data["events"][0]["details"] == "Node 'Search-B' taken OFFLINE."
+
+            response = client.get("/api/events/search?status=FAILED")
+            assert json.loads(response.data)["events"] == []
+            response = client.get("/api/events/search?status=MAYBE")
+            assert response.status_code == 400
+
+
+def test_events_cursor_returns_each_event_once(client):
+    """
+    Tests incremental fetching from GET /api/events?after=<seq>.
+    """
+    from app import network_reporter
+
+    node = Node("Cursor-A")
+    cursor = network_reporter.events.next_seq - 1
+    network_reporter.log_status_change(node, False)
+    network_reporter.log_status_change(node, True)
+
+    data = json.loads(client.get(f"/api/events?after={cursor}&limit=1").data)
+    assert [event["seq"] for event in data["events"]] == [cursor + 1]
+    data = json.loads(client.get(f"/api/events?after={data['cursor']}").data)
+    assert data["events"][0]["details"] == "Node 'Cursor-A' brought ONLINE."
+    data = json.loads(client.get(f"/api/events?after={data['cursor']}&wait=0.01").data)
+    assert data["events"] == [] and data["missed"] == 0
+
+
+def test_metrics_endpoint_reports_routes(client):
+    """
+    Tests that GET /api/metrics exposes per-route request metrics.
+    """
+    from aegis_simulator import metrics
+
+    if not metrics.is_enabled():
+        metrics.enable()
+    client.get("/api/nodes")
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.data.decode("utf-8")
+    assert 'aegis_http_requests_total{route="/api/nodes",method="GET",status="200"}' in text
+    assert "aegis_path_cache_hit_ratio" in text
+
+
+def test_scenario_endpoint_answers_on_a_fork(client):
+    """
+    Tests that POST /api/network/scenario leaves the live network untouched.
+    """
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 5)
+    node_a.add_neighbor(node_c, 30)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        response = client.post(
+            "/api/network/scenario",
+            json={
+                "offline": ["Node-B"],
+                "paths": [
+                    {"from_node": "Node-A", "to_node": "Node-C"},
+                    {"from_node": "Node-A", "to_node": "Node-B"},
+                ],
+            },
+        )
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data["changes"]["offline"] == ["Node-B"]
+        assert data["results"][0] == {"path": ["Node-A", "Node-C"], "latency": 30}
+        assert data["results"][1] == {"path": None, "latency": None}
+        assert node_b.is_active is True
+
+
+def test_path_endpoint_with_k_returns_standby_paths(client):
+    """
+    Tests that POST /api/network/path?k=N returns alternative paths and only
+    protects the route when asked to.
+    """
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 5)
+    node_a.add_neighbor(node_c, 30)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        payload = {"from_node": "Node-A", "to_node": "Node-C"}
+        data = json.loads(client.post("/api/network/path?k=2", json=payload).data)
+        assert [entry["latency"] for entry in data["paths"]] == [10, 30]
+        assert test_network.standby_paths(node_a.id, node_c.id) is None
+
+        response = client.post("/api/network/path?k=2&protect=1", json=payload)
+        assert response.status_code == 200
+        standby = test_network._standby[(node_a.id, node_c.id)]
+
+        node_b.take_offline()
+        response = client.post("/api/network/path?k=2", json=payload)
+        data = json.loads(response.data)
+        assert data["path"] == ["Node-A", "Node-C"]
+        assert [entry["available"] for entry in data["paths"]] == [False, True]
+        # The protected route's standby paths are reused, not recomputed.
+        client.post("/api/network/path?k=2&protect=1", json=payload)
+        assert test_network._standby[(node_a.id, node_c.id)] is standby
+
+        for query in ("k=0", "k=100000", "k=100000&protect=1"):
+            response = client.post(f"/api/network/path?{query}", json=payload)
+            assert response.status_code == 400, query
+
+
+def test_partitions_endpoint_reports_split_network(client):
+    """
+    Tests the GET /api/network/partitions endpoint.
+    """
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 5)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        node_b.take_offline()
+        data = json.loads(client.get("/api/network/partitions").data)
+        assert data["count"] == 2
+        assert sorted(p["nodes"] for p in data["partitions"]) == [
+            ["Node-A"],
+            ["Node-C"],
+        ]
+        data = json.loads(client.get("/api/network/partitions?node=Node-B").data)
+        assert data == {"node": "Node-B", "partition": None, "size": 0}
+
+
+def test_distance_endpoints_return_json_and_binary(client):
+    """
+    Tests the GET /api/network/distances and distance-matrix endpoints.
+    """
+    from aegis_simulator.distances import read_stream
+
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 5)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        data = json.loads(client.get("/api/network/distances?from=Node-A").data)
+        assert data["nodes"] == ["Node-A", "Node-B", "Node-C"]
+        assert data["latencies"] == [[0, 5, None]]
+
+        response = client.get("/api/network/distance-matrix?format=binary")
+        assert response.mimetype == "application/octet-stream"
+        table = read_stream(response.data)
+        assert table.sources == ["Node-A", "Node-B", "Node-C"]
+        assert table.values[1].tolist() == [5, 0, float("inf")]
+
+        response = client.get("/api/network/distance-matrix?source=Node-Z")
+        assert response.status_code == 404
+
+        with patch("app.MAX_DISTANCE_SOURCES", 2):
+            response = client.get("/api/network/distance-matrix")
+            assert response.status_code == 400
+            response = client.get("/api/network/distance-matrix?source=Node-A")
+            assert response.status_code == 200
+        with patch("app.MAX_DISTANCE_JSON_CELLS", 8):
+            response = client.get("/api/network/distance-matrix")
+            assert response.status_code == 400
+            response = client.get("/api/network/distance-matrix?format=binary")
+            assert response.status_code == 200
+
+    with patch("app.network", Network()):
+        data = json.loads(client.get("/api/network/distance-matrix").data)
+        assert data == {"sources": [], "nodes": [], "latencies": []}
+        response = client.get("/api/network/distance-matrix?format=binary")
+        assert read_stream(response.data).sources == []
+
+
+def test_reliability_endpoint_estimates_delivery(client):
+    """
+    Tests the POST /api/network/reliability endpoint.
+    """
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 5)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        response = client.post(
+            "/api/network/reliability",
+            json={
+                "pairs": [{"from_node": "Node-A", "to_node": "Node-C"}],
+                "trials": 2000,
+                "failure_probabilities": {"Node-B": 0.5},
+                "links": [
+                    {
+                        "from_node": "Node-C",
+                        "to_node": "Node-B",
+                        "distribution": ["uniform", 1, 3],
+                    }
+                ],
+            },
+        )
+        assert response.status_code == 200
+        [result] = json.loads(response.data)["results"]
+        assert result["source"] == "Node-A" and result["trials"] == 2000
+        assert 0.4 < result["delivery_probability"] < 0.6
+        assert 6 <= result["latency_percentiles"]["50"] <= 8
+
+        response = client.post(
+            "/api/network/reliability",
+            json={"pairs": [{"from_node": "Node-A", "to_node": "Node-Z"}]},
+        )
+        assert response.status_code == 404
+        response = client.post(
+            "/api/network/reliability",
+            json={"pairs": [{"from_node": "Node-A", "to_node": "Node-C"}], "trials": 0},
+        )
+        assert response.status_code == 400
+        pairs = [{"from_node": "Node-A", "to_node": "Node-C"}]
+        for payload in (
+            {"pairs": pairs, "jitter": -1},
+            {
+                "pairs": pairs,
+                "links": [
+                    {
+                        "from_node": "Node-A",
+                        "to_node": "Node-B",
+                        "distribution": ["normal", 5, -1],
+                    }
+                ],
+            },
+        ):
+            response = client.post("/api/network/reliability", json=payload)
+            assert response.status_code == 400, payload
+
+
+def test_contingency_endpoint_ranks_failures_and_validates_input(client):
+    """
+    Tests the POST /api/network/contingency endpoint.
+    """
+    test_network = Network()
+    node_a, node_b, node_c = Node("Node-A"), Node("Node-B"), Node("Node-C")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 5)
+    for node in (node_a, node_b, node_c):
+        test_network.add_node(node)
+
+    with patch("app.network", test_network):
+        response = client.post(
+            "/api/network/contingency",
+            json={"terminals": ["Node-A", "Node-C"], "limit": 5},
+        )
+        assert response.status_code == 200
+        report = json.loads(response.data)
+        assert report["terminals"] == ["Node-A", "Node-C"]
+        failed = [impact["failed"] for impact in report["ranking"]]
+        assert failed[-1] == ["Node-B"]
+        assert report["ranking"][-1]["disconnected_pairs"] == 1
+
+        for payload in (
+            {"terminals": ["Node-A"]},
+            {"terminals": ["Node-A", "Node-C"], "limit": "many"},
+            {"terminals": ["Node-A", "Node-C"], "limit": 0},
+            {"terminals": ["Node-A", "Node-C"], "double_failures": 10**9},
+            {"terminals": ["Node-A", "Node-C"], "double_failures": -1},
+            {"terminals": ["Node-A", "Node-C"], "latency_threshold": "x"},
+        ):
+            response = client.post("/api/network/contingency", json=payload)
+            assert response.status_code == 400, payload
+        response = client.post(
+            "/api/network/contingency", json={"terminals": ["Node-A", "Node-Z"]}
+        )
+        assert response.status_code == 404
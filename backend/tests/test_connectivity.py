@@ -0,0 +1,113 @@
+# backend/tests/test_connectivity.py
+
+import random
+import sys
+import threading
+
+from aegis_simulator.connectivity import ConnectivityIndex
+from aegis_simulator.models import Network, Node
+from aegis_simulator.topology import generate_topology, write_config
+
+
+def _components(graph):
+    """Labels components by brute force, as sets of node indices."""
+    seen, components = set(), []
+    for start in range(len(graph)):
+        if not graph.active[start] or start in seen:
+            continue
+        component, stack = {start}, [start]
+        while stack:
+            u = stack.pop()
+            for k in range(graph.offsets[u], graph.offsets[u + 1]):
+                v = graph.targets[k]
+                if graph.active[v] and v not in component:
+                    component.add(v)
+                    stack.append(v)
+        seen |= component
+        components.append(frozenset(component))
+    return set(components)
+
+
+def test_index_follows_random_status_changes(tmp_path):
+    config_path = str(tmp_path / "mesh.yml")
+    write_config(generate_topology("scale_free", 200, seed=4), config_path)
+    graph = Network.create_from_config(config_path).compact_graph()
+    index = ConnectivityIndex(graph)
+    rng = random.Random(11)
+    for step in range(400):
+        i = rng.randrange(len(graph))
+        graph.set_active(i, not graph.active[i] if step % 3 else 0)
+        index.node_status_changed(i)
+        if step % 20 == 0:
+            expected = _components(graph)
+            assert {frozenset(nodes) for _, nodes in index.components()} == expected
+            assert index.count == len(expected)
+            for label, nodes in index.components():
+                assert index.size(label) == len(nodes)
+
+
+def test_partitioned_pairs_are_rejected_and_reported():
+    network = Network()
+    nodes = [Node(name) for name in "ABCDE"]
+    node_a, node_b, node_c, node_d, node_e = nodes
+    node_a.add_neighbor(node_b, 1)
+    node_b.add_neighbor(node_c, 1)
+    node_c.add_neighbor(node_d, 1)
+    node_d.add_neighbor(node_e, 1)
+    for node in nodes:
+        network.add_node(node)
+    assert len(network.partitions()) == 1
+    label = network.partition_of(node_a.id)
+
+    node_b.take_offline()
+    assert network.find_shortest_path(node_a.id, node_e.id) == (None, float("inf"))
+    partitions = network.partitions()
+    assert [[n.name for n in members] for _, members in partitions] == [
+        ["C", "D", "E"],
+        ["A"],
+    ]
+    # The larger piece keeps the partition's label.
+    assert network.partition_of(node_e.id) == label != network.partition_of(node_a.id)
+    assert network.partition_of(node_b.id) is None
+
+    node_b.bring_online()
+    assert network.find_shortest_path(node_a.id, node_e.id)[1] == 4
+    assert network.partition_of(node_a.id) == network.partition_of(node_e.id)
+
+
+def test_changes_relabel_in_place_and_readers_never_see_half_of_one():
+    # Chains of 300 and 600 nodes joined through one bridge node, so the
+    # shorter one is relabeled on every change.
+    network = Network()
+    nodes = [Node(f"C{i}") for i in range(901)]
+    for first, second in zip(nodes, nodes[1:]):
+        first.add_neighbor(second, 1)
+    for node in nodes:
+        network.add_node(node)
+    graph = network.compact_graph()
+    index = ConnectivityIndex(graph)
+    labels = index._labels
+    left, right = graph.index[nodes[0].id], graph.index[nodes[299].id]
+    bridge = graph.index[nodes[300].id]
+
+    failures, done = [], threading.Event()
+
+    def read():
+        while not done.is_set():
+            if not index.connected(left, right):
+                failures.append(True)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    try:
+        for step in range(40):
+            graph.set_active(bridge, step % 2)
+            index.node_status_changed(bridge)
+    finally:
+        done.set()
+        reader.join(timeout=10)
+        sys.setswitchinterval(interval)
+    assert index._labels is labels
+    assert not failures
@@ -0,0 +1,106 @@
+# backend/tests/test_contingency.py
+
+import itertools
+
+import pytest
+from aegis_simulator import contingency
+from aegis_simulator.contingency import ContingencyAnalysis
+from aegis_simulator.models import Network, Node
+from aegis_simulator.topology import generate_topology, write_config
+
+
+@pytest.fixture
+def network(tmp_path):
+    config_path = str(tmp_path / "mesh.yml")
+    write_config(generate_topology("scale_free", 80, seed=6), config_path)
+    return Network.create_from_config(config_path)
+
+
+def _brute_force(network, terminals, failed):
+    """Counts disconnected pairs and the latency increase using a fork."""
+    scenario = network.fork()
+    for node in failed:
+        scenario.take_offline(node.id)
+    disconnected, increase = 0, 0
+    for first, second in itertools.combinations(terminals, 2):
+        if first in failed or second in failed:
+            continue
+        base = network.find_shortest_path(first.id, second.id)[1]
+        latency = scenario.find_shortest_path(first.id, second.id)[1]
+        if latency == float("inf"):
+            disconnected += 1
+        else:
+            increase += latency - base
+    return disconnected, increase
+
+
+def test_n1_ranking_matches_brute_force(network):
+    terminals = list(network.nodes.values())[::10]
+    version = network.topology_version
+    report = ContingencyAnalysis(
+        network, [node.id for node in terminals], workers=1
+    ).run(limit=1000)
+    assert network.topology_version == version
+    assert all(node.is_active for node in network.nodes.values())
+    assert report["reused"] > 0
+
+    ranked = {tuple(impact["failed"]): impact for impact in report["ranking"]}
+    for node in network.nodes.values():
+        disconnected, increase = _brute_force(network, terminals, [node])
+        impact = ranked.get((node.name,))
+        if impact is None:
+            assert (disconnected, increase) == (0, 0) and node not in terminals
+        else:
+            assert impact["disconnected_pairs"] == disconnected
+            assert impact["total_increase"] == increase
+    keys = [
+        (len(i["lost_terminals"]), i["disconnected_pairs"], i["total_increase"])
+        for i in report["ranking"]
+    ]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_sampled_n2_in_worker_processes_matches_serial(network, monkeypatch):
+    monkeypatch.setattr(contingency, "PARALLEL_MIN_SCENARIOS", 0)
+    terminals = [node.id for node in list(network.nodes.values())[:6]]
+    options = {"latency_threshold": 30, "double_failures": 40, "seed": 3}
+    serial = ContingencyAnalysis(network, terminals, workers=1, **options).run()
+    parallel = ContingencyAnalysis(network, terminals, workers=2, **options).run()
+    assert parallel["scenarios"]["n-2_sampled"] == 40
+    for report in (serial, parallel):
+        del report["elapsed"]
+    assert parallel == serial
+
+
+def test_bridge_failure_ranks_first():
+    network = Network()
+    nodes = [Node(name) for name in "ABCDE"]
+    node_a, node_b, node_c, node_d, node_e = nodes
+    node_a.add_neighbor(node_b, 1)
+    node_b.add_neighbor(node_c, 1)
+    node_a.add_neighbor(node_c, 5)
+    node_c.add_neighbor(node_d, 1)
+    node_d.add_neighbor(node_e, 1)
+    for node in nodes:
+        network.add_node(node)
+    report = ContingencyAnalysis(
+        network, [node_a.id, node_e.id], latency_threshold=5
+    ).run()
+    # Losing a terminal outranks cutting the path between the others.
+    assert [impact["failed"] for impact in report["ranking"]] == [
+        ["A"],
+        ["E"],
+        ["C"],
+        ["D"],
+        ["B"],
+    ]
+    assert report["ranking"][2]["disconnected_pairs"] == 1
+    assert report["ranking"][-1] == {
+        "failed": ["B"],
+        "lost_terminals": [],
+        "disconnected_pairs": 0,
+        "degraded_pairs": 1,
+        "worst_increase": 3,
+        "worst_pair": ["A", "E"],
+        "total_increase": 3,
+    }
@@ -0,0 +1,63 @@
+# backend/tests/test_distances.py
+
+import numpy as np
+import pytest
+from aegis_simulator import distances
+from aegis_simulator.models import Network
+from aegis_simulator.topology import generate_topology, write_config
+
+
+@pytest.fixture
+def network(tmp_path):
+    config_path = str(tmp_path / "mesh.yml")
+    write_config(generate_topology("geometric", 120, seed=2), config_path)
+    network = Network.create_from_config(config_path)
+    for node in list(network.nodes.values())[::7]:
+        node.take_offline()
+    return network
+
+
+def _expected(network, source_ids):
+    graph = network.view().graph
+    return np.array(
+        [graph.shortest_path_tree(graph.index[node_id]).dist for node_id in source_ids]
+    )
+
+
+def test_distances_from_matches_path_queries(network):
+    source = next(node for node in network.nodes.values() if node.is_active)
+    table = network.distances_from(source.id)
+    assert table.sources == [source]
+    for node, latency in zip(table.nodes, table.values):
+        assert network.find_shortest_path(source.id, node.id)[1] == latency
+    assert network.distances_from("missing") is None
+
+
+def test_floyd_warshall_and_dijkstra_agree(network):
+    graph = network.view().graph
+    matrix = distances.floyd_warshall(graph)
+    rows = distances._dijkstra_rows(graph, range(len(graph)))
+    np.testing.assert_array_equal(matrix, rows)
+
+
+def test_distance_matrix_in_worker_processes(network, monkeypatch):
+    # Force the Dijkstra path and a worker pool even for this small graph.
+    monkeypatch.setattr(distances, "FLOYD_WARSHALL_MAX_NODES", 0)
+    monkeypatch.setattr(distances, "PARALLEL_MIN_WORK", 0)
+    ids = list(network.nodes)[:40]
+    table = network.distance_matrix(ids, workers=2)
+    assert [node.id for node in table.sources] == ids
+    np.testing.assert_array_equal(table.values, _expected(network, ids))
+    with pytest.raises(ValueError):
+        network.distance_matrix(["missing"])
+
+
+def test_distance_stream_round_trip(network):
+    table = network.distance_matrix()
+    names = [node.name for node in table.nodes]
+    data = distances.stream_header(names, names) + distances.encode_rows(table.values)
+    decoded = distances.read_stream(data)
+    assert decoded.sources == names and decoded.nodes == names
+    np.testing.assert_array_equal(decoded.values, table.values)
+    with pytest.raises(ValueError):
+        distances.read_stream(data[:-8])
@@ -0,0 +1,85 @@
+# backend/tests/test_eventlog.py
+
+from aegis_simulator.eventlog import EventLog
+from aegis_simulator.events import EventRecord
+
+NAN = float("nan")
+
+
+def _route(at, source, destination, success=True):
+    return EventRecord(
+        at,
+        "MESSAGE_ROUTE",
+        source,
+        destination,
+        1 if success else 0,
+        10.0 if success else NAN,
+        NAN,
+        (source, destination) if success else None,
+        None,
+    )
+
+
+def test_search_filters_by_node_status_and_time(tmp_path):
+    with EventLog(str(tmp_path / "events.db"), flush_interval=0.01) as log:
+        log.submit(
+            [
+                _route(100.0, "A", "B"),
+                _route(101.0, "B", "C", success=False),
+                _route(102.0, "C", "A"),
+                _route(103.0, "C", "D"),
+            ]
+        )
+        assert log.flush(timeout=5)
+
+        assert log.count() == 4
+        assert [e["details"] for e in log.search(node="A")] == [
+            "Route from 'C' to 'A' SUCCEEDED.",
+            "Route from 'A' to 'B' SUCCEEDED.",
+        ]
+        failed = log.search(status="FAILED")
+        assert len(failed) == 1
+        assert failed[0]["path_taken"] == "No path found"
+        assert failed[0]["total_latency_ms"] == "N/A"
+        window = log.search(start=101.0, end=103.0)
+        assert [e["id"] for e in window] == [3, 2]
+        assert log.search(source="C", limit=1)[0]["path_taken"] == "C -> D"
+        assert [e["id"] for e in log.search(before_id=3)] == [2, 1]
+        assert log.search(start=200.0) == []
+
+
+def test_events_survive_reopening(tmp_path):
+    path = str(tmp_path / "events.db")
+    with EventLog(path) as log:
+        log.submit([_route(100.0, "A", "B")])
+    with EventLog(path) as log:
+        assert log.search(destination="B")[0]["total_latency_ms"] == 10
+
+
+def test_status_filter_only_matches_routing_events(tmp_path):
+    offline = EventRecord(100.0, "STATUS_CHANGE", None, "A", 0, NAN, NAN, None, None)
+    online = EventRecord(101.0, "STATUS_CHANGE", None, "A", 1, NAN, NAN, None, None)
+    with EventLog(str(tmp_path / "events.db"), flush_interval=0.01) as log:
+        log.submit([offline, online, _route(102.0, "A", "B")])
+        assert log.flush(timeout=5)
+
+        assert [e["id"] for e in log.search(status="SUCCESS")] == [3]
+        assert log.search(status="FAILED") == []
+        assert len(log.search(event_type="STATUS_CHANGE")) == 2
+
+
+def test_time_window_search_tolerates_out_of_order_timestamps(tmp_path):
+    with EventLog(str(tmp_path / "events.db"), flush_interval=0.01) as log:
+        log.submit(
+            [
+                _route(100.0, "A", "B"),
+                _route(103.0, "B", "C"),
+                _route(101.0, "C", "A"),
+                _route(104.0, "C", "D"),
+            ]
+        )
+        assert log.flush(timeout=5)
+
+        assert [e["id"] for e in log.search(start=101.0)] == [4, 3, 2]
+        assert [e["id"] for e in log.search(end=102.0)] == [3, 1]
+        assert [e["id"] for e in log.search(start=101.0, end=104.0)] == [3, 2]
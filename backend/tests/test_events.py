@@ -0,0 +1,92 @@
+# backend/tests/test_events.py
+
+import pytest
+from aegis_simulator.events import EventStore
+from aegis_simulator.models import Node
+
+
+def _log_status(store, node, at, online=False):
+    return store.append(
+        "STATUS_CHANGE", at, destination=store.node_number(node), status=int(online)
+    )
+
+
+def test_ring_buffer_keeps_only_the_newest_events():
+    store = EventStore(capacity=3)
+    node = Node("NodeA")
+    for second in range(5):
+        _log_status(store, node, 1000.0 + second, online=second % 2 == 0)
+
+    assert len(store) == 3
+    assert (store.first_seq, store.next_seq) == (2, 5)
+    assert store.get(1) is None
+    recent = store.recent(limit=2)
+    assert [entry["details"] for entry in recent] == [
+        "Node 'NodeA' brought ONLINE.",
+        "Node 'NodeA' taken OFFLINE.",
+    ]
+
+
+def test_range_queries_and_type_filter():
+    store = EventStore(capacity=4)
+    a, b = Node("NodeA"), Node("NodeB")
+    for second in range(6):
+        if second % 2:
+            _log_status(store, a, 100.0 + second)
+        else:
+            store.append(
+                "MESSAGE_ROUTE",
+                100.0 + second,
+                store.node_number(a),
+                store.node_number(b),
+                1,
+                7,
+                path=(store.node_number(a), store.node_number(b)),
+            )
+
+    window = store.entries(start=103.0, end=105.0)
+    assert [entry["event_type"] for entry in window] == [
+        "STATUS_CHANGE",
+        "MESSAGE_ROUTE",
+    ]
+    routes = store.entries(event_type="MESSAGE_ROUTE")
+    assert len(routes) == 2
+    assert routes[0]["path_taken"] == "NodeA -> NodeB"
+    assert routes[0]["total_latency_ms"] == 7
+    assert store.entries(event_type="UNKNOWN") == []
+    assert store.entries(limit=1)[0]["event_type"] == "MESSAGE_ROUTE"
+
+
+def test_max_age_expires_old_events():
+    store = EventStore(capacity=10, max_age=5.0)
+    node = Node("NodeA")
+    _log_status(store, node, 100.0)
+    _log_status(store, node, 103.0)
+    _log_status(store, node, 107.0)
+    assert store.first_seq == 1
+    assert len(store) == 2
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        EventStore(capacity=0)
+
+
+def test_after_returns_each_event_once_and_counts_missed():
+    store = EventStore(capacity=4)
+    node = Node("NodeA")
+    for second in range(3):
+        _log_status(store, node, 100.0 + second)
+
+    entries, missed = store.after(-1, limit=2)
+    assert [entry["seq"] for entry in entries] == [0, 1]
+    assert missed == 0
+    entries, missed = store.after(entries[-1]["seq"])
+    assert [entry["seq"] for entry in entries] == [2]
+
+    for second in range(5):
+        _log_status(store, node, 200.0 + second)
+    entries, missed = store.after(2)
+    assert [entry["seq"] for entry in entries] == [4, 5, 6, 7]
+    assert missed == 1
+    assert store.after(7) == ([], 0)
@@ -0,0 +1,65 @@
+# backend/tests/test_fork.py
+
+from aegis_simulator.models import Message, Network, Node
+
+
+def _square():
+    network = Network()
+    nodes = [Node(name) for name in "ABCD"]
+    node_a, node_b, node_c, node_d = nodes
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_d, 5)
+    node_a.add_neighbor(node_c, 8)
+    node_c.add_neighbor(node_d, 8)
+    for node in nodes:
+        network.add_node(node)
+    return network, nodes
+
+
+def test_fork_changes_do_not_touch_the_network():
+    network, (node_a, node_b, node_c, node_d) = _square()
+    version = network.topology_version
+    scenario = network.fork()
+
+    assert scenario.take_offline(node_b.id)
+    path, latency = scenario.find_shortest_path(node_a.id, node_d.id)
+    assert [n.name for n in path] == ["A", "C", "D"] and latency == 16
+    assert scenario.set_link_latency("C", "D", 1)
+    assert not scenario.set_link_latency("A", "D", 1)
+    assert scenario.find_shortest_path(node_a.id, node_d.id)[1] == 9
+    assert scenario.changes() == {
+        "offline": ["B"],
+        "online": [],
+        "latencies": [{"from": "C", "to": "D", "latency": 1}],
+    }
+
+    assert node_b.is_active and network.topology_version == version
+    assert network.find_shortest_path(node_a.id, node_d.id)[1] == 10
+    # Forks share the view's arrays until they have changes of their own.
+    graph = network.fork().compact_graph()
+    assert graph.active is network.view().graph.active
+    assert graph.latencies is network.view().graph.latencies
+
+
+def test_forks_of_forks_and_later_network_changes_are_independent():
+    network, (node_a, node_b, node_c, node_d) = _square()
+    first = network.fork()
+    first.take_offline(node_b.id)
+    second = first.fork()
+    second.take_offline(node_c.id)
+    node_c.take_offline()
+
+    assert first.find_shortest_path(node_a.id, node_d.id)[1] == 16
+    assert second.find_shortest_path(node_a.id, node_d.id) == (None, float("inf"))
+    assert second.bring_online(node_c.id)
+    assert second.changes()["offline"] == ["B"]
+    assert network.find_shortest_path(node_a.id, node_d.id)[1] == 10
+
+    results = first.route_messages(
+        [Message(node_a.id, node_d.id, ""), Message(node_a.id, node_b.id, "")]
+    )
+    assert [(success, latency) for success, _, latency in results] == [
+        (True, 16),
+        (False, float("inf")),
+    ]
+    assert first.route_message(Message(node_a.id, node_d.id, ""))
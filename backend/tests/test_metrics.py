@@ -0,0 +1,91 @@
+# backend/tests/test_metrics.py
+
+from aegis_simulator import metrics
+from aegis_simulator.graph import CompactGraph
+from aegis_simulator.metrics import MetricsRegistry
+from aegis_simulator.models import Message, Network, Node
+
+
+def _line_network():
+    network = Network()
+    nodes = [Node(f"N{i}") for i in range(4)]
+    for node in nodes:
+        network.add_node(node)
+    for left, right in zip(nodes, nodes[1:]):
+        left.add_neighbor(right, 5)
+    return network, nodes
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "demo_seconds", "Demo.", buckets=(0.1, 1.0), label_names=("op",)
+    )
+    for value in (0.05, 0.5, 2.0):
+        histogram.observe(value, ("a",))
+    registry.counter("demo_total", "Demo count.").inc(3)
+    registry.add_collector(lambda: [("demo_size", "gauge", "Size.", [({}, 7)])])
+
+    text = registry.render()
+    assert 'demo_seconds_bucket{op="a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{op="a",le="1"} 2' in text
+    assert 'demo_seconds_bucket{op="a",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{op="a"} 3' in text
+    assert "demo_total 3" in text
+    assert "# TYPE demo_size gauge\ndemo_size 7" in text
+
+
+def test_enable_instruments_hot_paths_and_disable_restores_them():
+    # Importing the app (test_app) turns metrics on; start from a clean slate.
+    was_enabled = metrics.is_enabled()
+    metrics.disable()
+    original = Network.__dict__["find_shortest_path"]
+    metrics.enable()
+    try:
+        durations = metrics.registry.histogram(
+            "aegis_network_operation_seconds", "", label_names=("operation",)
+        )
+        before = durations.count(("find_shortest_path",))
+        network, nodes = _line_network()
+        network.find_shortest_path(nodes[0].id, nodes[3].id, strategy="bidirectional")
+        network.route_message(Message(nodes[0].id, nodes[3].id, "x"))
+
+        assert durations.count(("find_shortest_path",)) == before + 2
+        text = metrics.registry.render()
+        assert 'aegis_search_settled_nodes_count{search="bidirectional"}' in text
+        assert 'aegis_messages_routed_total{result="delivered"}' in text
+    finally:
+        metrics.disable()
+    assert Network.__dict__["find_shortest_path"] is original
+    assert not hasattr(CompactGraph.shortest_path, "__wrapped__")
+    assert not metrics.is_enabled()
+    if was_enabled:
+        metrics.enable()
+
+
+def test_tree_alt_and_ch_searches_record_settled_nodes():
+    was_enabled = metrics.is_enabled()
+    metrics.disable()
+    metrics.enable()
+    try:
+        settled = metrics.registry.histogram(
+            "aegis_search_settled_nodes",
+            "",
+            buckets=metrics.SIZE_BUCKETS,
+            label_names=("search",),
+        )
+        network, nodes = _line_network()
+        trees = settled.count(("tree",))
+        network.route_messages([Message(nodes[0].id, nodes[3].id, "x")])
+        assert settled.count(("tree",)) == trees + 1
+        graph = network.view().graph
+        graph.shortest_path_tree(0)
+        assert graph.last_settled() == 4
+        for search in ("alt", "ch"):
+            before = settled.count((search,))
+            network.find_shortest_path(nodes[0].id, nodes[3].id, strategy=search)
+            assert settled.count((search,)) == before + 1
+    finally:
+        metrics.disable()
+        if was_enabled:
+            metrics.enable()
@@ -170,3 +170,259 @@ def test_route_message_failure_no_path():
     network.add_node(node_b)
     message = Message(node_a.id, node_b.id, "Message to nowhere")
     assert network.route_message(message) is False
+
+
+def _build_random_network(seed, use_compact_graph, node_count=40, link_count=90):
+    import random
+
+    rng = random.Random(seed)
+    network = Network(use_compact_graph=use_compact_graph)
+    nodes = [Node(f"N{i}") for i in range(node_count)]
+    for node in nodes:
+        network.add_node(node)
+    for _ in range(link_count):
+        a, b = rng.sample(nodes, 2)
+        a.add_neighbor(b, rng.randint(1, 100))
+    return network, nodes
+
+
+def test_compact_graph_matches_dict_pathfinder():
+    compact, compact_nodes = _build_random_network(7, use_compact_graph=True)
+    plain, plain_nodes = _build_random_network(7, use_compact_graph=False)
+    for i in (3, 11, 25):
+        compact_nodes[i].take_offline()
+        plain_nodes[i].take_offline()
+    for i in range(0, 40, 3):
+        for j in range(1, 40, 7):
+            path_c, latency_c = compact.find_shortest_path(
+                compact_nodes[i].id, compact_nodes[j].id
+            )
+            path_p, latency_p = plain.find_shortest_path(
+                plain_nodes[i].id, plain_nodes[j].id
+            )
+            assert latency_c == latency_p
+            assert (path_c is None) == (path_p is None)
+
+
+def test_compact_graph_tracks_latency_status_and_new_links():
+    network = Network()
+    node_a, node_b, node_c = Node("A"), Node("B"), Node("C")
+    for node in (node_a, node_b, node_c):
+        network.add_node(node)
+    node_a.add_neighbor(node_b, 10)
+    node_b.add_neighbor(node_c, 10)
+    assert network.find_shortest_path(node_a.id, node_c.id)[1] == 20
+
+    network.set_link_latency("A", "B", 40)
+    assert network.find_shortest_path(node_a.id, node_c.id)[1] == 50
+
+    node_a.add_neighbor(node_c, 30)
+    path, latency = network.find_shortest_path(node_a.id, node_c.id)
+    assert latency == 30
+    assert path == [node_a, node_c]
+
+    node_c.take_offline()
+    assert network.find_shortest_path(node_a.id, node_c.id) == (None, float("inf"))
+    node_c.bring_online()
+    assert network.find_shortest_path(node_a.id, node_c.id)[1] == 30
+
+
+def test_path_cache_hits_and_invalidates_on_topology_change():
+    network = Network()
+    node_a, node_b, node_c = Node("A"), Node("B"), Node("C")
+    for node in (node_a, node_b, node_c):
+        network.add_node(node)
+    node_a.add_neighbor(node_b, 10)
+    node_b.add_neighbor(node_c, 10)
+
+    # The first miss is answered by an early-exit search; the second miss
+    # from the same source builds and caches the whole tree.
+    network.find_shortest_path(node_a.id, node_c.id)
+    assert network.path_cache_info()["size"] == 0
+    network.find_shortest_path(node_a.id, node_b.id)
+    network.find_shortest_path(node_a.id, node_c.id)
+    info = network.path_cache_info()
+    assert (info["misses"], info["hits"], info["size"]) == (2, 1, 1)
+
+    version = network.topology_version
+    network.set_link_latency("B", "C", 5)
+    assert network.topology_version > version
+    assert network.find_shortest_path(node_a.id, node_c.id)[1] == 15
+    info = network.path_cache_info()
+    assert (info["misses"], info["size"]) == (3, 0)
+
+    node_b.take_offline()
+    assert network.find_shortest_path(node_a.id, node_c.id)[0] is None
+
+
+def test_watched_source_tree_is_repaired_incrementally():
+    import random
+
+    rng = random.Random(3)
+    watched, nodes = _build_random_network(11, use_compact_graph=True)
+    reference, ref_nodes = _build_random_network(11, use_compact_graph=False)
+    watched.watch_source(nodes[0].id)
+    watched.watch_source(nodes[5].id)
+    watched.find_shortest_path(nodes[0].id, nodes[1].id)
+    watched.find_shortest_path(nodes[5].id, nodes[1].id)
+    links = [
+        (a.name, b.name) for a in nodes for b in a.neighbors if a.name < b.name
+    ]
+
+    for _ in range(60):
+        roll = rng.random()
+        if roll < 0.3:
+            i = rng.randrange(len(nodes))
+            for node in (nodes[i], ref_nodes[i]):
+                node.take_offline()
+        elif roll < 0.6:
+            i = rng.randrange(len(nodes))
+            for node in (nodes[i], ref_nodes[i]):
+                node.bring_online()
+        else:
+            name1, name2 = rng.choice(links)
+            latency = rng.randint(1, 100)
+            watched.set_link_latency(name1, name2, latency)
+            reference.set_link_latency(name1, name2, latency)
+
+        for source in (0, 5):
+            for target in range(len(nodes)):
+                _, latency = watched.find_shortest_path(
+                    nodes[source].id, nodes[target].id
+                )
+                _, expected = reference.find_shortest_path(
+                    ref_nodes[source].id, ref_nodes[target].id
+                )
+                assert latency == expected
+
+
+def test_path_strategies_agree_and_goal_directed_search_settles_less():
+    network = Network()
+    row = [Node(f"R{i}") for i in range(200)]
+    for node in row:
+        network.add_node(node)
+    for left, right in zip(row, row[1:]):
+        left.add_neighbor(right, 5)
+    row[50].take_offline()
+    row[40].add_neighbor(row[60], 200)
+
+    graph = network.compact_graph()
+    results = {}
+    settled = {}
+    for strategy in Network.PATH_STRATEGIES:
+        path, latency = network.find_shortest_path(
+            row[120].id, row[180].id, strategy=strategy
+        )
+        results[strategy] = ([n.name for n in path], latency)
+        settled[strategy] = graph.last_settled()
+    assert len(set(map(str, results.values()))) == 1
+    assert results["alt"][1] == 300
+
+    network.find_shortest_path(row[120].id, row[180].id, strategy="bidirectional")
+    bidirectional_settled = graph.last_settled()
+    graph.shortest_path(graph.index[row[120].id], graph.index[row[180].id])
+    assert bidirectional_settled <= graph.last_settled()
+    assert settled["alt"] < graph.last_settled()
+
+    path, latency = network.find_shortest_path(row[0].id, row[100].id, strategy="alt")
+    assert latency == 200 + 5 * 80
+    network.set_link_latency("R40", "R60", 10)
+    path, latency = network.find_shortest_path(row[0].id, row[100].id, strategy="alt")
+    assert latency == 10 + 5 * 80
+
+
+def test_find_shortest_path_rejects_unknown_strategy():
+    network = Network()
+    node = Node("A")
+    network.add_node(node)
+    with pytest.raises(ValueError):
+        network.find_shortest_path(node.id, node.id, strategy="teleport")
+
+
+def test_contraction_hierarchy_reports_stats_and_follows_status_changes():
+    network, nodes = _build_random_network(5, use_compact_graph=True)
+    stats = network.build_contraction_hierarchy()
+    assert stats["nodes"] == len(nodes)
+    assert stats["memory_bytes"] > 0
+    assert stats["upward_arcs"] >= stats["links"]
+
+    source, target = nodes[0], nodes[17]
+    path, latency = network.find_shortest_path(source.id, target.id, strategy="ch")
+    assert latency == network.find_shortest_path(source.id, target.id)[1]
+
+    for node in path[1:-1]:
+        node.take_offline()
+    rerouted, new_latency = network.find_shortest_path(
+        source.id, target.id, strategy="ch"
+    )
+    assert new_latency == network.find_shortest_path(source.id, target.id)[1]
+    if rerouted:
+        assert all(node.is_active for node in rerouted)
+
+
+def test_route_messages_shares_trees_and_preserves_order():
+    network = Network()
+    node_a, node_b, node_c, node_d = Node("A"), Node("B"), Node("C"), Node("D")
+    for node in (node_a, node_b, node_c, node_d):
+        network.add_node(node)
+    node_a.add_neighbor(node_b, 10)
+    node_b.add_neighbor(node_c, 10)
+
+    messages = [
+        Message(node_a.id, node_c.id, "1"),
+        Message(node_b.id, node_a.id, "2"),
+        Message(node_a.id, node_d.id, "3"),
+        Message(node_a.id, node_b.id, "4"),
+    ]
+    results = network.route_messages(messages)
+
+    assert [success for success, _, _ in results] == [True, True, False, True]
+    assert results[0][1] == [node_a, node_b, node_c]
+    assert results[0][2] == 20
+    assert results[2][1] is None
+    assert network.path_cache_info()["misses"] == 2
+
+
+def test_network_listeners_receive_topology_changes():
+    network = Network()
+    a, b = Node("A"), Node("B")
+    network.add_node(a)
+    network.add_node(b)
+    events = []
+    network.add_listener(lambda event_type, data: events.append((event_type, data)))
+
+    a.add_neighbor(b, 10)
+    network.set_link_latency("A", "B", 4)
+    b.take_offline()
+
+    assert [event_type for event_type, _ in events] == [
+        "link_added",
+        "link_latency",
+        "node_status",
+    ]
+    assert events[1][1] == {"from": a.id, "to": b.id, "latency": 4}
+    assert events[2][1] == {"id": b.id, "name": "B", "is_active": False}
+
+    network.remove_listener(network._listeners[0])
+    b.bring_online()
+    assert len(events) == 3
+
+
+def test_changes_since_reports_changed_nodes_and_links():
+    network = Network(journal_size=4)
+    a, b, c = Node("A"), Node("B"), Node("C")
+    for node in (a, b, c):
+        network.add_node(node)
+    a.add_neighbor(b, 10)
+    version = network.topology_version
+
+    assert network.changes_since(version) == (set(), set())
+    c.take_offline()
+    network.set_link_latency("A", "B", 3)
+    nodes, links = network.changes_since(version)
+    assert nodes == {c.id}
+    assert links == {tuple(sorted((a.id, b.id)))}
+
+    # Older versions have been trimmed from the four-entry journal.
+    assert network.changes_since(0) is None
+    assert network.changes_since(network.topology_version + 1) is None
@@ -0,0 +1,102 @@
+# backend/tests/test_paths.py
+
+from aegis_simulator.models import Message, Network, Node
+from aegis_simulator.paths import k_shortest_paths
+from aegis_simulator.topology import generate_topology, write_config
+
+
+def _ladder():
+    """A - B - C on top, D - E - F below, with rungs A-D, B-E and C-F."""
+    network = Network()
+    nodes = {name: Node(name) for name in "ABCDEF"}
+    for first, second, latency in [
+        ("A", "B", 1),
+        ("B", "C", 1),
+        ("D", "E", 2),
+        ("E", "F", 2),
+        ("A", "D", 1),
+        ("B", "E", 1),
+        ("C", "F", 1),
+    ]:
+        nodes[first].add_neighbor(nodes[second], latency)
+    for node in nodes.values():
+        network.add_node(node)
+    return network, nodes
+
+
+def _names(path):
+    return "".join(node.name for node in path)
+
+
+def test_k_shortest_paths_are_loopless_and_ordered():
+    network, nodes = _ladder()
+    paths = network.k_shortest_paths(nodes["A"].id, nodes["C"].id, 4)
+    assert [latency for _, latency in paths] == [2, 5, 5, 6]
+    assert len({_names(path) for path, _ in paths}) == 4
+    for path, _ in paths:
+        assert len(set(path)) == len(path)
+
+
+def test_k_shortest_paths_match_brute_force_on_a_grid(tmp_path):
+    config_path = str(tmp_path / "grid.yml")
+    write_config(generate_topology("grid", 16, seed=3), config_path)
+    graph = Network.create_from_config(config_path).compact_graph()
+    found = [latency for _, latency in k_shortest_paths(graph, 0, 15, 8)]
+
+    def simple_paths(path):
+        if path[-1] == 15:
+            yield sum(
+                graph.latencies[graph._edge_position(u, v)]
+                for u, v in zip(path, path[1:])
+            )
+            return
+        u = path[-1]
+        for k in range(graph.offsets[u], graph.offsets[u + 1]):
+            if graph.targets[k] not in path:
+                yield from simple_paths(path + [graph.targets[k]])
+
+    expected = sorted(simple_paths([0]))[:8]
+    assert found == expected
+
+
+def test_disjoint_backup_shares_no_node_with_the_primary():
+    network, nodes = _ladder()
+    (primary, latency), (backup, backup_latency) = network.disjoint_paths(
+        nodes["A"].id, nodes["C"].id
+    )
+    assert (_names(primary), latency) == ("ABC", 2)
+    assert (_names(backup), backup_latency) == ("ADEFC", 6)
+
+
+def test_protected_routes_fail_over_to_standby_paths():
+    network, nodes = _ladder()
+    standby = network.protect_route(nodes["A"].id, nodes["C"].id, k=2)
+    assert [(_names(path), up) for path, _, up in standby][0] == ("ABC", True)
+    assert "ADEFC" in {_names(path) for path, _, _ in standby}
+
+    message = Message(nodes["A"].id, nodes["C"].id, "x")
+    nodes["B"].take_offline()
+    assert network.route_message(message)
+    paths = network.standby_paths(nodes["A"].id, nodes["C"].id)
+    assert [up for _, _, up in paths] == [False, False, True]
+
+    # Standby paths are rebuilt once new links change the graph.
+    shortcut = Node("G")
+    shortcut.add_neighbor(nodes["A"], 1)
+    shortcut.add_neighbor(nodes["C"], 1)
+    network.add_node(shortcut)
+    assert network.route_message(message)
+    paths = network.standby_paths(nodes["A"].id, nodes["C"].id)
+    assert any(_names(path) == "AGC" and up for path, _, up in paths)
+
+
+def test_protected_routes_are_bounded(monkeypatch):
+    network, nodes = _ladder()
+    monkeypatch.setattr(network, "MAX_PROTECTED_ROUTES", 2)
+    network.protect_route(nodes["A"].id, nodes["C"].id, k=2)
+    network.protect_route(nodes["A"].id, nodes["F"].id, k=2)
+    network.protect_route(nodes["A"].id, nodes["C"].id, k=2)
+    network.protect_route(nodes["B"].id, nodes["E"].id, k=2)
+    assert network.standby_paths(nodes["A"].id, nodes["F"].id) is None
+    assert network.standby_paths(nodes["A"].id, nodes["C"].id) is not None
+    assert network.standby_paths(nodes["B"].id, nodes["E"].id) is not None
@@ -0,0 +1,107 @@
+# backend/tests/test_reliability.py
+
+import numpy as np
+import pytest
+from aegis_simulator.graph import CompactGraph
+from aegis_simulator.models import Network, Node
+from aegis_simulator.reliability import ReliabilityEstimator
+from aegis_simulator.topology import generate_topology, write_config
+
+
+@pytest.fixture
+def network(tmp_path):
+    config_path = str(tmp_path / "mesh.yml")
+    write_config(generate_topology("scale_free", 60, seed=4), config_path)
+    return Network.create_from_config(config_path)
+
+
+def _chain():
+    network = Network()
+    nodes = [Node(name) for name in "ABC"]
+    nodes[0].add_neighbor(nodes[1], 2)
+    nodes[1].add_neighbor(nodes[2], 3)
+    for node in nodes:
+        network.add_node(node)
+    return network, nodes
+
+
+def test_batched_search_matches_dijkstra_per_trial(network):
+    estimator = ReliabilityEstimator(network, failure_probability=0.2, jitter=0.5)
+    graph = estimator.graph
+    alive = estimator._rng.random((20, len(graph))) >= estimator.failure
+    samples = estimator._sample_latencies(20)
+    weights = samples[:, estimator._link_of]
+    batch = estimator._link_weights(alive, samples)
+    dist = estimator._distances(3, alive, batch)
+    # Searches toward chosen destinations stop early but agree on them.
+    pruned = estimator._distances(3, alive, batch, [7, 40])
+    assert (pruned[:, [7, 40]] == dist[:, [7, 40]]).all()
+    for trial in range(20):
+        trial_graph = CompactGraph.from_arrays(
+            graph.nodes,
+            graph.offsets,
+            graph.targets,
+            weights[trial].tolist(),
+            bytearray(alive[trial].astype(np.uint8).tobytes()),
+            graph.index,
+        )
+        expected = trial_graph.shortest_path_tree(3).dist
+        assert dist[trial] == pytest.approx(np.array(expected, dtype=float))
+
+
+def test_without_failures_every_trial_takes_the_shortest_path(network):
+    nodes = list(network.nodes.values())
+    pairs = [(nodes[0].id, nodes[-1].id), (nodes[0].id, nodes[5].id)]
+    results = ReliabilityEstimator(network).run(pairs, trials=50)
+    for (source, destination), result in zip(pairs, results):
+        latency = network.find_shortest_path(source, destination)[1]
+        assert result["delivery_probability"] == 1.0
+        assert result["mean_latency"] == pytest.approx(latency)
+        assert set(result["latency_percentiles"].values()) == {latency}
+
+
+def test_delivery_probability_converges():
+    network, (node_a, node_b, node_c) = _chain()
+    estimator = ReliabilityEstimator(
+        network,
+        failure_probabilities={node_b.id: 0.3},
+        link_distributions={(node_c.id, node_b.id): ("uniform", 1, 5)},
+        seed=7,
+    )
+    [result] = estimator.run([(node_a.id, node_c.id)], trials=20000, batch_size=3000)
+    assert result["source"] == "A" and result["destination"] == "C"
+    assert result["delivery_probability"] == pytest.approx(0.7, abs=0.02)
+    assert result["standard_error"] < 0.005
+    assert result["mean_latency"] == pytest.approx(5, abs=0.05)
+    assert 2 + 1 <= result["latency_percentiles"]["50"] <= 2 + 5
+
+
+def test_offline_nodes_always_fail():
+    network, (node_a, node_b, node_c) = _chain()
+    node_b.take_offline()
+    [result] = ReliabilityEstimator(network).run([(node_a.id, node_c.id)], 100)
+    assert result["delivery_probability"] == 0.0
+    assert result["mean_latency"] is None
+    assert result["latency_percentiles"] is None
+
+
+def test_rejects_unknown_links_and_bad_distributions():
+    network, (node_a, node_b, node_c) = _chain()
+    with pytest.raises(ValueError):
+        # A and C are not linked.
+        ReliabilityEstimator(
+            network, link_distributions={(node_a.id, node_c.id): ("fixed", 1)}
+        )
+    with pytest.raises(ValueError):
+        ReliabilityEstimator(
+            network, link_distributions={(node_b.id, node_a.id): ("normal", 1)}
+        )
+    with pytest.raises(ValueError):
+        ReliabilityEstimator(network, failure_probability=1.5)
+    with pytest.raises(ValueError):
+        ReliabilityEstimator(network, jitter=-1)
+    for spec in (("normal", 5, -1), ("exponential", -2), ("uniform", 5, 1)):
+        with pytest.raises(ValueError):
+            ReliabilityEstimator(
+                network, link_distributions={(node_a.id, node_b.id): spec}
+            )
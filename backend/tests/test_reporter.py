@@ -1,6 +1,9 @@
 # backend/tests/test_reporter.py
 
 import os
+import sys
+import threading
+import time
 import csv
 from unittest.mock import patch
 from aegis_simulator.reporter import Reporter
@@ -70,3 +73,90 @@ def test_reporter_writes_correct_csv(tmp_path):
         assert rows[2][3] == "FAILED"
         assert rows[2][4] == "No path found"
         assert rows[2][5] == "N/A"
+
+
+def test_log_routing_attempts_appends_in_bulk():
+    reporter = Reporter()
+    node_a, node_b = Node("NodeA"), Node("NodeB")
+    message = Message(node_a.id, node_b.id, "Batch")
+    reporter.log_routing_attempts(
+        [
+            (message, node_a, node_b, [node_a, node_b], 5, True),
+            (message, node_a, node_b, None, 0, False),
+        ]
+    )
+    assert len(reporter.log_entries) == 2
+    assert reporter.log_entries[0]["path_taken"] == "NodeA -> NodeB"
+    assert reporter.log_entries[1]["status"] == "FAILED"
+    assert reporter.log_entries[0]["timestamp"] == reporter.log_entries[1]["timestamp"]
+
+
+def test_listeners_receive_new_entries():
+    reporter = Reporter()
+    received = []
+    reporter.add_listener(received.append)
+    node = Node("NodeA")
+    reporter.log_status_change(node, False)
+    reporter.log_status_change(node, True)
+    assert received == reporter.log_entries
+    assert received[0]["details"] == "Node 'NodeA' taken OFFLINE."
+    assert received[1]["event_type"] == "STATUS_CHANGE"
+
+
+def test_wait_for_events_wakes_on_new_entry():
+    reporter = Reporter()
+    node = Node("NodeA")
+    assert reporter.wait_for_events(-1, timeout=0.01) is False
+    threading.Timer(0.05, reporter.log_status_change, (node, False)).start()
+    assert reporter.wait_for_events(-1, timeout=5) is True
+    assert reporter.recent_events(1)[0]["seq"] == 0
+
+
+def test_concurrent_logging_delivers_each_event_once():
+    # Switch threads as often as possible to expose races.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        _log_concurrently()
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def _log_concurrently():
+    reporter = Reporter()
+    delivered = []
+    reporter.add_listener(lambda entry: delivered.append(entry["details"]))
+    threads, per_thread = 8, 300
+    nodes = [[Node(f"W{t}-{i}") for i in range(per_thread)] for t in range(threads)]
+    total = threads * per_thread
+    seen = []
+
+    def read():
+        cursor, deadline = -1, time.monotonic() + 10
+        while len(seen) < total and time.monotonic() < deadline:
+            reporter.wait_for_events(cursor, timeout=1)
+            entries, missed = reporter.events_after(cursor, limit=50)
+            assert missed == 0
+            recent = reporter.recent_events(5)
+            assert all(entry["details"].startswith("Node 'W") for entry in recent)
+            seen.extend(entries)
+            if entries:
+                cursor = entries[-1]["seq"]
+
+    def write(batch):
+        for node in batch:
+            reporter.log_status_change(node, False)
+
+    reader = threading.Thread(target=read, daemon=True)
+    reader.start()
+    writers = [threading.Thread(target=write, args=(batch,)) for batch in nodes]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    reader.join(timeout=10)
+
+    assert [entry["seq"] for entry in seen] == list(range(total))
+    details = [entry["details"] for entry in seen]
+    assert len(set(details)) == total
+    assert delivered == details
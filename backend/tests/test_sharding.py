@@ -0,0 +1,76 @@
+# backend/tests/test_sharding.py
+
+import multiprocessing
+import threading
+
+from aegis_simulator.models import Node, Message, Network
+from aegis_simulator.reporter import Reporter
+from aegis_simulator.simulation import Simulation
+from aegis_simulator.sharding import ShardedSimulation, _run_shard, partition_graph
+
+
+def _ring_network(size):
+    network = Network()
+    nodes = [Node(f"R{i}") for i in range(size)]
+    for node in nodes:
+        network.add_node(node)
+    for i, node in enumerate(nodes):
+        node.add_neighbor(nodes[(i + 1) % size], 5 + i % 3)
+    return network, nodes
+
+
+def test_partition_graph_produces_balanced_contiguous_shards():
+    network, _ = _ring_network(40)
+    shard_of = partition_graph(network.compact_graph(), 4)
+    counts = [list(shard_of).count(shard) for shard in range(4)]
+    assert counts == [10, 10, 10, 10]
+
+
+def test_sharded_run_matches_single_process_simulation(tmp_path):
+    network, nodes = _ring_network(40)
+    messages = [
+        Message(nodes[i].id, nodes[(i * 7 + 13) % 40].id, f"m{i}") for i in range(40)
+    ]
+
+    single = Simulation(network, service_time=1)
+    sharded = ShardedSimulation(network, shard_count=3, service_time=1)
+    for i, message in enumerate(messages):
+        single.send(message, at=i)
+        sharded.send(message, at=i)
+    for simulation in (single, sharded):
+        simulation.schedule_failure(nodes[20].id, at=15)
+
+    single.run()
+    reporter = Reporter()
+    summary = sharded.run(reporter=reporter)
+
+    assert summary["shards"] == 3
+    assert summary["delivered"] == single.stats.delivered
+    assert sum(summary["dropped"].values()) == sum(single.stats.dropped.values())
+    expected = sorted((m.payload, at) for m, at in single.delivered)
+    assert sorted((m.payload, at) for m, at in sharded.delivered) == expected
+    assert len(reporter.log_entries) == 40
+    assert reporter.log_entries[0]["event_type"] == "MESSAGE_TRANSIT"
+
+
+def test_shard_window_excludes_its_end():
+    network, nodes = _ring_network(4)
+    graph = network.compact_graph()
+    shard_of = partition_graph(graph, 1)
+    coordinator, worker = multiprocessing.Pipe()
+    thread = threading.Thread(
+        target=_run_shard, args=(worker, graph, shard_of, 0, {}), daemon=True
+    )
+    thread.start()
+    destination = graph.index[nodes[0].id]
+    coordinator.send(("admit", [(5.0, destination, destination, 0.0, 0.0, 0, 7)]))
+
+    # A message from another shard may still arrive at the bound itself.
+    coordinator.send(("advance", 5.0))
+    outbox, next_time, delivered, dropped = coordinator.recv()
+    assert (outbox, next_time, delivered, dropped) == ([], 5.0, [], [])
+    coordinator.send(("advance", 6.0))
+    assert coordinator.recv()[2] == [(7, 5.0)]
+    coordinator.send(("stop",))
+    coordinator.recv()
+    thread.join(5)
@@ -0,0 +1,117 @@
+# backend/tests/test_shared.py
+
+import multiprocessing
+import pickle
+
+import pytest
+from aegis_simulator.graphdata import graph_delta
+from aegis_simulator.models import Network, Node
+from aegis_simulator.shared import SharedTopology
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    network = Network()
+    node_a, node_b, node_c = Node("A"), Node("B"), Node("C")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 7)
+    node_a.add_neighbor(node_c, 20)
+    for node in (node_a, node_b, node_c):
+        network.add_node(node)
+    path = str(tmp_path / "network.snapshot")
+    network.write_snapshot(path)
+    return path
+
+
+def _latency(network, start, end):
+    start, end = network.get_node_by_name(start), network.get_node_by_name(end)
+    return network.find_shortest_path(start.id, end.id)[1]
+
+
+def _change_in_other_process(snapshot_path, ring_size, changes):
+    """Runs `changes(network)` in a forked process on its own mapping."""
+
+    def run():
+        topology = SharedTopology(snapshot_path, ring_size=ring_size)
+        changes(Network.from_shared(topology))
+
+    process = multiprocessing.get_context("fork").Process(target=run)
+    process.start()
+    process.join(10)
+    assert process.exitcode == 0
+
+
+def test_shared_network_answers_queries_from_the_mapped_arrays(snapshot_path):
+    network = Network.from_shared(SharedTopology(snapshot_path))
+    node_a = network.get_node_by_name("A")
+    assert {n.name: latency for n, latency in node_a.neighbors.items()} == {
+        "B": 5,
+        "C": 20,
+    }
+    assert network.get_node_by_name("C") in node_a.neighbors
+    assert _latency(network, "A", "C") == 12
+
+    network.get_node_by_name("B").take_offline()
+    assert _latency(network, "A", "C") == 20
+    assert network.set_link_latency("A", "C", 3)
+    assert node_a.neighbors[network.get_node_by_name("C")] == 3
+    with pytest.raises(ValueError):
+        network.add_node(Node("D"))
+    # A pickled graph, e.g. for a shard worker, gets private arrays.
+    graph = pickle.loads(pickle.dumps(network.compact_graph()))
+    assert list(graph.latencies) == list(network.compact_graph().latencies)
+
+
+def test_changes_from_another_process_are_synced(snapshot_path):
+    network = Network.from_shared(SharedTopology(snapshot_path))
+    events = []
+    network.add_listener(lambda change, data: events.append(change))
+    assert _latency(network, "A", "C") == 12
+
+    def changes(other):
+        other.get_node_by_name("B").take_offline()
+        other.set_link_latency("A", "C", 9)
+
+    _change_in_other_process(snapshot_path, 65536, changes)
+    version = network.topology_version
+    assert network.sync_shared() == 2
+    assert network.get_node_by_name("B").is_active is False
+    assert events == ["node_status", "link_latency"]
+    assert network.topology_version == version + 2
+    assert _latency(network, "A", "C") == 9
+    assert network.sync_shared() == 0
+    # Versions are numbered per process, so clients always get a snapshot.
+    assert graph_delta(network, version)["full"] is True
+
+
+def test_resync_after_the_change_ring_overflows(snapshot_path):
+    network = Network.from_shared(SharedTopology(snapshot_path, ring_size=4))
+    events = []
+    network.add_listener(lambda change, data: events.append(change))
+
+    def changes(other):
+        node_b = other.get_node_by_name("B")
+        for _ in range(5):
+            node_b.take_offline()
+            node_b.bring_online()
+        node_b.take_offline()
+
+    _change_in_other_process(snapshot_path, 4, changes)
+    assert network.sync_shared() == 1
+    assert events == ["resync"]
+    assert network.get_node_by_name("B").is_active is False
+    assert network.changes_since(0) is None
+    assert _latency(network, "A", "C") == 20
+
+
+def test_shared_network_writes_a_snapshot(snapshot_path, tmp_path):
+    network = Network.from_shared(SharedTopology(snapshot_path))
+    network.get_node_by_name("B").take_offline()
+    network.set_link_latency("A", "C", 3)
+    copy_path = str(tmp_path / "copy.snapshot")
+    network.write_snapshot(copy_path)
+
+    copy = Network.load_snapshot(copy_path)
+    assert copy.get_node_by_name("B").is_active is False
+    assert _latency(copy, "A", "C") == 3
+    assert copy.get_node_by_name("A").id == network.get_node_by_name("A").id
@@ -0,0 +1,96 @@
+# backend/tests/test_simulation.py
+
+import pytest
+from aegis_simulator.models import Node, Message, Network
+from aegis_simulator.simulation import Simulation
+
+
+def _line_network(latencies):
+    network = Network()
+    nodes = [Node(f"L{i}") for i in range(len(latencies) + 1)]
+    for node in nodes:
+        network.add_node(node)
+    for left, right, latency in zip(nodes, nodes[1:], latencies):
+        left.add_neighbor(right, latency)
+    return network, nodes
+
+
+def test_message_arrives_after_summed_link_latency():
+    network, nodes = _line_network([10, 20, 30])
+    simulation = Simulation(network)
+    message = Message(nodes[0].id, nodes[3].id, "hello")
+    assert simulation.send(message, at=5)
+
+    stats = simulation.run()
+
+    assert stats.delivered == 1
+    assert simulation.delivered == [(message, 65)]
+    assert stats.transit_times[0] == 60
+
+
+def test_node_queue_adds_queueing_delay():
+    network, nodes = _line_network([10])
+    simulation = Simulation(network, service_time=4)
+    for _ in range(3):
+        simulation.send(Message(nodes[0].id, nodes[1].id, "burst"), at=0)
+
+    stats = simulation.run()
+
+    assert stats.delivered == 3
+    assert sorted(stats.queueing_delays) == [0, 4, 8]
+    assert stats.max_queue_length == 3
+    assert stats.summary()["queueing_delay_ms"]["mean"] == pytest.approx(4)
+
+
+def test_queue_capacity_drops_excess_messages():
+    network, nodes = _line_network([10])
+    simulation = Simulation(network, service_time=4, queue_capacity=2)
+    for _ in range(5):
+        simulation.send(Message(nodes[0].id, nodes[1].id, "burst"), at=0)
+
+    stats = simulation.run()
+
+    assert stats.delivered == 2
+    assert stats.dropped["queue_full"] == 3
+
+
+def test_failure_mid_transit_reroutes_or_drops():
+    network = Network()
+    a, b, c, d, e = Node("A"), Node("B"), Node("C"), Node("D"), Node("E")
+    for node in (a, b, c, d, e):
+        network.add_node(node)
+    a.add_neighbor(b, 10)
+    b.add_neighbor(e, 10)
+    e.add_neighbor(d, 10)
+    b.add_neighbor(c, 20)
+    c.add_neighbor(d, 20)
+
+    # E fails while the message is still on the A-B link, so B forwards it
+    # along the slower detour through C.
+    simulation = Simulation(network)
+    simulation.send(Message(a.id, d.id, "detour"), at=0)
+    simulation.schedule_failure(e.id, at=5)
+    stats = simulation.run()
+    assert stats.delivered == 1
+    assert simulation.delivered[0][1] == 50
+
+    # B itself fails before the message reaches it, so the message is lost.
+    simulation = Simulation(network)
+    simulation.send(Message(a.id, d.id, "lost"), at=0)
+    simulation.schedule_failure(b.id, at=5)
+    stats = simulation.run()
+    assert stats.delivered == 0
+    assert stats.dropped["node_offline"] == 1
+    # Scheduled failures never touch the live network.
+    assert b.is_active is True and e.is_active is True
+
+
+def test_run_until_stops_at_simulated_time():
+    network, nodes = _line_network([10, 10])
+    simulation = Simulation(network)
+    simulation.send(Message(nodes[0].id, nodes[2].id, "slow"), at=0)
+    simulation.run(until=12)
+    assert simulation.stats.delivered == 0
+    assert simulation.pending() == 1
+    simulation.run()
+    assert simulation.stats.delivered == 1
@@ -0,0 +1,95 @@
+# backend/tests/test_sink.py
+
+import csv
+import gzip
+import pytest
+from aegis_simulator.models import Message, Node
+from aegis_simulator.reporter import Reporter
+from aegis_simulator.sink import ReportSink, read_binary
+
+
+def _log_mixed_events(reporter, count=1):
+    node_a, node_b = Node("NodeA"), Node("NodeB")
+    message = Message(node_a.id, node_b.id, "x")
+    for _ in range(count):
+        reporter.log_status_change(node_b, False)
+        reporter.log_routing_attempt(message, node_a, node_b, [node_a, node_b], 9, True)
+        reporter.log_transits([(node_a, node_b, False, 12.5, 0, "no_route")])
+
+
+def test_csv_sink_keeps_columns_of_every_event_type(tmp_path):
+    reporter = Reporter()
+    with ReportSink(str(tmp_path), flush_interval=0.01) as sink:
+        reporter.add_sink(sink)
+        _log_mixed_events(reporter)
+        assert sink.flush(timeout=5)
+
+    with open(sink.files[0], newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["event_type"] for row in rows] == [
+        "STATUS_CHANGE",
+        "MESSAGE_ROUTE",
+        "MESSAGE_TRANSIT",
+    ]
+    assert rows[0]["details"] == "Node 'NodeB' taken OFFLINE."
+    assert rows[1]["path_taken"] == "NodeA -> NodeB"
+    assert rows[2]["sim_time_ms"] == "12.5"
+    assert rows[2]["details"].startswith("Transit from 'NodeA' to 'NodeB' LOST")
+
+
+def test_binary_sink_round_trips_and_rotates(tmp_path):
+    reporter = Reporter()
+    sink = ReportSink(
+        str(tmp_path), format="binary", compress=True, max_bytes=200, batch_size=1
+    )
+    reporter.add_sink(sink)
+    _log_mixed_events(reporter, count=20)
+    reporter.close()
+
+    assert len(sink.files) > 1
+    assert all(path.endswith(".bin.gz") for path in sink.files)
+    with gzip.open(sink.files[0], "rb") as f:
+        assert f.read(8) == b"AEGISEV1"
+    records = [record for path in sink.files for record in read_binary(path)]
+    assert len(records) == 60
+    assert records[1].path == ("NodeA", "NodeB")
+    assert records[1].latency == 9
+    assert records[2].reason == "no_route"
+    assert records[0].source is None and records[0].destination == "NodeB"
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ReportSink(str(tmp_path), format="xml")
+
+
+def test_write_errors_are_logged_and_counted(tmp_path, monkeypatch, caplog):
+    reporter = Reporter()
+    sink = ReportSink(str(tmp_path), flush_interval=0.01)
+    reporter.add_sink(sink)
+
+    def fail(records):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(sink, "_write", fail)
+    _log_mixed_events(reporter)
+    assert sink.flush(timeout=5)
+    assert sink.dropped == 3
+    assert "dropped 3 events: No space left on device" in caplog.text
+
+    # The writer survives the error and keeps draining the queue.
+    _log_mixed_events(reporter)
+    assert sink.flush(timeout=5)
+    assert sink.dropped == 6
+    reporter.close()
+
+
+def test_events_are_dropped_once_the_writer_thread_is_gone(tmp_path):
+    sink = ReportSink(str(tmp_path), flush_interval=0.01)
+    sink.close()
+    sink._closed = False  # As if the thread had died unexpectedly.
+    reporter = Reporter()
+    reporter.add_sink(sink)
+    _log_mixed_events(reporter)
+    assert sink.dropped == 3
+    assert not sink._pending
@@ -0,0 +1,89 @@
+# backend/tests/test_snapshot.py
+
+import pytest
+from aegis_simulator.models import Network, Node
+from aegis_simulator.snapshot import read_snapshot
+from aegis_simulator.topology import generate_topology, write_config
+
+
+def _network():
+    network = Network()
+    node_a, node_b, node_c, node_d = (Node(name) for name in "ABCD")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 7)
+    node_a.add_neighbor(node_c, 20)
+    for node in (node_a, node_b, node_c, node_d):
+        network.add_node(node)
+    node_d.take_offline()
+    return network
+
+
+def test_snapshot_round_trip_keeps_ids_links_and_status(tmp_path):
+    network = _network()
+    path = str(tmp_path / "network.snapshot")
+    network.write_snapshot(path)
+
+    loaded = Network.load_snapshot(path)
+    assert set(loaded.nodes) == set(network.nodes)
+    for node_id, node in network.nodes.items():
+        copy = loaded.get_node(node_id)
+        assert copy.name == node.name
+        assert copy.is_active == node.is_active
+        assert {n.id: lat for n, lat in copy.neighbors.items()} == {
+            n.id: lat for n, lat in node.neighbors.items()
+        }
+
+    node_a, node_c = loaded.get_node_by_name("A"), loaded.get_node_by_name("C")
+    path_nodes, latency = loaded.find_shortest_path(node_a.id, node_c.id)
+    assert [node.name for node in path_nodes] == ["A", "B", "C"]
+    assert latency == 12
+
+    # The loaded network reacts to changes like any other.
+    loaded.get_node_by_name("B").take_offline()
+    assert loaded.find_shortest_path(node_a.id, node_c.id)[1] == 20
+
+
+def test_snapshot_of_an_empty_network(tmp_path):
+    path = str(tmp_path / "empty.snapshot")
+    Network().write_snapshot(path)
+    assert read_snapshot(path).ids == []
+    assert Network.load_snapshot(path).nodes == {}
+
+
+def test_read_snapshot_rejects_other_files(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text("nodes: []\n")
+    with pytest.raises(ValueError):
+        read_snapshot(str(path))
+
+
+def test_create_from_config_bulk_load_matches_snapshot(tmp_path):
+    config_path = str(tmp_path / "grid.yml")
+    write_config(generate_topology("grid", 100), config_path)
+    network = Network.create_from_config(config_path)
+    assert len(network.nodes) == 100
+    assert sum(len(node.neighbors) for node in network.nodes.values()) == 2 * 180
+
+    snapshot_path = str(tmp_path / "grid.snapshot")
+    network.write_snapshot(snapshot_path)
+    loaded = Network.load_snapshot(snapshot_path)
+    first = network.get_node_by_name("grid-0")
+    last = network.get_node_by_name("grid-99")
+    assert loaded.find_shortest_path(first.id, last.id)[1] == (
+        network.find_shortest_path(first.id, last.id)[1]
+    )
+
+
+def test_config_node_ids_are_kept(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text(
+        "nodes:\n  - name: A\n    id: node-a\n  - name: B\n"
+        "links:\n  - [A, B, 3]\n  - [B, A, 9]\n"
+    )
+    network = Network.create_from_config(str(path))
+    node_a = network.get_node("node-a")
+    assert node_a.name == "A"
+    # The first link between two nodes wins, as with add_neighbor.
+    assert node_a.neighbors[network.get_node_by_name("B")] == 3
+    assert network.changes_since(0) is None
+    assert network.changes_since(network.topology_version) == (set(), set())
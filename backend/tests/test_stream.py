@@ -0,0 +1,48 @@
+# backend/tests/test_stream.py
+
+import json
+from aegis_simulator.stream import EventBroadcaster, format_sse
+
+
+def test_format_sse_frames_json_payload():
+    frame = format_sse("node_status", {"id": "n1", "is_active": False})
+    event_line, data_line, blank, end = frame.split("\n")
+    assert event_line == "event: node_status"
+    assert json.loads(data_line[len("data: ") :]) == {"id": "n1", "is_active": False}
+    assert blank == "" and end == ""
+
+
+def test_broadcaster_fans_out_and_unsubscribes_on_close():
+    broadcaster = EventBroadcaster()
+    second = broadcaster.subscribe()
+    stream = broadcaster.stream(heartbeat=0.01)
+    assert next(stream).startswith("retry:")
+    assert broadcaster.subscriber_count() == 2
+
+    broadcaster.publish("link_latency", {"latency": 5})
+    assert next(stream) == format_sse("link_latency", {"latency": 5})
+    assert second.get_nowait() == ("link_latency", {"latency": 5})
+    assert next(stream) == ": keep-alive\n\n"
+
+    stream.close()
+    assert broadcaster.subscriber_count() == 1
+
+
+def test_stream_closed_before_starting_leaves_no_subscriber():
+    broadcaster = EventBroadcaster()
+    stream = broadcaster.stream()
+    stream.close()
+    broadcaster.publish("link_latency", {"latency": 5})
+    assert broadcaster.subscriber_count() == 0
+
+
+def test_slow_subscriber_gets_a_single_resync():
+    broadcaster = EventBroadcaster(max_queue=2)
+    subscriber = broadcaster.subscribe()
+    for latency in range(5):
+        broadcaster.publish("link_latency", {"latency": latency})
+    events = []
+    while not subscriber.empty():
+        events.append(subscriber.get_nowait())
+    assert ("resync", {}) in events
+    assert len(events) <= 2
@@ -0,0 +1,58 @@
+# backend/tests/test_topology.py
+
+import pytest
+from aegis_simulator.models import Network
+from aegis_simulator.topology import TOPOLOGIES, generate_topology, write_config
+from benchmarks.run import compare, run_topology
+
+
+@pytest.mark.parametrize("kind", TOPOLOGIES)
+def test_generated_configs_are_deterministic_and_loadable(kind, tmp_path):
+    config = generate_topology(kind, 300, seed=7)
+    assert config == generate_topology(kind, 300, seed=7)
+    assert config != generate_topology(kind, 300, seed=8)
+    assert len(config["nodes"]) == 300
+
+    path = tmp_path / f"{kind}.yml"
+    write_config(config, str(path))
+    network = Network.create_from_config(str(path))
+    assert len(network.nodes) == 300
+    link_count = sum(len(node.neighbors) for node in network.nodes.values()) // 2
+    assert link_count == len(config["links"])
+
+
+def test_grid_is_connected():
+    config = generate_topology("grid", 10)
+    nodes = [node["name"] for node in config["nodes"]]
+    assert len(config["links"]) == 13  # a 4x3 grid with two cells missing
+    linked = {name for link in config["links"] for name in link[:2]}
+    assert linked == set(nodes)
+
+
+def test_unknown_topology_is_rejected():
+    with pytest.raises(ValueError):
+        generate_topology("ring", 10)
+
+
+def test_benchmarks_report_machine_readable_results(tmp_path):
+    results = run_topology(
+        "hierarchical", 60, queries=5, workdir=str(tmp_path), visualizer_max_nodes=0
+    )
+    names = [result["benchmark"] for result in results]
+    assert names == [
+        "generate",
+        "config_load",
+        "snapshot_write",
+        "snapshot_load",
+        "find_shortest_path[dijkstra]",
+        "find_shortest_path[bidirectional]",
+        "find_shortest_path[dict]",
+        "route_message",
+        "reliability",
+        "graph_data",
+    ]
+    assert all(result["p50_s"] >= 0 for result in results)
+
+    slower = [dict(result, p50_s=result["p50_s"] * 2 + 1) for result in results]
+    regressions = compare({"results": slower}, {"results": results})
+    assert len(regressions) == len(results)
@@ -0,0 +1,76 @@
+# backend/tests/test_view.py
+
+import threading
+
+from aegis_simulator.models import Network, Node
+
+
+def _triangle():
+    network = Network()
+    node_a, node_b, node_c = Node("A"), Node("B"), Node("C")
+    node_a.add_neighbor(node_b, 5)
+    node_b.add_neighbor(node_c, 7)
+    node_a.add_neighbor(node_c, 20)
+    for node in (node_a, node_b, node_c):
+        network.add_node(node)
+    return network, node_a, node_b, node_c
+
+
+def test_views_are_copied_on_write_and_share_the_adjacency():
+    network, node_a, node_b, node_c = _triangle()
+    before = network.view()
+    assert network.view() is before
+    assert before.version == network.topology_version
+
+    node_b.take_offline()
+    offline = network.view()
+    assert offline is not before
+    assert offline.version == network.topology_version
+    assert before.is_active(node_b.id) is True
+    assert offline.is_active(node_b.id) is False
+    assert offline.graph.offsets is before.graph.offsets
+    assert offline.graph.targets is before.graph.targets
+    assert offline.graph.latencies is before.graph.latencies
+
+    assert network.set_link_latency("A", "C", 3)
+    faster = network.view()
+    assert faster.graph.active is offline.graph.active
+    assert faster.graph.latencies is not offline.graph.latencies
+    a, c = before.graph.index[node_a.id], before.graph.index[node_c.id]
+    assert before.graph.shortest_path(a, c)[1] == 12
+    assert offline.graph.shortest_path(a, c)[1] == 20
+    assert faster.graph.shortest_path(a, c)[1] == 3
+
+    node_d = Node("D")
+    node_d.add_neighbor(node_c, 1)
+    network.add_node(node_d)
+    assert node_d.id not in faster.graph.index
+    assert network.view().graph.index[node_d.id] == 3
+
+
+def test_path_queries_run_alongside_status_changes():
+    network, node_a, node_b, node_c = _triangle()
+    errors = []
+    done = threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                path, latency = network.find_shortest_path(node_a.id, node_c.id)
+                names = [node.name for node in path]
+                # Every answer comes from one consistent topology version.
+                assert (names, latency) in ((["A", "B", "C"], 12), (["A", "C"], 20))
+        except Exception as error:
+            errors.append(error)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(500):
+        node_b.take_offline()
+        node_b.bring_online()
+    done.set()
+    for reader in readers:
+        reader.join()
+    assert not errors
+    assert network.find_shortest_path(node_a.id, node_c.id)[1] == 12